@@ -0,0 +1,148 @@
+# Carga de sessões interativas simultâneas: cada cliente simulado roda uma
+# receita com vários PROVAR, responde cada pergunta depois de um tempo de
+# "digitação" aleatório e lê a saída enquanto o programa roda.
+#   - asyncio: run_churras_async, todas as sessões em um único laço de eventos;
+#   - threads: run_churras com uma thread por sessão esperando a entrada.
+# Mede o tempo total, sessões/s, a latência entre responder um PROVAR e
+# receber a próxima pergunta (ou o fim) e o número de threads.
+# Uso: python benchmarks/bench_async.py [--clientes N] [--pensar MS] [--backend vm|python]
+import os
+import sys
+import time
+import queue
+import random
+import asyncio
+import argparse
+import threading
+from typing import List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "churras_compiler"))
+
+from parser_churras import compile_program, run_churras, run_churras_async
+from output_churras import AsyncSink, CallbackSink
+
+RECEITA = """
+INICIAR_CHURRAS
+DESPENSA
+    convidados : PICANHA;
+    fome : ARROZ;
+    carne : ARROZ;
+    bebida : ARROZ;
+    espetos : PICANHA;
+COZINHAR
+    SERVIR "Quantos convidados?";
+    PROVAR convidados;
+    SERVIR "Qual a fome (0 a 1)?";
+    PROVAR fome;
+    carne = convidados * fome * 0.4 + 1.5;
+    SERVIR "Carne (kg): ";
+    SERVIR carne;
+    SERVIR "Litros por pessoa?";
+    PROVAR bebida;
+    espetos = carne / 0.25 + convidados;
+    SERVIR "Espetos: ";
+    SERVIR espetos;
+    SERVIR "Total de bebida: ";
+    SERVIR bebida * convidados;
+FIM_CHURRAS
+"""
+
+RESPOSTAS = ("convidados", "fome", "bebida")
+LINHAS = RECEITA.count("SERVIR")
+
+def _resposta(rnd: random.Random, ident: str) -> str:
+    if ident == "convidados":
+        return str(rnd.randint(2, 40))
+    return f"{rnd.uniform(0.1, 1.5):.2f}"
+
+def _percentil(valores: List[float], p: float) -> float:
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))] if valores else 0.0
+
+async def _sessao_async(programa, rnd: random.Random, pensar: float, latencias: List[float]) -> bool:
+    respondido: List[Optional[float]] = [None]
+
+    async def provedor(ident: str, tipo: str) -> str:
+        # Chegou a próxima pergunta: fecha a latência da resposta anterior
+        if respondido[0] is not None:
+            latencias.append(time.perf_counter() - respondido[0])
+        await asyncio.sleep(rnd.uniform(0, pensar))
+        respondido[0] = time.perf_counter()
+        return _resposta(rnd, ident)
+
+    saida = AsyncSink()
+    linhas: List[str] = []
+
+    async def ler():
+        async for linha in saida:
+            linhas.append(linha)
+
+    leitor = asyncio.create_task(ler())
+    resultado = await run_churras_async(programa, provedor, saida)
+    latencias.append(time.perf_counter() - respondido[0])
+    await leitor
+    return resultado["status"] == "success" and len(linhas) == LINHAS
+
+async def _carga_async(programa, clientes: int, pensar: float, latencias: List[float]) -> int:
+    sessoes = [_sessao_async(programa, random.Random(i), pensar, latencias) for i in range(clientes)]
+    return sum(await asyncio.gather(*sessoes))
+
+def medir_async(programa, clientes: int, pensar: float):
+    latencias: List[float] = []
+    inicio = time.perf_counter()
+    ok = asyncio.run(_carga_async(programa, clientes, pensar, latencias))
+    return time.perf_counter() - inicio, ok, latencias, threading.active_count()
+
+def medir_threads(programa, clientes: int, pensar: float):
+    latencias: List[float] = []
+    resultados: "queue.Queue[bool]" = queue.Queue()
+    pico = [0]
+
+    def sessao(i: int):
+        rnd = random.Random(i)
+        respondido: List[Optional[float]] = [None]
+
+        def provedor(ident: str, tipo: str) -> str:
+            if respondido[0] is not None:
+                latencias.append(time.perf_counter() - respondido[0])
+            time.sleep(rnd.uniform(0, pensar))
+            respondido[0] = time.perf_counter()
+            return _resposta(rnd, ident)
+
+        linhas: List[str] = []
+        resultado = run_churras(programa, input_provider=provedor, output=CallbackSink(linhas.extend))
+        latencias.append(time.perf_counter() - respondido[0])
+        resultados.put(resultado["status"] == "success" and len(linhas) == LINHAS)
+
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=sessao, args=(i,)) for i in range(clientes)]
+    for t in threads:
+        t.start()
+        pico[0] = max(pico[0], threading.active_count())
+    for t in threads:
+        t.join()
+    ok = sum(resultados.get() for _ in range(clientes))
+    return time.perf_counter() - inicio, ok, latencias, pico[0]
+
+def main():
+    ap = argparse.ArgumentParser(description="Carga de sessões interativas: asyncio x uma thread por sessão")
+    ap.add_argument("--clientes", type=int, default=2000)
+    ap.add_argument("--pensar", type=float, default=100.0, help="tempo máximo de resposta de cada PROVAR (ms)")
+    ap.add_argument("--backend", choices=("vm", "python"), default="vm")
+    ap.add_argument("--sem-threads", action="store_true", help="não mede a versão com uma thread por sessão")
+    args = ap.parse_args()
+
+    programa = compile_program(RECEITA, backend=args.backend)
+    pensar = args.pensar / 1000
+    modos = [("asyncio", medir_async)]
+    if not args.sem_threads:
+        modos.append(("threads", medir_threads))
+    print(f"{args.clientes} clientes, {len(RESPOSTAS)} PROVAR cada, até {args.pensar:g} ms por resposta ({args.backend})")
+    print(f"{'modo':<10} {'total':>9} {'sessões/s':>10} {'ok':>6} {'lat. p50':>9} {'lat. p99':>9} {'threads':>8}")
+    for nome, medir in modos:
+        total, ok, latencias, threads = medir(programa, args.clientes, pensar)
+        print(f"{nome:<10} {total:8.2f}s {args.clientes / total:10.0f} {ok:6d} "
+              f"{_percentil(latencias, 0.5) * 1000:7.2f}ms {_percentil(latencias, 0.99) * 1000:7.2f}ms {threads:8d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Compara a execução de um programa já compilado na VM de bytecode e no
+# backend Python (função nativa gerada por pycode_churras).
+# Uso: python benchmarks/bench_backends.py [--linhas N] [--repeticoes R]
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "churras_compiler"))
+
+from parser_churras import compile_program, run_churras
+
+def gerar_receita_numerica(linhas: int, seed: int = 42) -> str:
+    # Receita sem desvios, só com contas entre variáveis ARROZ (os valores
+    # ficam limitados, então o tempo medido é o do despacho, não o de
+    # aritmética com números enormes)
+    rnd = random.Random(seed)
+    nomes = [f"var_{i}" for i in range(50)]
+    partes = ["INICIAR_CHURRAS", "DESPENSA"]
+    partes += [f"    {nome} : ARROZ;" for nome in nomes]
+    partes.append("COZINHAR")
+    for i in range(linhas):
+        a, b, c = rnd.sample(nomes, 3)
+        if rnd.random() < 0.9:
+            partes.append(f"    {a} = ({b} + {rnd.randint(1, 9)}) * 0.5 - {c} / {rnd.randint(2, 9)};")
+        else:
+            partes.append(f"    SERVIR {a};")
+    partes.append("FIM_CHURRAS")
+    return "\n".join(partes)
+
+def medir(program, repeticoes: int) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        result = run_churras(program)
+        melhor = min(melhor, time.perf_counter() - inicio)
+        assert result["status"] == "success", result["error_message"]
+    return melhor
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--linhas", type=int, default=20000)
+    ap.add_argument("--repeticoes", type=int, default=5)
+    args = ap.parse_args()
+
+    code = gerar_receita_numerica(args.linhas)
+    # Sem otimizador: atribuições mortas sumiriam e a comparação ficaria injusta
+    tempos, saidas = {}, {}
+    for backend in ("vm", "python"):
+        inicio = time.perf_counter()
+        program = compile_program(code, optimize=False, backend=backend)
+        compilacao = time.perf_counter() - inicio
+        tempos[backend] = medir(program, args.repeticoes)
+        saidas[backend] = run_churras(program)["output"]
+        print(f"{backend:<7} compilação: {compilacao * 1000:8.1f} ms   execução: {tempos[backend] * 1000:8.1f} ms")
+
+    assert saidas["vm"] == saidas["python"], "os backends produziram saídas diferentes"
+    print(f"\n{args.linhas} linhas: backend Python {tempos['vm'] / tempos['python']:.1f}x mais rápido que a VM")
+
+if __name__ == "__main__":
+    main()
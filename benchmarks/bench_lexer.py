@@ -0,0 +1,67 @@
+# Compara o analisador léxico por tabelas com o analisador original.
+# Uso: python benchmarks/bench_lexer.py [--linhas N] [--repeticoes R]
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "churras_compiler"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lexer_churras import Lexer
+from legacy_lexer import Lexer as LegacyLexer
+
+def gerar_programa(linhas: int, seed: int = 42) -> str:
+    rnd = random.Random(seed)
+    nomes = [f"var_{i}" for i in range(200)]
+    partes = ["INICIAR_CHURRAS", "DESPENSA"]
+    for nome in nomes:
+        partes.append(f"    {nome} : {rnd.choice(['PICANHA', 'ARROZ'])};")
+    partes.append("COZINHAR")
+    for i in range(linhas):
+        escolha = rnd.random()
+        if escolha < 0.6:
+            a, b, c = rnd.sample(nomes, 3)
+            partes.append(f"    {a} = ({b} + {rnd.randint(0, 9999)}) * {c} - {rnd.randint(1, 99)}.{rnd.randint(0, 99)};")
+        elif escolha < 0.8:
+            partes.append(f'    SERVIR "linha {i} do churrasco";')
+        elif escolha < 0.9:
+            partes.append(f"    # comentário gerado número {i}")
+        else:
+            partes.append(f"    SERVIR {rnd.choice(nomes)} / 3;")
+    partes.append("FIM_CHURRAS")
+    return "\n".join(partes)
+
+def medir(lexer_cls, code: str, repeticoes: int):
+    melhor = float("inf")
+    total = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        tokens = lexer_cls(code).tokenize()
+        melhor = min(melhor, time.perf_counter() - inicio)
+        total = len(tokens)
+    return total, melhor
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark do analisador léxico")
+    ap.add_argument("--linhas", type=int, default=50000)
+    ap.add_argument("--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+
+    code = gerar_programa(args.linhas)
+    novo = [(t.type, t.lexeme, t.line, t.col) for t in Lexer(code).tokenize()]
+    antigo = [(t.type, t.lexeme, t.line, t.col) for t in LegacyLexer(code).tokenize()]
+    if novo != antigo:
+        sys.exit("ERRO: os dois analisadores produziram tokens diferentes")
+
+    print(f"Código: {len(code) / 1e6:.2f} MB, {len(novo)} tokens")
+    resultados = {}
+    for nome, cls in (("original", LegacyLexer), ("tabelas", Lexer)):
+        n, t = medir(cls, code, args.repeticoes)
+        resultados[nome] = t
+        print(f"{nome:<10} {t:8.3f} s  {n / t:14,.0f} tokens/s")
+    print(f"Ganho: {resultados['original'] / resultados['tabelas']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Latência do servidor de linguagem (lsp_churras.py) em um arquivo grande,
+# simulando a digitação: cada tecla é um didChange incremental, e depois de
+# cada uma o editor pede hover e tokens semânticos (delta) e recebe os
+# diagnósticos. Mede no mesmo processo, sem o custo do transporte.
+# Uso: python benchmarks/bench_lsp.py [--linhas N] [--teclas K]
+import os
+import sys
+import time
+import argparse
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "churras_compiler"))
+
+from lsp_churras import LanguageServer
+from gerador_churras import gerar
+
+URI = "file:///bench.churras"
+
+def _mediana(tempos: List[float]) -> float:
+    tempos = sorted(tempos)
+    return tempos[len(tempos) // 2]
+
+def main():
+    ap = argparse.ArgumentParser(description="Latência por tecla do servidor LSP da ChurrasLang")
+    ap.add_argument("--linhas", type=int, default=20000, help="comandos do COZINHAR")
+    ap.add_argument("--teclas", type=int, default=30)
+    args = ap.parse_args()
+
+    codigo, _ = gerar("cozinhar", args.linhas)
+    enviadas: List[Dict] = []
+    server = LanguageServer(enviadas.append)
+    ids = iter(range(1, 1 << 30))
+
+    def pedido(metodo: str, params: Dict):
+        server.handle({"jsonrpc": "2.0", "id": next(ids), "method": metodo, "params": params})
+        return enviadas.pop()["result"]
+
+    def medir(acao: Callable[[], object]) -> float:
+        inicio = time.perf_counter()
+        acao()
+        return time.perf_counter() - inicio
+
+    pedido("initialize", {"capabilities": {}})
+    abrir = {"textDocument": {"uri": URI, "languageId": "churras", "version": 1, "text": codigo}}
+    tempos: Dict[str, List[float]] = {"abrir + diagnósticos": [], "didChange": [], "diagnósticos": [],
+                                      "tokens (delta)": [], "hover": []}
+    tempos["abrir + diagnósticos"].append(medir(lambda: (server.handle(
+        {"jsonrpc": "2.0", "method": "textDocument/didOpen", "params": abrir}), server.publish())))
+    resultado = pedido("textDocument/semanticTokens/full", {"textDocument": {"uri": URI}})
+
+    # Digita um espaço no meio do arquivo, uma tecla por vez
+    linha = codigo.count("\n") // 2
+    for versao in range(2, args.teclas + 2):
+        mudanca = {"textDocument": {"uri": URI, "version": versao}, "contentChanges": [
+            {"range": {"start": {"line": linha, "character": 4}, "end": {"line": linha, "character": 4}}, "text": " "}]}
+        tempos["didChange"].append(medir(lambda: server.handle(
+            {"jsonrpc": "2.0", "method": "textDocument/didChange", "params": mudanca})))
+        tempos["diagnósticos"].append(medir(server.publish))
+        params = {"textDocument": {"uri": URI}, "previousResultId": resultado["resultId"]}
+        tempos["tokens (delta)"].append(medir(lambda: resultado.update(
+            pedido("textDocument/semanticTokens/full/delta", params))))
+        posicao = {"textDocument": {"uri": URI}, "position": {"line": linha, "character": 6}}
+        tempos["hover"].append(medir(lambda: pedido("textDocument/hover", posicao)))
+
+    print(f"{codigo.count(chr(10))} linhas, {args.teclas} teclas (mediana por tecla)")
+    for nome, medidas in tempos.items():
+        print(f"{nome:<22} {_mediana(medidas) * 1000:10.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# Mede o custo de partida de um compilador "frio" e compara com um pedido ao
+# servidor persistente (daemon_churras.py), que já está com tudo carregado:
+#   - python -c pass:          só a partida do interpretador
+#   - import do núcleo:        parser_churras (não deve carregar o Tk)
+#   - núcleo antigo (mínimo):  os módulos que o núcleo importava antes do
+#                              próprio código (Tk, dataclasses, typing, enum)
+#   - main.py receita:         compilar e executar pelo terminal
+#   - pedido ao daemon:        ida e volta de um "run" pelo socket Unix
+# Falha (código 1) se o núcleo carregar algum módulo de LAZY_MODULES ou
+# se o import do núcleo não for mais barato que o do núcleo antigo.
+# Uso: python benchmarks/bench_startup.py [--repeticoes N]
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+from typing import List
+
+PASTA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "churras_compiler")
+
+RECEITA = """INICIAR_CHURRAS
+DESPENSA
+    porcoes : PICANHA;
+    preco : ARROZ;
+COZINHAR
+    porcoes = 3 + 2;
+    preco = porcoes * 12.5;
+    SERVIR "Total: ";
+    SERVIR preco;
+FIM_CHURRAS
+"""
+
+# Só carregados por quem usa: Tk (IDE), cache, saída, perfilador, limites,
+# backend Python e as dependências pesadas deles
+LAZY_MODULES = ("tkinter", "dataclasses", "inspect", "threading", "hashlib", "pickle", "tempfile",
+                "cache_churras", "output_churras", "profile_churras", "limits_churras", "pycode_churras")
+
+# O que o núcleo importava antes (parser_churras com o Tk, tokens_churras
+# com dataclasses), sem contar o próprio código: um limite inferior do custo
+NUCLEO_ANTIGO = "import tkinter.simpledialog, dataclasses, typing, enum"
+
+def _mediana(tempos: List[float]) -> float:
+    tempos = sorted(tempos)
+    return tempos[len(tempos) // 2]
+
+def medir_processo(args: List[str], repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(args, cwd=PASTA, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=True)
+        tempos.append(time.perf_counter() - inicio)
+    return _mediana(tempos)
+
+def modulos_carregados() -> List[str]:
+    codigo = f"import sys, parser_churras; print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=PASTA, capture_output=True, text=True, check=True).stdout
+    return saida.split()
+
+def tem_tk() -> bool:
+    return subprocess.run([sys.executable, "-c", "import tkinter"], capture_output=True).returncode == 0
+
+def medir_daemon(caminho_receita: str, repeticoes: int) -> float:
+    pasta = tempfile.mkdtemp()
+    sock_path = os.path.join(pasta, "churras.sock")
+    daemon = subprocess.Popen([sys.executable, "daemon_churras.py", "--socket", sock_path],
+                              cwd=PASTA, stdin=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        limite = time.monotonic() + 10
+        while not os.path.exists(sock_path):
+            if time.monotonic() > limite:
+                raise RuntimeError("o daemon não abriu o socket")
+            time.sleep(0.01)
+        pedido = (json.dumps({"op": "run", "file": caminho_receita}) + "\n").encode()
+        tempos = []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+            conexao.connect(sock_path)
+            respostas = conexao.makefile("rb")
+            for _ in range(repeticoes + 1):
+                inicio = time.perf_counter()
+                conexao.sendall(pedido)
+                resposta = json.loads(respostas.readline())
+                tempos.append(time.perf_counter() - inicio)
+                assert resposta["status"] == "success", resposta["error_message"]
+            conexao.sendall(b'{"op": "shutdown"}\n')
+            respostas.readline()
+        # O primeiro pedido ainda compila: os seguintes vêm do cache
+        return _mediana(tempos[1:])
+    finally:
+        daemon.wait(timeout=10)
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+        os.rmdir(pasta)
+
+def main():
+    ap = argparse.ArgumentParser(description="Tempo de partida do compilador ChurrasLang")
+    ap.add_argument("--repeticoes", type=int, default=15)
+    args = ap.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".churras", delete=False, encoding="utf-8") as f:
+        f.write(RECEITA)
+    try:
+        medidas = [
+            ("python -c pass", medir_processo([sys.executable, "-c", "pass"], args.repeticoes)),
+            ("import do núcleo", medir_processo([sys.executable, "-c", "import parser_churras"], args.repeticoes)),
+        ]
+        if tem_tk():
+            medidas.append(("núcleo antigo (mín.)", medir_processo([sys.executable, "-c", NUCLEO_ANTIGO],
+                                                                  args.repeticoes)))
+        medidas.append(("main.py receita", medir_processo([sys.executable, "main.py", f.name], args.repeticoes)))
+        if hasattr(socket, "AF_UNIX"):
+            medidas.append(("pedido ao daemon", medir_daemon(f.name, args.repeticoes)))
+    finally:
+        os.unlink(f.name)
+
+    for nome, tempo in medidas:
+        print(f"{nome:<20} {tempo * 1000:10.2f} ms")
+    falhou = False
+    carregados = modulos_carregados()
+    if carregados:
+        print(f"\nATENÇÃO: importar o núcleo carregou {', '.join(carregados)}")
+        falhou = True
+    else:
+        print("\nO núcleo não carrega o Tk, o cache, a saída, o perfilador, os limites nem o backend Python.")
+    tempos = dict(medidas)
+    if "núcleo antigo (mín.)" in tempos:
+        if tempos["import do núcleo"] >= tempos["núcleo antigo (mín.)"]:
+            print("ATENÇÃO: o import do núcleo não é mais barato que o do núcleo antigo")
+            falhou = True
+        else:
+            print("O import do núcleo é mais barato que o do núcleo antigo.")
+    else:
+        print("Sem o Tk, a comparação com o núcleo antigo não é feita.")
+    return 1 if falhou else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
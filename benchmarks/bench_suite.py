@@ -0,0 +1,169 @@
+# Mede o compilador em receitas sintéticas (gerador_churras.py) e compara
+# com uma linha de base salva em JSON.
+#
+# Para cada caso:
+#   - léxico:    tokens/s de Lexer.tokenize()
+#   - sintático: comandos/s de Parser.parse() (declarações + comandos)
+#   - execução:  instruções/s da VM em run_churras (o bytecode não tem
+#                desvios, então cada instrução roda uma vez)
+#   - memória:   pico do tracemalloc em Lexer, Parser e compile_churras
+#
+# Uso:
+#   python benchmarks/bench_suite.py --salvar base.json
+#   python benchmarks/bench_suite.py --comparar base.json [--tolerancia 0.25]
+# Com --comparar, a saída é 1 se alguma métrica piorou além da tolerância.
+# Compare só resultados da mesma máquina: os números absolutos variam muito.
+import gc
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "churras_compiler"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lexer_churras import Lexer
+from parser_churras import Parser, compile_churras, compile_program, run_churras
+from gerador_churras import CASOS, gerar
+
+# Tamanho de cada caso com --escala 1
+TAMANHOS = {"despensa": 20000, "cozinhar": 20000, "aninhado": 15000, "textos": 10000, "provar": 10000}
+
+# Métricas em que maior é melhor; as de memória (pico_*) são o contrário
+VAZOES = ("lexico_tokens_s", "sintatico_comandos_s", "execucao_ops_s")
+
+def _melhor_tempo(funcao: Callable[[], object], repeticoes: int) -> float:
+    # O menor tempo entre as repetições, sem o coletor de lixo no meio.
+    # A primeira chamada só aquece (caches, frequência da CPU)
+    funcao()
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            funcao()
+            melhor = min(melhor, time.perf_counter() - inicio)
+        finally:
+            gc.enable()
+    return melhor
+
+def _pico_kb(funcao: Callable[[], object]) -> float:
+    # Medido à parte: o tracemalloc deixa tudo bem mais lento
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def _entradas(valores: List[str]):
+    restantes = iter(valores)
+    return lambda ident, tipo: next(restantes, None)
+
+def medir_caso(caso: str, tamanho: int, semente: int, repeticoes: int) -> Dict[str, float]:
+    codigo, valores = gerar(caso, tamanho, semente)
+    tokens = Lexer(codigo).tokenize()
+    arvore = Parser(tokens).parse()
+    comandos = len(arvore.declaracoes) + len(arvore.comandos)
+    programa = compile_program(codigo, backend="vm")
+    instrucoes = len(programa.code) // 2
+
+    def executar():
+        result = run_churras(programa, input_provider=_entradas(valores))
+        assert result["status"] == "success", f'{caso}: {result["error_message"]}'
+
+    def compilar_e_executar():
+        result = compile_churras(codigo, input_provider=_entradas(valores))
+        assert result["status"] == "success", f'{caso}: {result["error_message"]}'
+
+    t_lexico = _melhor_tempo(lambda: Lexer(codigo).tokenize(), repeticoes)
+    t_sintatico = _melhor_tempo(lambda: Parser(tokens).parse(), repeticoes)
+    t_execucao = _melhor_tempo(executar, repeticoes)
+    t_total = _melhor_tempo(compilar_e_executar, repeticoes)
+    return {
+        "tamanho": tamanho,
+        "tokens": len(tokens),
+        "comandos": comandos,
+        "instrucoes": instrucoes,
+        "lexico_tokens_s": len(tokens) / t_lexico,
+        "sintatico_comandos_s": comandos / t_sintatico,
+        "execucao_ops_s": instrucoes / t_execucao,
+        "compile_churras_s": t_total,
+        "pico_lexico_kb": _pico_kb(lambda: Lexer(codigo).tokenize()),
+        "pico_sintatico_kb": _pico_kb(lambda: Parser(tokens).parse()),
+        "pico_compile_churras_kb": _pico_kb(compilar_e_executar),
+    }
+
+def comparar(atual: Dict, base: Dict, tolerancia: float) -> List[str]:
+    # Devolve uma linha por métrica que piorou mais que `tolerancia`
+    regressoes = []
+    for caso, metricas in atual["casos"].items():
+        anteriores = base.get("casos", {}).get(caso)
+        if anteriores is None:
+            continue
+        if anteriores.get("tamanho") != metricas["tamanho"]:
+            regressoes.append(f"{caso}: tamanho diferente da linha de base ({anteriores.get('tamanho')}), não comparado")
+            continue
+        for nome, valor in metricas.items():
+            anterior = anteriores.get(nome)
+            if not anterior or nome in ("tamanho", "tokens", "comandos", "instrucoes"):
+                continue
+            variacao = valor / anterior - 1
+            if nome in VAZOES:
+                piorou = variacao < -tolerancia
+            else:
+                # Tempos e memória: maior é pior
+                piorou = variacao > tolerancia
+            if piorou:
+                regressoes.append(f"{caso}: {nome} {anterior:,.4g} -> {valor:,.4g} ({variacao:+.0%})")
+    return regressoes
+
+def main():
+    ap = argparse.ArgumentParser(description="Suíte de benchmarks do compilador ChurrasLang")
+    ap.add_argument("--casos", nargs="+", choices=CASOS, default=list(CASOS))
+    ap.add_argument("--escala", type=float, default=1.0, help="multiplica o tamanho de todos os casos")
+    ap.add_argument("--semente", type=int, default=42)
+    ap.add_argument("--repeticoes", type=int, default=5)
+    ap.add_argument("--salvar", metavar="JSON", help="grava os resultados como linha de base")
+    ap.add_argument("--comparar", metavar="JSON", help="compara com uma linha de base")
+    ap.add_argument("--tolerancia", type=float, default=0.25,
+                    help="piora aceita antes de acusar regressão (0.25 = 25%%)")
+    args = ap.parse_args()
+
+    resultados = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semente": args.semente,
+        "casos": {},
+    }
+    print(f"{'caso':<10} {'tokens/s':>12} {'comandos/s':>12} {'ops/s':>12} {'total (s)':>10} {'pico (KB)':>10}")
+    for caso in args.casos:
+        tamanho = max(1, int(TAMANHOS[caso] * args.escala))
+        m = resultados["casos"][caso] = medir_caso(caso, tamanho, args.semente, args.repeticoes)
+        print(f"{caso:<10} {m['lexico_tokens_s']:>12,.0f} {m['sintatico_comandos_s']:>12,.0f} "
+              f"{m['execucao_ops_s']:>12,.0f} {m['compile_churras_s']:>10.3f} {m['pico_compile_churras_kb']:>10,.0f}")
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\nLinha de base gravada em {args.salvar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regressoes = comparar(resultados, base, args.tolerancia)
+        if regressoes:
+            print(f"\nREGRESSÕES (tolerância {args.tolerancia:.0%}):")
+            for linha in regressoes:
+                print(f"  {linha}")
+            return 1
+        print(f"\nNenhuma regressão em relação a {args.comparar} (tolerância {args.tolerancia:.0%}).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
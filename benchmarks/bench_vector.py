@@ -0,0 +1,70 @@
+# Compara o motor vetorizado (NumPy) com a execução linha a linha de
+# rows_churras sobre o mesmo lote de entradas.
+# Uso: python benchmarks/bench_vector.py [--linhas N] [--amostra M]
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "churras_compiler"))
+
+from parser_churras import compile_program
+from rows_churras import run_rows
+from vector_churras import np, run_vectorized
+
+RECEITA = """
+INICIAR_CHURRAS
+DESPENSA
+    convidados : PICANHA;
+    fome : ARROZ;
+    carne : ARROZ;
+    espetos : PICANHA;
+COZINHAR
+    PROVAR convidados;
+    PROVAR fome;
+    carne = convidados * fome * 0.4 + 1.5;
+    espetos = carne / 0.25 + convidados;
+    SERVIR carne;
+    SERVIR espetos;
+    SERVIR espetos / convidados;
+FIM_CHURRAS
+"""
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    ap.add_argument("--amostra", type=int, default=20_000,
+                    help="linhas executadas uma a uma (o tempo é extrapolado para o lote)")
+    args = ap.parse_args()
+    if np is None:
+        print("NumPy não está instalado: nada a comparar.")
+        return
+
+    rnd = random.Random(42)
+    # Algumas linhas com zero convidados, para exercitar o erro por linha
+    convidados = np.array([rnd.randint(0, 200) for _ in range(args.linhas)], dtype=np.int64)
+    fome = np.array([rnd.random() * 3 for _ in range(args.linhas)])
+    program = compile_program(RECEITA, backend="vm")
+
+    inicio = time.perf_counter()
+    vetorizado = run_vectorized(program, [convidados, fome])
+    t_vetor = time.perf_counter() - inicio
+    erros = int((~vetorizado.ok).sum())
+
+    amostra = min(args.amostra, args.linhas)
+    linhas = ([convidados[i], fome[i]] for i in range(amostra))
+    inicio = time.perf_counter()
+    resultados = list(run_rows(program, linhas))
+    t_linha = (time.perf_counter() - inicio) * args.linhas / amostra
+    for n, result in enumerate(resultados):
+        esperado = vetorizado.row(n)
+        assert result["outputs"] == esperado["outputs"] and result["status"] == esperado["status"], n
+
+    print(f"{args.linhas} linhas ({erros} com divisão por zero)")
+    print(f"vetorizado:     {t_vetor:8.3f} s")
+    print(f"linha a linha:  {t_linha:8.3f} s (estimado a partir de {amostra} linhas)")
+    print(f"motor vetorizado {t_linha / t_vetor:.0f}x mais rápido")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Gerador de receitas sintéticas para os benchmarks. Com a mesma semente e
+# o mesmo tamanho, gera sempre o mesmo código (e as mesmas entradas).
+# Uso: python benchmarks/gerador_churras.py CASO [--tamanho N] [--semente S]
+import random
+import argparse
+from typing import Callable, Dict, List, Tuple
+
+# Cada caso devolve (código, entradas dos PROVAR em ordem)
+Caso = Callable[[int, random.Random], Tuple[str, List[str]]]
+
+def _programa(declaracoes: List[str], comandos: List[str]) -> str:
+    return "\n".join(["INICIAR_CHURRAS", "DESPENSA", *declaracoes, "COZINHAR", *comandos, "FIM_CHURRAS"]) + "\n"
+
+def _despensa(tamanho: int, rnd: random.Random) -> Tuple[str, List[str]]:
+    # DESPENSA enorme e um COZINHAR curto que usa algumas das variáveis
+    nomes = [f"ingrediente_{i}" for i in range(tamanho)]
+    declaracoes = [f"    {nome} : {rnd.choice(['PICANHA', 'ARROZ'])};" for nome in nomes]
+    comandos = [f"    {rnd.choice(nomes)} = {rnd.randint(1, 99)};" for _ in range(min(tamanho, 100))]
+    comandos.append(f"    SERVIR {nomes[0]};")
+    return _programa(declaracoes, comandos), []
+
+def _cozinhar(tamanho: int, rnd: random.Random) -> Tuple[str, List[str]]:
+    # COZINHAR longo com contas entre 100 variáveis ARROZ (valores limitados)
+    nomes = [f"var_{i}" for i in range(100)]
+    declaracoes = [f"    {nome} : ARROZ;" for nome in nomes]
+    comandos = []
+    for _ in range(tamanho):
+        a, b, c = rnd.sample(nomes, 3)
+        if rnd.random() < 0.85:
+            comandos.append(f"    {a} = ({b} + {rnd.randint(1, 9)}) * 0.5 - {c} / {rnd.randint(2, 9)};")
+        else:
+            comandos.append(f"    SERVIR {a};")
+    return _programa(declaracoes, comandos), []
+
+def _aninhado(tamanho: int, rnd: random.Random, profundidade: int = 150) -> Tuple[str, List[str]]:
+    # Expressões com `profundidade` níveis de parênteses, uma por comando
+    declaracoes = ["    x : ARROZ;", "    y : ARROZ;"]
+    comandos = []
+    for _ in range(max(1, tamanho // profundidade)):
+        expr = "x"
+        for _ in range(profundidade):
+            op = rnd.choice("+-*")
+            fator = "0.5" if op == "*" else str(rnd.randint(1, 9))
+            expr = f"({expr} {op} {fator})"
+        comandos.append(f"    y = {expr};")
+        comandos.append("    SERVIR y;")
+    return _programa(declaracoes, comandos), []
+
+def _textos(tamanho: int, rnd: random.Random) -> Tuple[str, List[str]]:
+    # Textos longos e muitos comentários
+    letras = "abcdefghijklmnopqrstuvwxyz áéíóúç"
+    comandos = []
+    for i in range(tamanho):
+        if rnd.random() < 0.5:
+            comandos.append(f"    # {''.join(rnd.choice(letras) for _ in range(rnd.randint(40, 120)))}")
+        else:
+            texto = "".join(rnd.choice(letras) for _ in range(rnd.randint(100, 400)))
+            comandos.append(f'    SERVIR "{texto}" + " {i}";')
+    return _programa(["    n : PICANHA;"], comandos), []
+
+def _provar(tamanho: int, rnd: random.Random) -> Tuple[str, List[str]]:
+    # Muitos PROVAR, respondidos por uma lista de entradas
+    nomes = [f"pedido_{i}" for i in range(20)]
+    tipos = {nome: rnd.choice(["PICANHA", "ARROZ"]) for nome in nomes}
+    declaracoes = [f"    {nome} : {tipo};" for nome, tipo in tipos.items()] + ["    total : ARROZ;"]
+    comandos, entradas = [], []
+    for _ in range(tamanho):
+        nome = rnd.choice(nomes)
+        comandos.append(f"    PROVAR {nome};")
+        entradas.append(str(rnd.randint(0, 999)) if tipos[nome] == "PICANHA" else f"{rnd.random() * 100:.2f}")
+        comandos.append(f"    total = total + {nome};")
+    comandos.append("    SERVIR total;")
+    return _programa(declaracoes, comandos), entradas
+
+CASOS: Dict[str, Caso] = {
+    "despensa": _despensa,
+    "cozinhar": _cozinhar,
+    "aninhado": _aninhado,
+    "textos": _textos,
+    "provar": _provar,
+}
+
+def gerar(caso: str, tamanho: int, semente: int = 42) -> Tuple[str, List[str]]:
+    if caso not in CASOS:
+        raise ValueError(f"caso desconhecido: {caso!r} (opções: {', '.join(CASOS)})")
+    return CASOS[caso](tamanho, random.Random(semente))
+
+def main():
+    ap = argparse.ArgumentParser(description="Gera uma receita sintética")
+    ap.add_argument("caso", choices=CASOS)
+    ap.add_argument("--tamanho", type=int, default=1000)
+    ap.add_argument("--semente", type=int, default=42)
+    args = ap.parse_args()
+    codigo, _ = gerar(args.caso, args.tamanho, args.semente)
+    print(codigo, end="")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+from typing import List, Optional, Union
+from tokens_churras import Token
+
+# --- NÓS DA ÁRVORE SINTÁTICA ---
+# Cada nó guarda o token de origem para que os erros de execução
+# continuem apontando para a posição correta no código-fonte.
+# Classes simples com __slots__ em vez de dataclasses: importar o núcleo
+# não carrega dataclasses/inspect e cada nó ocupa menos memória. _No dá a
+# cada nó a mesma comparação e o mesmo repr de uma dataclass.
+
+class _No:
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class Numero(_No):
+    __slots__ = ("valor", "token")
+
+    def __init__(self, valor: Union[int, float], token: Token):
+        self.valor = valor
+        self.token = token
+
+class Texto(_No):
+    __slots__ = ("valor", "token")
+
+    def __init__(self, valor: str, token: Token):
+        self.valor = valor
+        self.token = token
+
+class Variavel(_No):
+    __slots__ = ("nome", "token")
+
+    def __init__(self, nome: str, token: Token):
+        self.nome = nome
+        self.token = token
+
+class OpBinaria(_No):
+    __slots__ = ("op", "esq", "dir", "token")
+
+    def __init__(self, op: str, esq: "Expr", dir: "Expr", token: Token):
+        self.op = op                  # '+', '-', '*' ou '/'
+        self.esq = esq
+        self.dir = dir
+        self.token = token            # token do operador
+
+Expr = Union[Numero, Texto, Variavel, OpBinaria]
+
+class Declaracao(_No):
+    __slots__ = ("nome", "tipo", "token")
+
+    def __init__(self, nome: str, tipo: str, token: Token):
+        self.nome = nome
+        self.tipo = tipo              # "int" (PICANHA) ou "real" (ARROZ)
+        self.token = token
+
+class Atribuicao(_No):
+    __slots__ = ("nome", "expr", "token")
+
+    def __init__(self, nome: str, expr: Expr, token: Token):
+        self.nome = nome
+        self.expr = expr
+        self.token = token
+
+class Servir(_No):
+    __slots__ = ("expr", "token")
+
+    def __init__(self, expr: Expr, token: Token):
+        self.expr = expr
+        self.token = token
+
+class Provar(_No):
+    __slots__ = ("nome", "token")
+
+    def __init__(self, nome: str, token: Token):
+        self.nome = nome
+        self.token = token
+
+Comando = Union[Atribuicao, Servir, Provar]
+
+class Programa(_No):
+    __slots__ = ("declaracoes", "comandos")
+
+    def __init__(self, declaracoes: Optional[List[Declaracao]] = None, comandos: Optional[List[Comando]] = None):
+        self.declaracoes = [] if declaracoes is None else declaracoes
+        self.comandos = [] if comandos is None else comandos
+
+def postorder(node: Expr):
+    # Percorre uma expressão sem recursão, filhos (esq, depois dir) antes do
+    # pai: a profundidade da árvore só é limitada pela memória. As fases que
+    # calculam algo por nó usam uma pilha de resultados nessa ordem.
+    stack = [(node, False)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node, expanded = pop()
+        if expanded or not isinstance(node, OpBinaria):
+            yield node
+        else:
+            push((node, True))
+            push((node.dir, False))
+            push((node.esq, False))
@@ -0,0 +1,158 @@
+# Arquivo: batch_churras.py (compilação em lote, para CI e rotinas noturnas)
+#
+#   python batch_churras.py receitas/ "testes/**/*.churras" -j 8
+#
+# Cada arquivo é compilado e executado em um processo do pool, e o
+# resultado sai como uma linha JSON no stdout:
+#   {"file": ..., "status": "success"|"error", "error_stage": ...,
+#    "error_message": ..., "line": ..., "col": ..., "optimizations": {...},
+#    "output": [...], "elapsed": ...}
+# Uma falha inesperada do compilador em um arquivo (ou a queda de um
+# processo do pool) sai como erro daquele arquivo, com error_stage
+# "Interno", e o lote continua.
+# Código de saída: 0 se todos passaram, 1 se algum falhou e 2 se nenhum
+# arquivo foi encontrado.
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional
+
+from parser_churras import compile_churras, check_churras, BACKENDS
+from cache_churras import ProgramCache
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_NO_FILES = 2
+
+SOURCE_EXT = ".churras"
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    # Aceita arquivos, diretórios (busca *.churras recursivamente) e globs.
+    # Remove repetidos mantendo a ordem.
+    seen, files = set(), []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "**", "*" + SOURCE_EXT), recursive=True))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for path in matches:
+            if path not in seen and not os.path.isdir(path):
+                seen.add(path)
+                files.append(path)
+    return files
+
+def no_input(ident: str, variable_type: str) -> Optional[str]:
+    # Em lote não há ninguém para responder: PROVAR mantém o valor atual
+    return None
+
+# Estado de cada processo do pool (preenchido por _init_worker)
+_worker_cache: Optional[ProgramCache] = None
+_worker_options: Dict = {}
+
+def _init_worker(cache_dir: Optional[str], options: Dict):
+    global _worker_cache, _worker_options
+    _worker_cache = ProgramCache(cache_dir=cache_dir) if cache_dir else None
+    _worker_options = options
+
+def _error_report(path: str, stage: str, message: str) -> Dict:
+    return {"file": path, "status": "error", "error_stage": stage, "error_message": message,
+            "line": None, "col": None}
+
+def process_file(path: str) -> Dict:
+    started = time.perf_counter()
+    report = _error_report(path, "", "")
+    try:
+        with open(path, encoding="utf-8") as f:
+            code = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        report["error_stage"] = "Arquivo"
+        report["error_message"] = str(e)
+    else:
+        try:
+            if _worker_options.get("check_only"):
+                result = check_churras(code, _worker_cache, _worker_options["optimize"])
+            else:
+                result = compile_churras(code, cache=_worker_cache, input_provider=no_input,
+                                         timeout=_worker_options.get("timeout"),
+                                         optimize=_worker_options["optimize"],
+                                         backend=_worker_options["backend"])
+        except Exception as e:
+            # Um arquivo que derruba o compilador não derruba o lote
+            report = _error_report(path, "Interno", f"{type(e).__name__}: {e}")
+            report["elapsed"] = round(time.perf_counter() - started, 6)
+            return report
+        report["status"] = result["status"]
+        report["error_stage"] = result["error_stage"]
+        report["error_message"] = result["error_message"]
+        report["line"], report["col"] = result["error_line"], result["error_col"]
+        if result["optimizations"] is not None:
+            report["optimizations"] = result["optimizations"].summary()
+        if result["status"] == "success" and not _worker_options.get("check_only"):
+            report["output"] = result["outputs"]
+    report["elapsed"] = round(time.perf_counter() - started, 6)
+    return report
+
+def run_batch(files: List[str], jobs: Optional[int] = None, cache_dir: Optional[str] = None,
+              timeout: Optional[float] = None, check_only: bool = False, optimize: bool = True,
+              backend: str = "vm"):
+    # Gera os relatórios na ordem dos arquivos. Os arquivos são entregues aos
+    # processos em lotes, para que muitos arquivos pequenos não paguem uma
+    # ida e volta entre processos cada.
+    options = {"timeout": timeout, "check_only": check_only, "optimize": optimize, "backend": backend}
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(files) == 1:
+        _init_worker(cache_dir, options)
+        yield from map(process_file, files)
+        return
+    chunksize = max(1, len(files) // (jobs * 4))
+    done = 0
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(cache_dir, options)) as pool:
+        try:
+            for report in pool.map(process_file, files, chunksize=chunksize):
+                done += 1
+                yield report
+        except BrokenProcessPool as e:
+            # Um processo morreu (ex.: sem memória): os relatórios já
+            # recebidos ficam, e os arquivos restantes saem como erro
+            for path in files[done:]:
+                yield _error_report(path, "Interno", f"processo do lote encerrado: {e}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Compilador ChurrasLang (Modo Lote)")
+    ap.add_argument("caminhos", nargs="+", help="arquivos, diretórios ou globs (ex.: 'receitas/**/*.churras')")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="número de processos (padrão: número de núcleos)")
+    ap.add_argument("--check", action="store_true", help="só verifica léxico e sintático, sem executar")
+    ap.add_argument("--timeout", type=float, default=None, help="tempo limite de execução por arquivo, em segundos")
+    ap.add_argument("--sem-otimizar", action="store_true", help="desliga o otimizador")
+    ap.add_argument("--backend", choices=BACKENDS, default="vm", help="vm ou python (código nativo)")
+    ap.add_argument("--cache-dir", default=None, help="diretório do cache de programas compilados")
+    args = ap.parse_args(argv)
+
+    files = expand_paths(args.caminhos)
+    if not files:
+        print("Nenhum arquivo .churras encontrado.", file=sys.stderr)
+        return EXIT_NO_FILES
+
+    started = time.perf_counter()
+    failures = 0
+    for report in run_batch(files, args.jobs, args.cache_dir, args.timeout, args.check,
+                            not args.sem_otimizar, args.backend):
+        if report["status"] != "success":
+            failures += 1
+        print(json.dumps(report, ensure_ascii=False), flush=True)
+    elapsed = time.perf_counter() - started
+    print(f"{len(files)} arquivo(s), {len(files) - failures} ok, {failures} com erro em {elapsed:.2f}s",
+          file=sys.stderr)
+    return EXIT_FAILURES if failures else EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
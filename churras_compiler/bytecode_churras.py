@@ -0,0 +1,151 @@
+from typing import List, Dict, Tuple, Any, Optional
+from tokens_churras import Token
+from ast_churras import Programa, Numero, Texto, Variavel, Atribuicao, Servir, Provar, postorder
+from optimizer_churras import OptimizationReport, optimize as optimize_ast
+from typecheck_churras import INT, REAL, check_types, literal_type, binary_type, initial_value, resolve_slots
+
+# Versão do formato do bytecode. Deve mudar sempre que o compilador passar a
+# gerar código diferente, para invalidar os artefatos em cache.
+COMPILER_VERSION = "7"
+
+# --- CONJUNTO DE INSTRUÇÕES ---
+# Cada instrução ocupa duas posições no código: (opcode, argumento).
+# Instruções sem argumento usam 0. Os tipos já foram verificados na
+# compilação: as operações aritméticas só recebem números e a conversão
+# int/real de uma atribuição vira uma instrução explícita, emitida apenas
+# quando os tipos diferem.
+LOAD_CONST = 0    # empilha consts[arg]
+LOAD_NAME = 1     # empilha o valor do slot arg (a variável names[arg])
+STORE_NAME = 2    # desempilha e guarda no slot arg
+BIN_ADD = 3
+BIN_SUB = 4
+BIN_MUL = 5
+BIN_DIV = 6       # sempre dá real; erro se o divisor for zero
+SERVIR = 7        # desempilha e envia para a saída
+PROVAR = 8        # lê um valor para o slot arg
+CONCAT = 9        # String + String
+TO_INT = 10       # trunca o topo da pilha para int
+TO_REAL = 11      # converte o topo da pilha para real
+
+OPNAMES = {
+    LOAD_CONST: "LOAD_CONST", LOAD_NAME: "LOAD_NAME", STORE_NAME: "STORE_NAME",
+    BIN_ADD: "BIN_ADD", BIN_SUB: "BIN_SUB", BIN_MUL: "BIN_MUL", BIN_DIV: "BIN_DIV",
+    SERVIR: "SERVIR", PROVAR: "PROVAR", CONCAT: "CONCAT", TO_INT: "TO_INT", TO_REAL: "TO_REAL",
+}
+
+BINOPS = {'+': BIN_ADD, '-': BIN_SUB, '*': BIN_MUL, '/': BIN_DIV}
+
+class Program:
+    # Classe simples (não uma dataclass): importar o núcleo não carrega o
+    # módulo dataclasses
+    def __init__(self, code: Tuple[int, ...], consts: Tuple[Any, ...], names: Tuple[str, ...],
+                 types: Dict[str, str], positions: Tuple[Token, ...],
+                 optimizations: Optional[OptimizationReport] = None, initial: Tuple[Any, ...] = ()):
+        self.code = code
+        self.consts = consts
+        self.names = names                # variável de cada slot, na ordem da DESPENSA
+        self.types = types                # variáveis da DESPENSA -> "int" / "real"
+        self.positions = positions        # token de origem de cada instrução (para erros)
+        self.optimizations = optimizations    # None se compilado sem otimizar
+        self.initial = initial            # valor inicial de cada slot (0 ou 0.0)
+
+    def token_at(self, pc: int) -> Token:
+        return self.positions[pc // 2]
+
+    def statements(self) -> Dict[int, Tuple[int, int]]:
+        # Início de cada comando -> (fim, linha do código). Todo comando
+        # termina em STORE_NAME, SERVIR ou PROVAR (usado pelo perfilador)
+        bounds, start = {}, 0
+        for pc in range(0, len(self.code), 2):
+            if self.code[pc] in (STORE_NAME, SERVIR, PROVAR):
+                bounds[start] = (pc + 2, self.positions[pc // 2].line)
+                start = pc + 2
+        return bounds
+
+    def disassemble(self) -> List[str]:
+        lines = []
+        for pc in range(0, len(self.code), 2):
+            op, arg = self.code[pc], self.code[pc + 1]
+            tok = self.positions[pc // 2]
+            if op == LOAD_CONST: detail = repr(self.consts[arg])
+            elif op in (LOAD_NAME, STORE_NAME, PROVAR): detail = self.names[arg]
+            else: detail = ""
+            lines.append(f"L{tok.line:<4} {pc:>5} {OPNAMES[op]:<12} {detail}")
+        return lines
+
+class Compiler:
+    def __init__(self):
+        self.code: List[int] = []
+        self.consts: List[Any] = []
+        self.positions: List[Token] = []
+        self._const_index: Dict[Tuple[type, Any], int] = {}
+
+    def compile(self, programa: Programa, optimize: bool = False, errors: Optional[List] = None) -> Program:
+        # Os tipos são verificados no programa original, antes do otimizador.
+        # `errors` (ver check_types) junta todos os erros semânticos.
+        types = check_types(programa, errors)
+        report = None
+        if optimize:
+            programa, report = optimize_ast(programa)
+            types = {decl.nome: decl.tipo for decl in programa.declaracoes}
+        self.types = types
+        self.slots = resolve_slots(types)
+        for cmd in programa.comandos:
+            self._comando(cmd)
+        initial = tuple(initial_value(tipo) for tipo in types.values())
+        return Program(tuple(self.code), tuple(self.consts), tuple(self.slots), types, tuple(self.positions),
+                       report, initial)
+
+    def _emit(self, op: int, arg: int, token: Token):
+        self.code.append(op)
+        self.code.append(arg)
+        self.positions.append(token)
+
+    def _const(self, value) -> int:
+        # 1 e 1.0 são iguais como chave de dict, por isso o tipo entra na chave
+        key = (type(value), value)
+        idx = self._const_index.get(key)
+        if idx is None:
+            idx = self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return idx
+
+    def _comando(self, cmd):
+        if isinstance(cmd, Atribuicao):
+            target = self.types[cmd.nome]
+            tipo = self._expr(self._converted(cmd.expr, target))
+            if tipo != target:
+                self._emit(TO_INT if target == INT else TO_REAL, 0, cmd.token)
+            self._emit(STORE_NAME, self.slots[cmd.nome], cmd.token)
+        elif isinstance(cmd, Servir):
+            self._expr(cmd.expr)
+            self._emit(SERVIR, 0, cmd.token)
+        elif isinstance(cmd, Provar):
+            self._emit(PROVAR, self.slots[cmd.nome], cmd.token)
+
+    def _converted(self, node, target: str):
+        # Uma constante já entra no tipo da variável, sem TO_INT/TO_REAL.
+        # Se a conversão falhar (ex.: real infinito), fica para a execução.
+        if isinstance(node, Numero) and literal_type(node.valor) != target:
+            try:
+                return Numero(int(node.valor) if target == INT else float(node.valor), node.token)
+            except (OverflowError, ValueError):
+                pass
+        return node
+
+    def _expr(self, node) -> str:
+        # Emite o código da expressão e devolve o seu tipo. O código de pilha
+        # é a própria pós-ordem da árvore; `stack` guarda os tipos.
+        stack = []
+        for node in postorder(node):
+            if isinstance(node, (Numero, Texto)):
+                self._emit(LOAD_CONST, self._const(node.valor), node.token)
+                stack.append(literal_type(node.valor))
+            elif isinstance(node, Variavel):
+                self._emit(LOAD_NAME, self.slots[node.nome], node.token)
+                stack.append(self.types[node.nome])
+            else:
+                dir = stack.pop()
+                tipo = stack[-1] = binary_type(node.op, stack[-1], dir)
+                self._emit(BINOPS[node.op] if tipo in (INT, REAL) else CONCAT, 0, node.token)
+        return stack[0]
@@ -0,0 +1,128 @@
+import os
+import sys
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from bytecode_churras import COMPILER_VERSION
+
+ARTIFACT_EXT = ".churrasc"
+
+def source_key(code: str, optimize: bool = True, backend: str = "vm") -> str:
+    # A versão do compilador e as opções de compilação entram no hash:
+    # artefatos de versões antigas simplesmente deixam de ser encontrados.
+    # O backend Python guarda code objects, que só valem para a mesma
+    # versão do interpretador.
+    h = hashlib.sha256()
+    h.update(COMPILER_VERSION.encode("utf-8"))
+    h.update(b"\0O1\0" if optimize else b"\0O0\0")
+    h.update(backend.encode("utf-8"))
+    if backend == "python":
+        h.update(str(sys.implementation.cache_tag).encode("utf-8"))
+    h.update(b"\0")
+    h.update(code.encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+class ProgramCache:
+    # Cache em dois níveis: LRU em memória na frente de um diretório de
+    # artefatos serializados (o equivalente ao .pyc para arquivos .churras).
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries deve ser pelo menos 1")
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # A IDE usa o mesmo cache na thread da interface e na de execução
+        self._lock = threading.RLock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, code: str, key: Optional[str] = None):
+        key = key or source_key(code)
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        entry = self._load(key)
+        if entry is not None:
+            self.disk_hits += 1
+            self._remember(key, entry)
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, code: str, entry, key: Optional[str] = None):
+        key = key or source_key(code)
+        with self._lock:
+            self._remember(key, entry)
+        self._save(key, entry)
+
+    def clear(self, disk: bool = False):
+        with self._lock:
+            self._entries.clear()
+        if disk and self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(ARTIFACT_EXT):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+            "evictions": self.evictions, "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+    def _remember(self, key: str, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ARTIFACT_EXT)
+
+    def _load(self, key: str):
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                version, entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Artefato corrompido ou incompatível: descarta e recompila
+            try: os.remove(path)
+            except OSError: pass
+            return None
+        if version != COMPILER_VERSION:
+            return None
+        return entry
+
+    def _save(self, key: str, entry):
+        if not self.cache_dir:
+            return
+        # Escrita atômica: outro processo nunca lê um artefato pela metade
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((COMPILER_VERSION, entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except Exception:
+            try: os.remove(tmp)
+            except OSError: pass
@@ -0,0 +1,218 @@
+# Arquivo: daemon_churras.py (servidor de compilação persistente)
+#
+#   python daemon_churras.py                           # pedidos pela entrada padrão
+#   python daemon_churras.py --socket /tmp/churras.sock
+#
+# O processo fica no ar com os módulos já carregados e um ProgramCache
+# quente, então um pedido curto não paga a partida do Python. Cada linha
+# recebida é um pedido JSON e cada resposta sai em uma linha JSON, com o
+# mesmo "id" do pedido:
+#   {"id": 1, "op": "run", "code": "...", "inputs": [...] ou {...}}
+#   {"id": 2, "op": "check", "file": "receita.churras"}
+#   {"id": 3, "op": "stats"}
+#   {"op": "shutdown"}
+# Opcionais em check/run: "optimize" (true), "backend" ("vm"), "timeout"
+# (segundos, só em run). "inputs" responde aos PROVAR como uma linha de
+# rows_churras; sem ele, PROVAR mantém o valor atual. "limits" (só em run)
+# tem os campos de limits_churras.Limits (max_ops, max_output_bytes,
+# max_time, max_memory) e só pode apertar os limites do servidor
+# (--max-ops etc.); o consumo volta em "usage". Resposta:
+#   {"id": ..., "status": "success"|"error", "error_stage": ..., "error_message": ...,
+#    "line": ..., "col": ..., "errors": [...], "optimizations": {...},
+#    "output": [...], "usage": {...}, "elapsed": ...}
+# Um pedido malformado responde com error_stage "Pedido"; uma falha
+# inesperada do compilador em um pedido, com "Interno".
+# No socket, cada conexão é atendida em uma thread e os pedidos de uma
+# mesma conexão são respondidos em ordem. Teste rápido:
+#   echo '{"op": "stats"}' | socat - UNIX-CONNECT:/tmp/churras.sock
+
+import os
+import sys
+import stat
+import json
+import time
+import argparse
+import threading
+import socketserver
+from typing import Callable, Dict, Iterable, Optional
+
+from parser_churras import compile_churras, check_churras, BACKENDS
+from cache_churras import ProgramCache
+from rows_churras import row_input
+from limits_churras import Limits
+
+OPS = ("check", "run", "stats", "shutdown")
+
+class RequestError(Exception):
+    pass
+
+def _source(request: Dict) -> str:
+    if isinstance(request.get("code"), str):
+        return request["code"]
+    if isinstance(request.get("file"), str):
+        try:
+            with open(request["file"], encoding="utf-8") as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise RequestError(str(e))
+    raise RequestError("pedido sem 'code' nem 'file'")
+
+def _options(request: Dict) -> Dict:
+    backend = request.get("backend", "vm")
+    if backend not in BACKENDS:
+        raise RequestError(f"backend desconhecido: {backend!r}")
+    timeout = request.get("timeout")
+    if timeout is not None and not isinstance(timeout, (int, float)):
+        raise RequestError("'timeout' deve ser um número")
+    return {"optimize": bool(request.get("optimize", True)), "backend": backend}
+
+def _limits(request: Dict, ceiling: Optional[Limits]) -> Optional[Limits]:
+    wanted = request.get("limits")
+    if wanted is None:
+        return ceiling
+    if not isinstance(wanted, dict):
+        raise RequestError("'limits' deve ser um objeto")
+    try:
+        wanted = Limits(**wanted)
+    except TypeError as e:
+        raise RequestError(f"'limits' inválido: {e}")
+    for name, value in vars(wanted).items():
+        if value is not None and (not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0):
+            raise RequestError(f"'limits.{name}' deve ser um número não negativo")
+    return wanted if ceiling is None else ceiling.tightened(wanted)
+
+def _report(result: Dict) -> Dict:
+    # Mesmos campos do relatório de batch_churras, mais a lista de erros
+    report = {
+        "status": result["status"], "error_stage": result["error_stage"],
+        "error_message": result["error_message"],
+        "line": result["error_line"], "col": result["error_col"],
+        "errors": [{"stage": e["stage"], "message": e["message"], "line": e["line"], "col": e["col"]}
+                   for e in result["errors"]],
+    }
+    if result.get("optimizations"):
+        report["optimizations"] = result["optimizations"].summary()
+    report["output"] = result["outputs"]
+    if result.get("usage"):
+        report["usage"] = result["usage"]
+    return report
+
+def handle(request: Dict, cache: ProgramCache, default_timeout: Optional[float] = None,
+           limits: Optional[Limits] = None) -> Dict:
+    # Atende um pedido já decodificado e devolve a resposta (sem o "id")
+    op = request.get("op")
+    if op not in OPS:
+        raise RequestError(f"operação desconhecida: {op!r} (opções: {', '.join(OPS)})")
+    if op == "stats":
+        return {"status": "success", "cache": cache.stats()}
+    if op == "shutdown":
+        return {"status": "success"}
+    started = time.perf_counter()
+    code, options = _source(request), _options(request)
+    if op == "run":
+        inputs = request.get("inputs", [])
+        if not isinstance(inputs, (list, dict)):
+            raise RequestError("'inputs' deve ser uma lista ou um objeto")
+        run_limits = _limits(request, limits)
+    try:
+        if op == "check":
+            result = check_churras(code, cache, **options)
+        else:
+            result = compile_churras(code, cache=cache, input_provider=row_input(inputs),
+                                     timeout=request.get("timeout", default_timeout),
+                                     limits=run_limits, **options)
+    except Exception as e:
+        # Uma falha inesperada ao compilar ou executar este programa vira a
+        # resposta deste pedido: o servidor segue atendendo os outros
+        return {"status": "error", "error_stage": "Interno", "error_message": f"{type(e).__name__}: {e}",
+                "elapsed": round(time.perf_counter() - started, 6)}
+    report = _report(result)
+    report["elapsed"] = round(time.perf_counter() - started, 6)
+    return report
+
+def serve_lines(lines: Iterable[str], write: Callable[[str], None], cache: ProgramCache,
+                default_timeout: Optional[float] = None, limits: Optional[Limits] = None) -> bool:
+    # Responde cada linha de `lines` até o fim da entrada. Devolve True se
+    # o cliente pediu "shutdown".
+    for line in lines:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("o pedido deve ser um objeto JSON")
+            request_id = request.get("id")
+            response = handle(request, cache, default_timeout, limits)
+        except (ValueError, RequestError) as e:
+            response = {"status": "error", "error_stage": "Pedido", "error_message": str(e)}
+        write(json.dumps({"id": request_id, **response}, ensure_ascii=False) + "\n")
+        if response["status"] == "success" and request.get("op") == "shutdown":
+            return True
+    return False
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        def write(text: str):
+            self.wfile.write(text.encode("utf-8"))
+            self.wfile.flush()
+        lines = (raw.decode("utf-8", errors="replace") for raw in self.rfile)
+        if serve_lines(lines, write, server.cache, server.default_timeout, server.limits):
+            # shutdown() espera o laço do servidor: não pode rodar nesta thread
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+def make_server(path: str, cache: ProgramCache, default_timeout: Optional[float] = None,
+                limits: Optional[Limits] = None):
+    # Só existe onde há sockets Unix
+    class ChurrasServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    server = ChurrasServer(path, _Handler)
+    server.cache = cache
+    server.default_timeout = default_timeout
+    server.limits = limits
+    return server
+
+def main():
+    ap = argparse.ArgumentParser(description="Servidor persistente do compilador ChurrasLang (JSON por linha)")
+    ap.add_argument("--socket", metavar="CAMINHO", help="atende em um socket Unix (sem ele, usa stdin/stdout)")
+    ap.add_argument("--cache-dir", help="diretório de artefatos .churrasc (o cache em memória é sempre usado)")
+    ap.add_argument("--max-entries", type=int, default=512, help="programas mantidos no cache em memória")
+    ap.add_argument("--timeout", type=float, help="tempo limite padrão de execução por pedido (segundos)")
+    ap.add_argument("--max-ops", type=int, help="limite de instruções executadas por pedido")
+    ap.add_argument("--max-saida", type=int, help="limite de bytes servidos por pedido")
+    ap.add_argument("--max-tempo", type=float, help="limite de tempo (compilação + execução) por pedido")
+    ap.add_argument("--max-memoria", type=int, help="limite de memória dos valores e da saída por pedido (bytes)")
+    args = ap.parse_args()
+    cache = ProgramCache(max_entries=args.max_entries, cache_dir=args.cache_dir)
+    limits = Limits(args.max_ops, args.max_saida, args.max_tempo, args.max_memoria)
+    if limits == Limits():
+        limits = None
+
+    if not args.socket:
+        def write(text: str):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        serve_lines(sys.stdin, write, cache, args.timeout, limits)
+        return 0
+
+    if not hasattr(socketserver, "UnixStreamServer"):
+        ap.error("sockets Unix não são suportados nesta plataforma (use stdin/stdout)")
+    if os.path.exists(args.socket):
+        # Sobra de uma execução anterior; qualquer outro arquivo fica
+        if not stat.S_ISSOCK(os.stat(args.socket).st_mode):
+            ap.error(f"{args.socket} existe e não é um socket")
+        os.unlink(args.socket)
+    with make_server(args.socket, cache, args.timeout, limits) as server:
+        print(f"Atendendo em {args.socket}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
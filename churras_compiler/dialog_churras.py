@@ -0,0 +1,13 @@
+import tkinter as tk
+from tkinter import simpledialog
+from typing import Optional
+from vm_churras import InputProvider
+
+# Entrada do PROVAR por caixa de diálogo. Fica fora do núcleo do compilador:
+# só a IDE (ou quem passa root_window) carrega o Tk.
+
+def dialog_input(root_window: tk.Tk) -> InputProvider:
+    def provider(ident: str, variable_type: str) -> Optional[str]:
+        prompt_text = f"Digite um valor para a variável '{ident}' (tipo: {variable_type}):"
+        return simpledialog.askstring("PROVAR (Entrada de Dados)", prompt_text, parent=root_window)
+    return provider
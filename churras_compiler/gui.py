@@ -1,7 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, font, simpledialog, filedialog
 
-from parser_churras import compile_churras
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from parser_churras import check_churras
+from dialog_churras import dialog_input
+from worker_churras import CompileJob
+from incremental_churras import IncrementalLexer
+from cache_churras import ProgramCache
 
 # --- CORES E FONTES ---
 COLOR_BACKGROUND = "#282c34"
@@ -13,6 +20,21 @@ COLOR_ACCENT = "#61afef"
 COLOR_SUCCESS_BG = "#2f4f4f"
 COLOR_ERROR_FG = "#ff6b6b"
 COLOR_SUCCESS_FG = "#8fbc8f"
+COLOR_KEYWORD = "#c678dd"
+COLOR_STRING = "#98c379"
+COLOR_NUMBER = "#d19a66"
+COLOR_COMMENT = "#5c6370"
+
+# Espera depois da última tecla antes de rodar a verificação ao vivo
+LIVE_CHECK_DELAY_MS = 400
+# Numeração e cores são atualizadas no máximo uma vez por quadro (~60 Hz)
+REFRESH_DELAY_MS = 16
+SYNTAX_TAGS = ("keyword", "string", "number", "comment")
+# Intervalo de consulta às mensagens da thread de execução
+WORKER_POLL_MS = 50
+# Linhas de saída mantidas na caixa "Saída" (as mais antigas são descartadas)
+OUTPUT_MAX_LINES = 5000
+DEFAULT_TIMEOUT_S = 60.0
 
 FONT_CODE = ("Consolas", 12)
 FONT_UI = ("Segoe UI", 10)
@@ -44,23 +66,122 @@ COZINHAR
 FIM_CHURRAS"""
 
 class LineNumbers(tk.Canvas):
+    # Um item de texto por linha visível, reaproveitado entre os redesenhos:
+    # só muda o texto ou a posição do item que mudou, e os que sobram ficam
+    # escondidos
     def __init__(self, *args, **kwargs):
         tk.Canvas.__init__(self, *args, **kwargs)
         self.text_widget = None
+        self._items = []
+        self._shown = []    # (número, y) de cada item; None se escondido
 
     def attach(self, text_widget):
         self.text_widget = text_widget
 
     def redraw(self, *args):
-        self.delete("all")
         i = self.text_widget.index("@0,0")
+        n = 0
         while True:
             dline = self.text_widget.dlineinfo(i)
             if dline is None: break
-            y = dline[1]
-            line_num = str(i).split(".")[0]
-            self.create_text(2, y, anchor="nw", text=line_num, fill=COLOR_TEXT, font=FONT_UI)
+            shown = (i.split(".")[0], dline[1])
+            if n == len(self._items):
+                self._items.append(self.create_text(2, shown[1], anchor="nw", text=shown[0],
+                                                    fill=COLOR_TEXT, font=FONT_UI))
+                self._shown.append(shown)
+            elif self._shown[n] != shown:
+                item = self._items[n]
+                self.coords(item, 2, shown[1])
+                self.itemconfigure(item, text=shown[0], state="normal")
+                self._shown[n] = shown
+            n += 1
             i = self.text_widget.index(f"{i}+1line")
+        for k in range(n, len(self._items)):
+            if self._shown[k] is not None:
+                self.itemconfigure(self._items[k], state="hidden")
+                self._shown[k] = None
+
+class VirtualTokenTable(tk.Frame):
+    # Tabela de tokens virtualizada: o Treeview só tem as linhas que cabem
+    # na tela, e rolar apenas troca os valores delas. Funciona com qualquer
+    # sequência de TokenRow (len + fatiamento), como a TokenTable.
+    def __init__(self, master, **kwargs):
+        tk.Frame.__init__(self, master, **kwargs)
+        self.tree = ttk.Treeview(self, columns=("Type", "Lexeme", "Position"), show="headings", selectmode="none")
+        self.tree.heading("Type", text="Tipo de Token")
+        self.tree.heading("Lexeme", text="Lexema")
+        self.tree.heading("Position", text="Posição (L, C)")
+        self.tree.column("Type", width=150)
+        self.tree.column("Lexeme", width=200)
+        self.tree.column("Position", width=100)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.tag_configure('evenrow', background=COLOR_TEXT_AREA_BG)
+        self.tree.tag_configure('oddrow', background=COLOR_FRAME)
+
+        self.rows = []
+        self.offset = 0
+        self.tree.bind("<Configure>", lambda e: self._render())
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self.offset = 0
+        self._render()
+
+    def clear(self):
+        self.set_rows([])
+
+    def _visible_count(self) -> int:
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else None
+        if bbox:
+            header, row_height = bbox[1], bbox[3]
+        else:
+            header, row_height = 25, 20
+        return max(1, (self.tree.winfo_height() - header) // max(1, row_height))
+
+    def scroll(self, lines: int):
+        self.offset += lines
+        self._render()
+
+    def _on_mousewheel(self, event):
+        self.scroll(-1 * (event.delta // 120) * 3)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        visible = self._visible_count()
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.rows))
+        elif unit == "pages":
+            self.offset += int(amount) * visible
+        else:
+            self.offset += int(amount)
+        self._render()
+
+    def _render(self):
+        total = len(self.rows)
+        visible = self._visible_count()
+        self.offset = max(0, min(self.offset, total - visible))
+        page = self.rows[self.offset:self.offset + visible]
+
+        # Reaproveita os itens já existentes; só cria ou remove a diferença
+        items = list(self.tree.get_children())
+        if len(items) > len(page):
+            self.tree.delete(*items[len(page):])
+            items = items[:len(page)]
+        while len(items) < len(page):
+            items.append(self.tree.insert("", "end"))
+        for k, (item, row) in enumerate(zip(items, page)):
+            tag = 'evenrow' if (self.offset + k) % 2 == 0 else 'oddrow'
+            self.tree.item(item, values=(row.type, row.lexeme, f"L: {row.line}, C: {row.col}"), tags=(tag,))
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
 
 class ChurrasIDE:
     def __init__(self, root):
@@ -68,6 +189,23 @@ class ChurrasIDE:
         self.root.title("🥩🔥 ChurrasLang IDE")
         self.root.geometry("1200x700")
         self.root.configure(bg=COLOR_BACKGROUND)
+        # Reexecutar o mesmo código não precisa compilar de novo
+        self.program_cache = ProgramCache(max_entries=32)
+        self.incremental_lexer = IncrementalLexer()
+        # Linha -> LineInfo cujas cores estão aplicadas no editor
+        self._painted = {}
+        self._refresh_job = None
+        self._text_changed = False
+        self._live_check_job = None
+        # Versão do texto do editor: muda a cada edição. O resultado de uma
+        # verificação ao vivo só é aplicado se o texto não mudou desde o início
+        self._buffer_version = 0
+        # A verificação ao vivo roda fora da thread da interface, uma por vez
+        self._live_checker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="churras-check")
+        self.job = None
+        self.output_lines = 0
+        self.timeout = DEFAULT_TIMEOUT_S
+        self.profile_enabled = tk.BooleanVar(value=False)
 
         # --- CONFIGURAÇÃO DE ESTILO PARA O TREEVIEW ---
         style = ttk.Style()
@@ -88,7 +226,6 @@ class ChurrasIDE:
                   foreground=[('selected', 'white')])
 
         self._setup_widgets()
-        self._setup_tags()
         self.code_input.focus_set()
 
     def _setup_widgets(self):
@@ -101,6 +238,13 @@ class ChurrasIDE:
         file_menu.add_separator()
         file_menu.add_command(label="Sair", command=self.root.quit)
 
+        run_menu = tk.Menu(menu, tearoff=0)
+        menu.add_cascade(label="Execução", menu=run_menu)
+        run_menu.add_command(label="Assar", command=self.run_compiler)
+        run_menu.add_command(label="Cancelar execução", command=self.cancel_compiler)
+        run_menu.add_command(label="Tempo limite...", command=self._ask_timeout)
+        run_menu.add_checkbutton(label="Perfilar (tempo por fase e por linha)", variable=self.profile_enabled)
+
         example_menu = tk.Menu(menu, tearoff=0)
         menu.add_cascade(label="Exemplos", menu=example_menu)
         example_menu.add_command(label="Código Válido (PROVAR)", command=lambda: self._load_example(EXAMPLE_VALID))
@@ -117,6 +261,8 @@ class ChurrasIDE:
             font=FONT_CODE, bg=COLOR_TEXT_AREA_BG, fg=COLOR_TEXT, insertbackground="white",
             relief=tk.FLAT, borderwidth=0, highlightthickness=0)
         self.code_input.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Rolar também atualiza a numeração e as cores da parte que aparece
+        self.code_input.configure(yscrollcommand=self._on_text_scroll)
         self.line_numbers.attach(self.code_input)
         main_pane.add(editor_frame, minsize=400)
 
@@ -124,67 +270,154 @@ class ChurrasIDE:
         main_pane.add(right_frame, minsize=500)
 
         tk.Label(right_frame, text="Tabela de Tokens", font=(FONT_UI[0], 11, 'bold'), bg=COLOR_BACKGROUND, fg=COLOR_ACCENT).pack(anchor="w", pady=(0,5))
-        token_frame = tk.Frame(right_frame)
-        token_frame.pack(fill=tk.BOTH, expand=True)
-        self.token_tree = ttk.Treeview(token_frame, columns=("Type", "Lexeme", "Position"), show="headings")
-        self.token_tree.heading("Type", text="Tipo de Token")
-        self.token_tree.heading("Lexeme", text="Lexema")
-        self.token_tree.heading("Position", text="Posição (L, C)")
-        self.token_tree.column("Type", width=150)
-        self.token_tree.column("Lexeme", width=200)
-        self.token_tree.column("Position", width=100)
-        self.token_tree.pack(fill=tk.BOTH, expand=True)
+        self.token_table = VirtualTokenTable(right_frame)
+        self.token_table.pack(fill=tk.BOTH, expand=True)
 
         tk.Label(right_frame, text="Saída do Programa", font=(FONT_UI[0], 11, 'bold'), bg=COLOR_BACKGROUND, fg=COLOR_ACCENT).pack(anchor="w", pady=(10,5))
         self.output_display = scrolledtext.ScrolledText(right_frame, font=FONT_CODE, 
             height=5, bg=COLOR_TEXT_AREA_BG, fg="white", relief=tk.FLAT)
         self.output_display.pack(fill=tk.BOTH, expand=False, pady=(0,10))
         self.output_display.config(state=tk.DISABLED)
+
+        tk.Label(right_frame, text="Perfil", font=(FONT_UI[0], 11, 'bold'), bg=COLOR_BACKGROUND, fg=COLOR_ACCENT).pack(anchor="w", pady=(0,5))
+        self.profile_display = scrolledtext.ScrolledText(right_frame, font=FONT_CODE,
+            height=6, bg=COLOR_TEXT_AREA_BG, fg=COLOR_TEXT, relief=tk.FLAT)
+        self.profile_display.pack(fill=tk.BOTH, expand=False, pady=(0,10))
+        self._set_profile_text("Ative em Execução > Perfilar e asse o código.")
         
         status_frame = tk.Frame(self.root, bg=COLOR_BACKGROUND)
         status_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
         self.status_label = tk.Label(status_frame, text="Pronto para assar!", font=FONT_UI, bg=COLOR_FRAME, fg=COLOR_TEXT, anchor='w', padx=10, pady=5)
         self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
+        self.cancel_button = ttk.Button(status_frame, text="✋ CANCELAR", command=self.cancel_compiler, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT, padx=(10,0))
         self.compile_button = ttk.Button(status_frame, text="🥩 ASSAR CÓDIGO", command=self.run_compiler)
         self.compile_button.pack(side=tk.RIGHT, padx=(10,0))
 
         self.code_input.bind("<<Modified>>", self._on_text_change)
-        self.code_input.bind("<Configure>", self._on_text_change)
-        
+        self.code_input.bind("<Configure>", lambda e: self._schedule_refresh())
+
+        self._setup_tags()
         self._load_example(EXAMPLE_VALID)
 
     def _on_text_change(self, event=None):
-        self.line_numbers.redraw()
         self.code_input.edit_modified(False)
+        self._text_changed = True
+        self._buffer_version += 1
+        self._schedule_refresh()
+        if self._live_check_job is not None:
+            self.root.after_cancel(self._live_check_job)
+        self._live_check_job = self.root.after(LIVE_CHECK_DELAY_MS, self._live_check)
+
+    def _on_text_scroll(self, first, last):
+        self.code_input.vbar.set(first, last)
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        # Várias teclas, rolagens e redimensionamentos no mesmo quadro viram
+        # um único redesenho
+        if self._refresh_job is None:
+            self._refresh_job = self.root.after(REFRESH_DELAY_MS, self._refresh)
+
+    def _refresh(self):
+        self._refresh_job = None
+        if self._text_changed:
+            self._text_changed = False
+            lines = self.code_input.get("1.0", "end-1c").split("\n")
+            self.incremental_lexer.update(lines)
+            for n in [n for n in self._painted if n >= len(lines)]:
+                del self._painted[n]
+        self.line_numbers.redraw()
+        self._highlight_visible()
+
+    def _highlight_visible(self):
+        # O léxico só avança até a última linha visível, e só são recoloridas
+        # as linhas visíveis cujo resultado mudou desde a última pintura.
+        # Linhas fora da tela ficam para quando aparecerem
+        first = int(self.code_input.index("@0,0").split(".")[0]) - 1
+        last = int(self.code_input.index(f"@0,{self.code_input.winfo_height()}").split(".")[0])
+        lexer = self.incremental_lexer
+        lexer.ensure(last)
+        for n in range(first, min(last, len(lexer))):
+            info = lexer.lines[n]
+            if self._painted.get(n) is info:
+                continue
+            for tag in SYNTAX_TAGS:
+                self.code_input.tag_remove(tag, f"{n + 1}.0", f"{n + 1}.end")
+            for kind, start, stop in info.spans:
+                self.code_input.tag_add(kind, f"{n + 1}.{start}", f"{n + 1}.{stop}")
+            self._painted[n] = info
+
+    def _live_check(self):
+        # Verificação só sintática (não executa o programa nem pede PROVAR).
+        # Roda em outra thread para não travar a digitação em programas grandes
+        self._live_check_job = None
+        future = self._live_checker.submit(check_churras, self.code_input.get("1.0", "end-1c"),
+                                           cache=self.program_cache)
+        self.root.after(WORKER_POLL_MS, self._poll_live_check, future, self._buffer_version)
+
+    def _poll_live_check(self, future, version):
+        if not future.done():
+            self.root.after(WORKER_POLL_MS, self._poll_live_check, future, version)
+            return
+        if version != self._buffer_version:
+            # O texto mudou durante a verificação: outra já foi agendada
+            return
+        result = future.result()
+        self._clear_tags()
+        if self.job is not None:
+            # Não sobrescreve o status de uma execução em andamento
+            if result["status"] == "error":
+                self._highlight_errors(result["errors"], see=False)
+        elif result["status"] == "error":
+            self._highlight_errors(result["errors"], see=False)
+            self.status_label.config(text=_status_text(result), bg=COLOR_ERROR_BG, fg=COLOR_ERROR_FG)
+        else:
+            self.status_label.config(text="Sem erros de sintaxe. Pronto para assar!", fg=COLOR_TEXT, bg=COLOR_FRAME)
 
     def _setup_tags(self):
         self.code_input.tag_configure("error", background=COLOR_ERROR_BG)
-        # TAGS PARA AS CORES ALTERNADAS DA TABELA
-        self.token_tree.tag_configure('evenrow', background=COLOR_TEXT_AREA_BG)
-        self.token_tree.tag_configure('oddrow', background=COLOR_FRAME)
+        self.code_input.tag_configure("keyword", foreground=COLOR_KEYWORD)
+        self.code_input.tag_configure("string", foreground=COLOR_STRING)
+        self.code_input.tag_configure("number", foreground=COLOR_NUMBER)
+        self.code_input.tag_configure("comment", foreground=COLOR_COMMENT)
 
     def _clear_tags(self):
         self.code_input.tag_remove("error", "1.0", "end")
 
-    def _highlight_error(self, token):
-        if token:
-            start = f"{token.line}.{token.col - 1}"
+    def _highlight_errors(self, errors, see=True):
+        # Marca a linha de cada erro (os do léxico não têm token, só a
+        # posição) e rola até o primeiro
+        for n, error in enumerate(errors):
+            if error["line"] is None:
+                continue
+            start = f'{error["line"]}.{error["col"] - 1}'
             line_end = self.code_input.index(f"{start} lineend")
             self.code_input.tag_add("error", f"{start} linestart", line_end)
-            self.code_input.see(start)
+            if see and n == 0:
+                self.code_input.see(start)
 
     def _load_example(self, content):
         self._clear_all()
         self.code_input.insert("1.0", content)
 
+    def _set_profile_text(self, text):
+        self.profile_display.config(state=tk.NORMAL)
+        self.profile_display.delete("1.0", "end")
+        self.profile_display.insert("1.0", text)
+        self.profile_display.config(state=tk.DISABLED)
+
     def _clear_all(self):
         self._clear_tags()
         self.code_input.delete("1.0", "end")
-        self.token_tree.delete(*self.token_tree.get_children())
+        # O texto novo entra sem cores, mesmo nas linhas iguais às de antes
+        self._painted.clear()
+        self.token_table.clear()
         self.output_display.config(state=tk.NORMAL)
         self.output_display.delete("1.0", "end")
         self.output_display.config(state=tk.DISABLED)
+        self.output_lines = 0
         self.status_label.config(text="Pronto para assar!", fg=COLOR_TEXT, bg=COLOR_FRAME)
     
     def _open_file(self):
@@ -199,35 +432,103 @@ class ChurrasIDE:
         with open(filepath, "w", encoding='utf-8') as f:
             f.write(self.code_input.get("1.0", "end-1c"))
 
+    def _ask_timeout(self):
+        value = simpledialog.askfloat("Tempo limite", "Tempo limite de execução em segundos (0 = sem limite):",
+                                      initialvalue=self.timeout or 0, minvalue=0, parent=self.root)
+        if value is not None:
+            self.timeout = value or None
+
     def run_compiler(self):
+        # A compilação e a execução rodam em outra thread; a interface só
+        # consulta a fila de mensagens do job
+        if self.job is not None:
+            return
         self._clear_tags()
-        self.token_tree.delete(*self.token_tree.get_children())
+        self.token_table.clear()
         self.output_display.config(state=tk.NORMAL)
         self.output_display.delete("1.0", "end")
-
-        code_text = self.code_input.get("1.0", "end-1c")
-        result = compile_churras(code_text, self.root)
-
-        count = 0
-        for token_line in result.get("tokens", []):
-            parts = token_line.split('|')
-            tag = 'evenrow' if count % 2 == 0 else 'oddrow'
-            self.token_tree.insert("", "end", values=(parts[0].strip(), parts[1].strip(), parts[2].strip()), tags=(tag,))
-            count += 1
-
-        self.output_display.insert("1.0", result.get("output", ""))
         self.output_display.config(state=tk.DISABLED)
+        self.output_lines = 0
 
-        msg = f'[{result.get("error_stage", "Sucesso")}] {result.get("error_message", "Pronto.")}'
-        self.status_label.config(text=msg)
+        code_text = self.code_input.get("1.0", "end-1c")
+        self.job = CompileJob(code_text, cache=self.program_cache, timeout=self.timeout,
+                              profile=self.profile_enabled.get())
+        self.job.start()
+        self.compile_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status_label.config(text="Assando...", fg=COLOR_TEXT, bg=COLOR_FRAME)
+        self.root.after(WORKER_POLL_MS, self._poll_worker)
+
+    def cancel_compiler(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.status_label.config(text="Cancelando...")
+
+    def _append_output(self, lines):
+        # Acrescenta a saída recebida e descarta as linhas mais antigas além
+        # de OUTPUT_MAX_LINES, para a caixa não crescer sem limite
+        if not lines:
+            return
+        display = self.output_display
+        display.config(state=tk.NORMAL)
+        if self.output_lines:
+            display.insert("end-1c", "\n")
+        display.insert("end-1c", "\n".join(lines))
+        self.output_lines += len(lines)
+        if self.output_lines > OUTPUT_MAX_LINES:
+            display.delete("1.0", f"{self.output_lines - OUTPUT_MAX_LINES + 1}.0")
+            self.output_lines = OUTPUT_MAX_LINES
+        display.see("end")
+        display.config(state=tk.DISABLED)
+
+    def _poll_worker(self):
+        job = self.job
+        self._append_output(job.output.drain())
+        try:
+            while True:
+                kind, payload = job.messages.get_nowait()
+                if kind == "input":
+                    # O PROVAR é respondido aqui, na thread da interface
+                    payload.answer(dialog_input(self.root)(payload.ident, payload.variable_type))
+                elif kind == "done":
+                    self._append_output(job.output.drain())
+                    self.job = None
+                    self.compile_button.config(state=tk.NORMAL)
+                    self.cancel_button.config(state=tk.DISABLED)
+                    self._show_result(payload)
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(WORKER_POLL_MS, self._poll_worker)
+
+    def _show_result(self, result):
+        self.token_table.set_rows(result.get("tokens", []))
+
+        # A saída já chegou durante a execução (_append_output)
+        if result["status"] == "success" and not self.output_lines:
+            self._append_output(["<nenhuma>"])
+        if result.get("profile"):
+            self._set_profile_text("\n".join(result["profile"].lines_report()))
+
+        self.status_label.config(text=_status_text(result))
         
         if result["status"] == "error":
             self.status_label.config(bg=COLOR_ERROR_BG, fg=COLOR_ERROR_FG)
-            self._highlight_error(result.get("error_token"))
+            self._highlight_errors(result["errors"])
         else:
             self.status_label.config(bg=COLOR_SUCCESS_BG, fg=COLOR_SUCCESS_FG)
 
+def _status_text(result) -> str:
+    # O primeiro erro e quantos outros a compilação encontrou
+    msg = f'[{result.get("error_stage", "Sucesso")}] {result.get("error_message", "Pronto.")}'
+    others = len(result.get("errors", [])) - 1
+    if others > 0:
+        msg += f" (+{others} outro{'s' if others > 1 else ''} erro{'s' if others > 1 else ''})"
+    return msg
+
 if __name__ == "__main__":
     root = tk.Tk()
     ide = ChurrasIDE(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    # Verificações ao vivo ainda na fila não precisam rodar depois de fechar
+    ide._live_checker.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,116 @@
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from tokens_churras import TokenType, KEYWORDS
+from lexer_churras import Lexer, LexerError
+
+# O único estado do léxico que atravessa uma quebra de linha é estar dentro
+# de uma String; comentários e números terminam sempre no fim da linha.
+
+# Tipo de destaque de cada token (os demais ficam sem cor)
+_KIND_BY_CODE = {t.value: "keyword" for t in KEYWORDS.values()}
+_KIND_BY_CODE[TokenType.STRING.value] = "string"
+_KIND_BY_CODE[TokenType.NUM_INTEIRO.value] = "number"
+_KIND_BY_CODE[TokenType.NUM_REAL.value] = "number"
+
+@dataclass
+class LineInfo:
+    text: str
+    state_in: bool                      # começa dentro de uma String?
+    state_out: bool
+    spans: List[Tuple[str, int, int]]   # (tipo, coluna inicial, coluna final), base 0
+    error: Optional[str] = None
+    line_no: int = 0                    # linha em que foi analisada
+
+_line_lexer = Lexer("")
+
+def lex_line(text: str, state: bool, line_no: int, kinds: Dict[int, str] = _KIND_BY_CODE) -> LineInfo:
+    # `kinds` dá o tipo de destaque de cada código de token (o servidor de
+    # linguagem também colore identificadores e operadores)
+    spans = []
+    pos = 0
+    if state:
+        # Continuação de uma String aberta em uma linha anterior
+        j = text.find('"')
+        if j == -1:
+            return LineInfo(text, state, state, [("string", 0, len(text))], None, line_no)
+        spans.append(("string", 0, j + 1))
+        pos = j + 1
+
+    # Com a quebra de linha no fim, só uma String aberta faz a varredura
+    # parar antes do fim (final=False)
+    src = text[pos:] + "\n"
+    types, starts, ends = array("B"), array("I"), array("I")
+    error = None
+    try:
+        stop = _line_lexer._scan(src, False, line_no, -pos, types, starts, ends)
+    except LexerError as e:
+        error, stop = str(e), len(src)
+    for code, start, end in zip(types, starts, ends):
+        kind = kinds.get(code)
+        if kind:
+            spans.append((kind, start + pos, end + pos))
+
+    state_out = stop < len(src)
+    if state_out:
+        spans.append(("string", stop + pos, len(text)))
+    elif error is None:
+        # Entre os tokens só há espaços, então um '#' depois do último token
+        # começa o comentário
+        comment = text.find('#', ends[-1] + pos if ends else pos)
+        if comment != -1:
+            spans.append(("comment", comment, len(text)))
+    return LineInfo(text, state, state_out, spans, error, line_no)
+
+class IncrementalLexer:
+    # Guarda o resultado do léxico linha a linha e só analisa sob demanda:
+    # a IDE pede as linhas visíveis (info/ensure) e o léxico avança até elas.
+    # Depois de uma edição, as linhas de antes dela continuam valendo e as
+    # de depois são reaproveitadas enquanto começarem no mesmo estado.
+    def __init__(self):
+        self.texts: List[str] = []
+        self.lines: List[Optional[LineInfo]] = []
+        self._valid = 0     # linhas [0, _valid) já conferidas
+
+    def __len__(self):
+        return len(self.texts)
+
+    def update(self, new_lines: List[str]) -> int:
+        # Troca o texto e devolve a primeira linha alterada (len(new_lines)
+        # se nada mudou). Nenhuma linha é analisada aqui.
+        old_texts, old = self.texts, self.lines
+        n_old, n_new = len(old_texts), len(new_lines)
+        limit = min(n_old, n_new)
+        first = 0
+        while first < limit and old_texts[first] == new_lines[first]:
+            first += 1
+        if first == n_new and n_old == n_new:
+            return first
+        tail = 0
+        while tail < limit - first and old_texts[n_old - 1 - tail] == new_lines[n_new - 1 - tail]:
+            tail += 1
+        self.texts = new_lines
+        self.lines = old[:first] + [None] * (n_new - first - tail) + old[n_old - tail:]
+        self._valid = min(self._valid, first)
+        return first
+
+    def ensure(self, end: int):
+        # Deixa as linhas [0, end) analisadas e no estado certo
+        end = min(end, len(self.texts))
+        lines = self.lines
+        for i in range(self._valid, end):
+            state = lines[i - 1].state_out if i else False
+            info = lines[i]
+            # Uma linha com erro também muda se mudou de número (a mensagem
+            # traz a linha)
+            if info is None or info.state_in != state or info.error is not None and info.line_no != i + 1:
+                lines[i] = lex_line(self.texts[i], state, i + 1)
+        self._valid = max(self._valid, end)
+
+    def info(self, n: int) -> LineInfo:
+        self.ensure(n + 1)
+        return self.lines[n]
+
+    def errors(self) -> List[Tuple[int, str]]:
+        self.ensure(len(self.texts))
+        return [(n + 1, info.error) for n, info in enumerate(self.lines) if info.error]
@@ -1,112 +1,281 @@
-from typing import List
-from tokens_churras import Token, TokenType, KEYWORDS
+import codecs
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union, IO
+from array import array
+from bisect import bisect_right
+from tokens_churras import Token, TokenType, TokenStream, KEYWORDS, SYMBOLS, TYPE_BY_CODE, line_start_index
 
 class LexerError(Exception):
-    pass
+    def __init__(self, message, line=None, col=None):
+        super().__init__(message)
+        self.line = line
+        self.col = col
+        self.offset = None    # posição no buffer do léxico (para ordenar na leitura em fluxo)
+
+# --- TABELAS DO AUTÔMATO ---
+# Cada caractere do código é mapeado (com str.translate) para uma classe.
+# O estado inicial do autômato escolhe a transição pela classe do primeiro
+# caractere do token; as sequências de letras, dígitos e espaços são
+# consumidas de uma vez, procurando o fim da sequência em uma "máscara"
+# do código (str.find roda em C, sem uma chamada Python por caractere).
+C_ESPACO = "s"       # ' ', '\t', '\r'
+C_NOVA_LINHA = "n"
+C_COMENTARIO = "h"   # '#'
+C_ASPAS = "q"
+C_LETRA = "a"        # letras e '_'
+C_DIGITO = "d"       # só '0'-'9': outros dígitos Unicode (ex.: '²') são inválidos
+C_SIMBOLO = "o"      # símbolos de SYMBOLS
+C_OUTRO = "x"
+
+def _classify(ch: str) -> str:
+    if ch in SYMBOLS: return C_SIMBOLO
+    if ch in (' ', '\t', '\r'): return C_ESPACO
+    if ch == '\n': return C_NOVA_LINHA
+    if ch == '#': return C_COMENTARIO
+    if ch == '"': return C_ASPAS
+    if ch.isalpha() or ch == '_': return C_LETRA
+    if '0' <= ch <= '9': return C_DIGITO
+    return C_OUTRO
+
+# Máscaras: '1' para caracteres que continuam a sequência, '0' para os demais
+_MASK_CLASSES = {
+    "ident": (C_LETRA, C_DIGITO),
+    "digit": (C_DIGITO,),
+    "space": (C_ESPACO,),
+    "blank": (C_ESPACO, C_NOVA_LINHA),
+}
+
+def _build_tables(chars) -> Dict[str, Dict[int, str]]:
+    classes = {ord(ch): _classify(ch) for ch in chars}
+    tables = {"class": classes}
+    for name, accepted in _MASK_CLASSES.items():
+        tables[name] = {o: ('1' if c in accepted else '0') for o, c in classes.items()}
+    return tables
+
+# Para código que cabe em Latin-1 (o caso normal, mesmo com acentos) as
+# mesmas tabelas viram tabelas de bytes, e a tradução é feita por
+# bytes.translate, bem mais rápido que str.translate.
+_LATIN1_TABLES = _build_tables(chr(i) for i in range(256))
+_BYTE_TABLES = {
+    name: bytes(ord(table[o]) for o in range(256))
+    for name, table in _LATIN1_TABLES.items()
+}
+_TABLE_NAMES = ("class", "ident", "digit", "space", "blank")
+
+def _translate_all(source: str) -> Tuple[str, ...]:
+    try:
+        raw = source.encode("latin-1")
+    except UnicodeEncodeError:
+        # Caracteres acima de Latin-1 só entram na tabela quando aparecem no código
+        tables = _build_tables(ch for ch in set(source) if ord(ch) >= 256)
+        for name, table in tables.items():
+            table.update(_LATIN1_TABLES[name])
+        return tuple(source.translate(tables[name]) for name in _TABLE_NAMES)
+    return tuple(raw.translate(_BYTE_TABLES[name]).decode("ascii") for name in _TABLE_NAMES)
+
+KEYWORD_CODES = {k: t.value for k, t in KEYWORDS.items()}
+SYMBOL_CODES = {ch: t.value for ch, t in SYMBOLS.items()}
+ID_CODE = TokenType.ID.value
+NUM_INTEIRO_CODE = TokenType.NUM_INTEIRO.value
+NUM_REAL_CODE = TokenType.NUM_REAL.value
+STRING_CODE = TokenType.STRING.value
+EOF_CODE = TokenType.EOF.value
+
+DEFAULT_CHUNK_SIZE = 1 << 20
 
 class Lexer:
-    def __init__(self, source: str):
-        self.src = source
-        self.i = 0
-        self.line = 1
-        self.col = 1
-        self.length = len(source)
-
-    def _peek(self, k=0):
-        j = self.i + k
-        if j >= self.length:
-            return '\0'
-        return self.src[j]
-
-    def _advance(self):
-        ch = self._peek()
-        self.i += 1
-        if ch == '\n':
-            self.line += 1
-            self.col = 1
+    # `source` pode ser o código em uma string ou qualquer objeto com read(n):
+    # arquivo texto, arquivo binário (UTF-8) ou mmap. Nesse caso o código é
+    # lido em blocos e nunca fica inteiro na memória.
+    # Com `errors`, um erro não interrompe a análise: ele é guardado na lista
+    # e o léxico pula o trecho inválido (o símbolo, o '.' sem dígitos ou o
+    # resto da linha de uma String não terminada).
+    def __init__(self, source: Union[str, IO], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 errors: Optional[List[LexerError]] = None):
+        if isinstance(source, str):
+            # O '\0' marca o fim do código, como no autômato original
+            nul = source.find('\0')
+            if nul != -1:
+                source = source[:nul]
+            self.src, self.stream = source, None
         else:
-            self.col += 1
-        return ch
+            self.src, self.stream = None, source
+        self.chunk_size = chunk_size
+        self.errors = errors
 
-    def _is_alpha(self, ch): return (ch.isalpha()) or ch == '_'
-    def _is_alnum(self, ch): return self._is_alpha(ch) or ch.isdigit()
-    def _is_digit(self, ch): return ch.isdigit()
+    def tokenize(self) -> Sequence[Token]:
+        if self.stream is not None:
+            # Sem o código inteiro em memória não há de onde fatiar os lexemas
+            return list(self.iter_tokens())
+        src = self.src
+        n = len(src)
+        offsets = "I" if n < 2 ** 32 else "Q"
+        types, starts, ends = array("B"), array(offsets), array(offsets)
+        self._scan(src, True, 1, 0, types, starts, ends)
+        types.append(EOF_CODE); starts.append(n); ends.append(n)
+        return TokenStream(src, types, starts, ends)
 
-    def tokenize(self) -> List[Token]:
-        tokens: List[Token] = []
-        while True:
-            tok = self._next_token()
-            tokens.append(tok)
-            if tok.type == TokenType.EOF:
-                break
-        return tokens
+    def iter_tokens(self) -> Iterator[Token]:
+        if self.stream is None:
+            yield from self.tokenize()
+            return
+
+        buf, line, line_start = "", 1, 0
+        for chunk, final in self._chunks():
+            buf += chunk
+            types, starts, ends = array("B"), array("Q"), array("Q")
+            error = None
+            recovered: List[LexerError] = []
+            try:
+                if self.errors is None:
+                    stop = self._scan(buf, final, line, line_start, types, starts, ends)
+                else:
+                    # Os erros do bloco entram na lista na ordem em que os
+                    # tokens são entregues, como se fossem lançados
+                    known = len(self.errors)
+                    stop = self._scan(buf, final, line, line_start, types, starts, ends)
+                    recovered = self.errors[known:]
+                    del self.errors[known:]
+                    recovered.reverse()
+            except LexerError as e:
+                error, stop = e, 0
+            # Linha e coluna de cada token do bloco, em ordem
+            prev = 0
+            for code, start, end in zip(types, starts, ends):
+                while recovered and recovered[-1].offset <= start:
+                    self.errors.append(recovered.pop())
+                nl = buf.count('\n', prev, start)
+                if nl:
+                    line += nl
+                    line_start = buf.rfind('\n', prev, start) + 1
+                prev = start
+                lexeme = buf[start + 1:end - 1] if code == STRING_CODE else buf[start:end]
+                yield Token(TYPE_BY_CODE[code], lexeme, line, start - line_start + 1)
+            if error is not None:
+                raise error
+            while recovered:
+                self.errors.append(recovered.pop())
+            nl = buf.count('\n', prev, stop)
+            if nl:
+                line += nl
+                line_start = buf.rfind('\n', prev, stop) + 1
+            # O que sobrou é um token incompleto: fica para o próximo bloco,
+            # e line_start passa a ser relativo ao novo início do buffer
+            buf = buf[stop:]
+            line_start -= stop
+        yield Token(TokenType.EOF, "", line, len(buf) - line_start + 1)
 
-    def _skip_whitespace_and_comments(self):
+    def _chunks(self) -> Iterator[Tuple[str, bool]]:
+        decoder = None
         while True:
-            ch = self._peek()
-            if ch in [' ', '\t', '\r', '\n']:
-                self._advance()
-                continue
-            if ch == '#':
-                while self._peek() not in ['\n','\0']:
-                    self._advance()
-                continue
-            break
-
-    def _next_token(self) -> Token:
-        self._skip_whitespace_and_comments()
-        start_line, start_col = self.line, self.col
-        ch = self._peek()
-
-        if ch == '\0':
-            return Token(TokenType.EOF, "", start_line, start_col)
-
-        if ch == '=': self._advance(); return Token(TokenType.OP_ATRIB, "=", start_line, start_col)
-        if ch == '+': self._advance(); return Token(TokenType.OP_SOMA, "+", start_line, start_col)
-        if ch == '-': self._advance(); return Token(TokenType.OP_SUB, "-", start_line, start_col)
-        if ch == '*': self._advance(); return Token(TokenType.OP_MULT, "*", start_line, start_col)
-        if ch == '/': self._advance(); return Token(TokenType.OP_DIV, "/", start_line, start_col)
-        if ch == '(': self._advance(); return Token(TokenType.PARENT_ESQ, "(", start_line, start_col)
-        if ch == ')': self._advance(); return Token(TokenType.PARENT_DIR, ")", start_line, start_col)
-        if ch == ';': self._advance(); return Token(TokenType.PONTO_VIRGULA, ";", start_line, start_col)
-        if ch == ':': self._advance(); return Token(TokenType.DOIS_PONTOS, ":", start_line, start_col)
-
-        if ch == '"':
-            self._advance() # Consome o '"' inicial
-            lex = []
-            while self._peek() != '"':
-                if self._peek() == '\0':
-                    raise LexerError(f"String não terminada na linha {start_line}, coluna {start_col}.")
-                lex.append(self._advance())
-            
-            self._advance() # Consome o '"' final
-            value = ''.join(lex)
-            return Token(TokenType.STRING, value, start_line, start_col)
-
-        if self._is_alpha(ch):
-            lex = [self._advance()]
-            while self._is_alnum(self._peek()):
-                lex.append(self._advance())
-            value = ''.join(lex)
-            ttype = KEYWORDS.get(value.upper(), TokenType.ID)
-            return Token(ttype, value, start_line, start_col)
-
-        if self._is_digit(ch):
-            lex = [self._advance()]
-            while self._is_digit(self._peek()):
-                lex.append(self._advance())
-            if self._peek() == '.':
-                self._advance()
-                if not self._is_digit(self._peek()):
-                    raise LexerError(f"Número real malformado na linha {start_line}, coluna {start_col}: esperado dígitos após '.'")
-                frac = [self._advance()]
-                while self._is_digit(self._peek()):
-                    frac.append(self._advance())
-                value = ''.join(lex) + '.' + ''.join(frac)
-                return Token(TokenType.NUM_REAL, value, start_line, start_col)
+            data = self.stream.read(self.chunk_size)
+            if isinstance(data, (bytes, bytearray)):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder("utf-8")()
+                chunk = decoder.decode(data, final=not data)
             else:
-                value = ''.join(lex)
-                return Token(TokenType.NUM_INTEIRO, value, start_line, start_col)
+                chunk = data
+            if not data:
+                yield chunk, True
+                return
+            nul = chunk.find('\0')
+            if nul != -1:
+                yield chunk[:nul], True
+                return
+            yield chunk, False
+
+    def _scan(self, src: str, final: bool, line: int, line_start: int,
+              types: array, starts: array, ends: array) -> int:
+        # Reconhece os tokens de `src`, acrescentando tipo, início e fim nos
+        # arrays. Se `final` for falso, um token que encosta no fim do buffer
+        # pode continuar no próximo bloco: a varredura para no início dele e
+        # devolve essa posição. `line`/`line_start` descrevem o início do
+        # buffer e só são usados nas mensagens de erro.
+        n = len(src)
+        kinds, ident_mask, digit_mask, space_mask, blank_mask = _translate_all(src)
+        keywords, symbols = KEYWORD_CODES, SYMBOL_CODES
+        add_type, add_start, add_end = types.append, starts.append, ends.append
+        errors = self.errors
+
+        line_starts = None
 
-        bad = self._advance()
-        raise LexerError(f"Símbolo inválido '{bad}' na linha {start_line}, coluna {start_col}")
\ No newline at end of file
+        def position(i):
+            # O índice das linhas de `src` só é montado no primeiro erro: os
+            # seguintes custam uma busca binária, não uma varredura desde o início
+            nonlocal line_starts
+            if line_starts is None:
+                line_starts = line_start_index(src)
+            nl = bisect_right(line_starts, i) - 1
+            start = line_starts[nl] if nl else line_start
+            return line + nl, i - start + 1
+
+        def error(i, message):
+            # Sem lista de erros, o primeiro interrompe a análise
+            l, c = position(i)
+            e = LexerError(message(l, c), l, c)
+            if errors is None:
+                raise e
+            e.offset = i
+            errors.append(e)
+
+        i = 0
+        while i < n:
+            k = kinds[i]
+            if k == C_LETRA:
+                j = ident_mask.find('0', i)
+                if j == -1:
+                    if not final: break
+                    j = n
+                add_type(keywords.get(src[i:j].upper(), ID_CODE)); add_start(i); add_end(j)
+                i = j
+            elif k == C_ESPACO:
+                i = space_mask.find('0', i + 1)
+                if i == -1: i = n
+            elif k == C_NOVA_LINHA:
+                i = blank_mask.find('0', i + 1)
+                if i == -1: i = n
+            elif k == C_SIMBOLO:
+                add_type(symbols[src[i]]); add_start(i); add_end(i + 1)
+                i += 1
+            elif k == C_DIGITO:
+                j = digit_mask.find('0', i)
+                if j == -1:
+                    if not final: break
+                    j = n
+                if j < n and src[j] == '.':
+                    if j + 1 >= n and not final: break
+                    if j + 1 >= n or kinds[j + 1] != C_DIGITO:
+                        error(i, lambda l, c: f"Número real malformado na linha {l}, coluna {c}: esperado dígitos após '.'")
+                        # Fica o inteiro; o '.' é descartado
+                        add_type(NUM_INTEIRO_CODE); add_start(i); add_end(j)
+                        i = j + 1
+                        continue
+                    f = digit_mask.find('0', j + 1)
+                    if f == -1:
+                        if not final: break
+                        f = n
+                    add_type(NUM_REAL_CODE); add_start(i); add_end(f)
+                    i = f
+                else:
+                    add_type(NUM_INTEIRO_CODE); add_start(i); add_end(j)
+                    i = j
+            elif k == C_COMENTARIO:
+                j = src.find('\n', i)
+                if j == -1:
+                    if not final: break
+                    j = n
+                i = j
+            elif k == C_ASPAS:
+                j = src.find('"', i + 1)
+                if j == -1:
+                    if not final: break
+                    error(i, lambda l, c: f"String não terminada na linha {l}, coluna {c}.")
+                    # Descarta o resto da linha
+                    j = src.find('\n', i)
+                    i = n if j == -1 else j
+                    continue
+                add_type(STRING_CODE); add_start(i); add_end(j + 1)
+                i = j + 1
+            else:
+                error(i, lambda l, c: f"Símbolo inválido '{src[i]}' na linha {l}, coluna {c}")
+                i += 1
+        return i
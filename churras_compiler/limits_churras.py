@@ -0,0 +1,109 @@
+import sys
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional
+from output_churras import OutputSink, ListSink
+from vm_churras import LimitExceeded
+
+# --- LIMITES DE EXECUÇÃO ---
+# Para rodar receitas de terceiros em workers compartilhados. Com
+# `limits=Limits(...)` em compile_churras/run_churras, a execução para com a
+# etapa "Limite" (e a saída produzida até ali) quando passa de:
+#   - max_ops:          instruções executadas (na VM, conta exata);
+#   - max_output_bytes: bytes servidos (UTF-8, uma quebra de linha por SERVIR);
+#   - max_time:         tempo de parede em segundos, contando a compilação;
+#   - max_memory:       bytes ocupados pelos valores das variáveis e pela
+#                       saída guardada em memória, conferido ao fim de cada
+#                       comando (um comando só cresce os valores que lê por
+#                       um fator limitado pelo tamanho da expressão).
+# Operações e memória precisam da VM de bytecode: compile_churras usa o
+# backend "vm" quando algum dos dois está definido.
+
+@dataclass
+class Limits:
+    max_ops: Optional[int] = None
+    max_output_bytes: Optional[int] = None
+    max_time: Optional[float] = None
+    max_memory: Optional[int] = None
+
+    def needs_vm(self) -> bool:
+        return self.max_ops is not None or self.max_memory is not None
+
+    def tightened(self, other: Optional["Limits"]) -> "Limits":
+        # O menor de cada limite (ex.: o pedido de um cliente não passa dos
+        # limites do servidor)
+        if other is None:
+            return self
+        values = {}
+        for f in fields(self):
+            mine, theirs = getattr(self, f.name), getattr(other, f.name)
+            values[f.name] = theirs if mine is None else mine if theirs is None else min(mine, theirs)
+        return Limits(**values)
+
+class Budget:
+    # Consumo de uma execução em relação a `limits`
+    def __init__(self, limits: Limits):
+        self.limits = limits
+        self.started = time.monotonic()
+        self.deadline = None if limits.max_time is None else self.started + limits.max_time
+        self.ops: Optional[int] = None      # só a VM conta instruções
+        self.output_bytes = 0
+        self.memory = 0
+        self.peak_memory: Optional[int] = None     # só com max_memory (VM)
+        self._sizes: List[int] = []
+        self.retains_output = False         # a saída fica em memória (ListSink)?
+
+    def check_time(self, token=None):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise LimitExceeded(f"Limite de tempo excedido ({self.limits.max_time:g} s).", token)
+
+    def ops_exceeded(self, token=None):
+        raise LimitExceeded(f"Limite de operações excedido ({self.limits.max_ops} instruções).", token)
+
+    def start_memory(self, values: List[Any]):
+        self._sizes = [sys.getsizeof(v) for v in values]
+        self.memory = self.peak_memory = sum(self._sizes)
+
+    def store(self, slot: int, value, token=None):
+        # Um slot mudou de valor
+        size = sys.getsizeof(value)
+        self.memory += size - self._sizes[slot]
+        self._sizes[slot] = size
+        self._check_memory(token)
+
+    def served(self, nbytes: int, token=None):
+        self.output_bytes += nbytes
+        if self.limits.max_output_bytes is not None and self.output_bytes > self.limits.max_output_bytes:
+            raise LimitExceeded(f"Limite de saída excedido ({self.limits.max_output_bytes} bytes).", token)
+        if self.retains_output and self.peak_memory is not None:
+            self.memory += nbytes
+            self._check_memory(token)
+
+    def _check_memory(self, token):
+        if self.peak_memory is None or self.memory > self.peak_memory:
+            self.peak_memory = self.memory
+        if self.limits.max_memory is not None and self.memory > self.limits.max_memory:
+            raise LimitExceeded(f"Limite de memória excedido ({self.limits.max_memory} bytes).", token)
+
+    def usage(self) -> Dict[str, Any]:
+        return {
+            "ops": self.ops, "output_bytes": self.output_bytes,
+            "time": round(time.monotonic() - self.started, 6),
+            "peak_memory": self.peak_memory,
+        }
+
+class LimitedSink(OutputSink):
+    # Confere cada linha servida antes de repassá-la a `sink`
+    def __init__(self, sink: OutputSink, budget: Budget):
+        super().__init__()
+        self.sink = sink
+        self.budget = budget
+        budget.retains_output = isinstance(sink, ListSink)
+
+    def write(self, line: str):
+        self.budget.served(len(line.encode("utf-8")) + 1)
+        self.sink.write(line)
+
+    def flush(self):
+        self.sink.flush()
+        self.count = self.sink.count
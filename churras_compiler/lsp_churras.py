@@ -0,0 +1,500 @@
+# Arquivo: lsp_churras.py (servidor de linguagem para editores)
+#
+#   python lsp_churras.py            # fala LSP pela entrada/saída padrão
+#
+# Para editores além da IDE em Tk (VS Code, Neovim, Helix, ...):
+#   - diagnósticos com todos os erros léxicos, sintáticos e semânticos, no
+#     intervalo do token de cada um;
+#   - tokens semânticos (cores), com as declarações da DESPENSA marcadas,
+#     calculados linha a linha só pelo léxico;
+#   - hover com o tipo declarado (PICANHA/ARROZ) de uma variável;
+#   - ir para a declaração da variável na DESPENSA.
+# O texto é sincronizado de forma incremental: o editor manda só os
+# trechos alterados. Só o léxico, o sintático e a verificação de tipos
+# rodam; o programa nunca é executado e nenhum PROVAR é chamado. A análise
+# de cada documento fica guardada até a próxima edição, e os diagnósticos
+# só são publicados quando as edições param de chegar (DIAGNOSTIC_DELAY).
+# Exemplo no Neovim:
+#   vim.lsp.start({name = "churras", cmd = {"python", "/caminho/lsp_churras.py"}})
+
+import sys
+import json
+import queue
+import argparse
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, Tuple
+
+from tokens_churras import TokenType, TokenStream, KEYWORDS, line_start_index
+from lexer_churras import Lexer, LexerError
+from incremental_churras import lex_line
+from parser_churras import Parser, ParseError
+from typecheck_churras import check_types, SemanticError
+from ast_churras import Programa, Declaracao
+
+# Espera (segundos) sem novas mensagens antes de publicar os diagnósticos
+DIAGNOSTIC_DELAY = 0.05
+
+# Legenda dos tokens semânticos e o tipo de cada código de token (os nomes
+# "string" e "comment" também vêm de lex_line)
+TOKEN_KINDS = ["keyword", "type", "variable", "string", "number", "operator", "comment"]
+TOKEN_MODIFIERS = ["declaration"]
+_KIND_INDEX = {kind: i for i, kind in enumerate(TOKEN_KINDS)}
+_KIND_BY_CODE = {t.value: "keyword" for t in KEYWORDS.values()}
+_KIND_BY_CODE[TokenType.PICANHA.value] = _KIND_BY_CODE[TokenType.ARROZ.value] = "type"
+_KIND_BY_CODE[TokenType.ID.value] = "variable"
+_KIND_BY_CODE[TokenType.STRING.value] = "string"
+_KIND_BY_CODE[TokenType.NUM_INTEIRO.value] = _KIND_BY_CODE[TokenType.NUM_REAL.value] = "number"
+for _t in (TokenType.OP_ATRIB, TokenType.OP_SOMA, TokenType.OP_SUB, TokenType.OP_MULT, TokenType.OP_DIV):
+    _KIND_BY_CODE[_t.value] = "operator"
+_ID_CODE = TokenType.ID.value
+
+TYPE_NAMES = {"int": "PICANHA", "real": "ARROZ"}
+
+# Códigos de erro do JSON-RPC
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+@dataclass
+class Analysis:
+    tokens: TokenStream
+    programa: Programa
+    declarations: Dict[str, Declaracao]     # a última declaração de cada nome vale
+    errors: List[Exception]
+
+def analyze(text: str) -> Analysis:
+    # Léxico, sintático e tipos em modo de recuperação, sem gerar código
+    errors: List[Exception] = []
+    tokens = Lexer(text, errors=errors).tokenize()
+    programa = Parser(tokens, errors).parse()
+    try:
+        check_types(programa, errors)
+    except (LexerError, ParseError, SemanticError):
+        # O primeiro erro é lançado de novo; todos já estão na lista
+        pass
+    declarations = {decl.nome: decl for decl in programa.declaracoes}
+    return Analysis(tokens, programa, declarations, errors)
+
+def _stage(e: Exception) -> str:
+    if isinstance(e, LexerError): return "Léxico"
+    if isinstance(e, ParseError): return "Sintático"
+    return "Semântico"
+
+def _utf16_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+def _code_points(text: str, units: int) -> int:
+    # Quantos caracteres de `text` ocupam `units` unidades UTF-16
+    count = 0
+    for i, ch in enumerate(text):
+        if count >= units:
+            return i
+        count += 2 if ord(ch) > 0xFFFF else 1
+    return len(text)
+
+class Document:
+    # Um arquivo aberto no editor. O LSP dá posições como (linha, coluna) com
+    # a coluna em unidades UTF-16 (ou em caracteres, com "utf-32"); aqui
+    # elas viram offsets no texto e vice-versa.
+    def __init__(self, uri: str, text: str, version: int, utf16: bool = True):
+        self.uri = uri
+        self.version = version
+        self.utf16 = utf16
+        self.semantic: Optional[Tuple[str, List[int]]] = None    # (resultId, dados) enviados por último
+        self.line_tokens: Dict[Tuple[bool, str], Tuple[bool, List[int]]] = {}
+        self._analysis: Optional[Analysis] = None
+        self._edits = self._analyzed = 0
+        self._set_text(text)
+
+    def _set_text(self, text: str):
+        self.text = text
+        self._line_starts = None
+        self._wide = None
+        # A análise antiga só é descartada quando a nova fica pronta: liberar
+        # a árvore de um arquivo grande não pesa em cada tecla
+        self._edits += 1
+
+    @property
+    def line_starts(self):
+        if self._line_starts is None:
+            self._line_starts = line_start_index(self.text)
+        return self._line_starts
+
+    @property
+    def wide(self) -> bool:
+        # Há caracteres que ocupam duas unidades UTF-16?
+        if self._wide is None:
+            self._wide = self.utf16 and not self.text.isascii() and _utf16_len(self.text) != len(self.text)
+        return self._wide
+
+    def apply(self, change: Dict):
+        if "range" not in change:
+            self._set_text(change["text"])
+            return
+        start = self.offset(change["range"]["start"])
+        end = self.offset(change["range"]["end"])
+        self._set_text(self.text[:start] + change["text"] + self.text[end:])
+
+    def analysis(self) -> Analysis:
+        if self._analysis is None or self._analyzed != self._edits:
+            self._analysis, self._analyzed = None, self._edits
+            self._analysis = analyze(self.text)
+        return self._analysis
+
+    def line_end(self, line: int) -> int:
+        starts = self.line_starts
+        return starts[line + 1] - 1 if line + 1 < len(starts) else len(self.text)
+
+    def offset(self, position: Dict) -> int:
+        starts = self.line_starts
+        line = position["line"]
+        if line >= len(starts):
+            return len(self.text)
+        start, end = starts[line], self.line_end(line)
+        char = position["character"]
+        if self.wide:
+            char = _code_points(self.text[start:end], char)
+        return min(start + char, end)
+
+    def position(self, offset: int) -> Dict:
+        starts = self.line_starts
+        line = bisect_right(starts, offset) - 1
+        char = offset - starts[line]
+        if self.wide:
+            char = _utf16_len(self.text[starts[line]:offset])
+        return {"line": line, "character": char}
+
+    def range(self, start: int, end: int) -> Dict:
+        return {"start": self.position(start), "end": self.position(end)}
+
+    def token_offset(self, line: int, col: int) -> int:
+        # Linha e coluna do léxico (base 1, em caracteres)
+        starts = self.line_starts
+        if line > len(starts):
+            return len(self.text)
+        return min(starts[line - 1] + col - 1, len(self.text))
+
+def diagnostics(doc: Document) -> List[Dict]:
+    result = []
+    for e in doc.analysis().errors:
+        token = getattr(e, "token", None)
+        if token is not None:
+            start = doc.token_offset(token.line, token.col)
+            length = len(token.lexeme) + (2 if token.type == TokenType.STRING else 0)
+        else:
+            start, length = doc.token_offset(e.line or 1, e.col or 1), 1
+        result.append({
+            "range": doc.range(start, min(start + length, len(doc.text))),
+            "severity": 1, "source": "churras", "code": _stage(e), "message": str(e),
+        })
+    return result
+
+def _encode_line(text: str, state: bool, utf16: bool) -> Tuple[bool, List[int]]:
+    # Tokens de uma linha no formato do LSP, o primeiro com linha relativa 0
+    # (corrigida na montagem) e coluna absoluta. Um identificador seguido
+    # de ':' é uma declaração.
+    info = lex_line(text, state, 0, _KIND_BY_CODE)
+    wide = utf16 and not text.isascii()
+    encoded: List[int] = []
+    previous = 0
+    for kind, start, end in info.spans:
+        if end <= start:
+            continue
+        modifiers = 1 if kind == "variable" and text[end:].lstrip().startswith(":") else 0
+        char, length = start, end - start
+        if wide:
+            char, length = _utf16_len(text[:start]), _utf16_len(text[start:end])
+        encoded.extend((0, char - previous, length, _KIND_INDEX[kind], modifiers))
+        previous = char
+    return info.state_out, encoded
+
+def semantic_tokens(doc: Document) -> List[int]:
+    # Codificação do LSP: cinco inteiros por token (linha e coluna relativas
+    # ao anterior, tamanho, tipo e modificadores). Só depende do léxico:
+    # cada linha é analisada com lex_line e guardada pelo (estado, texto),
+    # então uma edição só reprocessa as linhas alteradas e a montagem não
+    # espera pelo sintático
+    cache, used = doc.line_tokens, {}
+    data: List[int] = []
+    state, last_line = False, 0
+    for line, text in enumerate(doc.text.split("\n")):
+        key = (state, text)
+        entry = used.get(key) or cache.get(key) or _encode_line(text, state, doc.utf16)
+        used[key] = entry
+        state, encoded = entry
+        if encoded:
+            n = len(data)
+            data.extend(encoded)
+            data[n] = line - last_line
+            last_line = line
+    doc.line_tokens = used
+    return data
+
+def _semantic_edits(old: List[int], new: List[int]) -> List[Dict]:
+    # Uma única edição: o trecho entre o prefixo e o sufixo em comum. Os
+    # blocos são comparados como fatias (em C) antes de ir inteiro a inteiro
+    if old == new:
+        return []
+    n, block = min(len(old), len(new)), 4096
+    prefix = 0
+    while prefix + block <= n and old[prefix:prefix + block] == new[prefix:prefix + block]:
+        prefix += block
+    while prefix < n and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix, m = 0, n - prefix
+    while suffix + block <= m and old[len(old) - suffix - block:len(old) - suffix] == new[len(new) - suffix - block:len(new) - suffix]:
+        suffix += block
+    while suffix < m and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return [{"start": prefix, "deleteCount": len(old) - prefix - suffix,
+             "data": new[prefix:len(new) - suffix]}]
+
+def _identifier_at(doc: Document, position: Dict) -> Optional[Tuple[str, int, int]]:
+    # (nome, início, fim) do identificador sob o cursor (ou logo antes dele)
+    tokens = doc.analysis().tokens
+    offset = doc.offset(position)
+    i = bisect_right(tokens.starts, offset) - 1
+    if i < 0 or tokens.types[i] != _ID_CODE or offset > tokens.ends[i]:
+        return None
+    start, end = tokens.starts[i], tokens.ends[i]
+    return doc.text[start:end], start, end
+
+class LanguageServer:
+    # Atende as mensagens já decodificadas; `send` manda uma mensagem ao editor
+    def __init__(self, send: Callable[[Dict], None]):
+        self.send = send
+        self.documents: Dict[str, Document] = {}
+        self.dirty: Set[str] = set()        # documentos com diagnósticos a publicar
+        self.utf16 = True
+        self.shutdown_requested = False
+        self.exited = False
+        self._result_ids = 0
+        self.requests = {
+            "initialize": self.initialize,
+            "shutdown": self.shutdown,
+            "textDocument/hover": self.hover,
+            "textDocument/definition": self.declaration,
+            "textDocument/declaration": self.declaration,
+            "textDocument/semanticTokens/full": self.semantic_tokens_full,
+            "textDocument/semanticTokens/full/delta": self.semantic_tokens_delta,
+        }
+        self.notifications = {
+            "exit": self.exit,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didClose": self.did_close,
+        }
+
+    def handle(self, message: Dict):
+        method, params = message.get("method"), message.get("params") or {}
+        if not isinstance(method, str):
+            # Respostas a pedidos do servidor: ele não faz nenhum
+            return
+        if "id" not in message:
+            handler = self.notifications.get(method)
+            if handler is not None:
+                try:
+                    handler(params)
+                except Exception as e:
+                    self.send({"jsonrpc": "2.0", "method": "window/logMessage",
+                               "params": {"type": 1, "message": f"{method}: {e}"}})
+            return
+        handler = self.requests.get(method)
+        if handler is None:
+            self._error(message["id"], METHOD_NOT_FOUND, f"método desconhecido: {method}")
+        elif self.shutdown_requested:
+            self._error(message["id"], INVALID_REQUEST, "o servidor está sendo encerrado")
+        else:
+            try:
+                result = handler(params)
+            except Exception as e:
+                self._error(message["id"], INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+            else:
+                self.send({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+    def _error(self, request_id, code: int, text: str):
+        self.send({"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": text}})
+
+    def publish(self):
+        # Analisa (se preciso) e publica os diagnósticos dos documentos editados
+        for uri in sorted(self.dirty):
+            doc = self.documents[uri]
+            try:
+                items = diagnostics(doc)
+            except Exception as e:
+                # Uma falha inesperada ao analisar um documento vira um
+                # diagnóstico dele: o servidor e os outros documentos seguem
+                items = [{"range": doc.range(0, 0), "severity": 1, "source": "churras", "code": "Interno",
+                          "message": f"{type(e).__name__}: {e}"}]
+            self.send({"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics",
+                       "params": {"uri": uri, "version": doc.version, "diagnostics": items}})
+        self.dirty.clear()
+
+    def _document(self, params: Dict) -> Document:
+        return self.documents[params["textDocument"]["uri"]]
+
+    def initialize(self, params: Dict) -> Dict:
+        general = (params.get("capabilities") or {}).get("general") or {}
+        self.utf16 = "utf-32" not in (general.get("positionEncodings") or [])
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16" if self.utf16 else "utf-32",
+                "textDocumentSync": {"openClose": True, "change": 2},     # 2: incremental
+                "hoverProvider": True,
+                "definitionProvider": True,
+                "declarationProvider": True,
+                "semanticTokensProvider": {
+                    "legend": {"tokenTypes": TOKEN_KINDS, "tokenModifiers": TOKEN_MODIFIERS},
+                    "full": {"delta": True},
+                },
+            },
+            "serverInfo": {"name": "churras-lsp"},
+        }
+
+    def shutdown(self, params: Dict):
+        self.shutdown_requested = True
+        return None
+
+    def exit(self, params: Dict):
+        self.exited = True
+
+    def did_open(self, params: Dict):
+        item = params["textDocument"]
+        self.documents[item["uri"]] = Document(item["uri"], item["text"], item.get("version", 0), self.utf16)
+        self.dirty.add(item["uri"])
+
+    def did_change(self, params: Dict):
+        doc = self._document(params)
+        for change in params["contentChanges"]:
+            doc.apply(change)
+        doc.version = params["textDocument"].get("version", doc.version)
+        self.dirty.add(doc.uri)
+
+    def did_close(self, params: Dict):
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        self.dirty.discard(uri)
+        self.send({"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics",
+                   "params": {"uri": uri, "diagnostics": []}})
+
+    def hover(self, params: Dict) -> Optional[Dict]:
+        doc = self._document(params)
+        found = _identifier_at(doc, params["position"])
+        decl = found and doc.analysis().declarations.get(found[0])
+        if not decl:
+            return None
+        name, start, end = found
+        kind = "inteiro" if decl.tipo == "int" else "real"
+        value = (f"```churras\n{name} : {TYPE_NAMES[decl.tipo]};\n```\n"
+                 f"Variável {kind} declarada na linha {decl.token.line}.")
+        return {"contents": {"kind": "markdown", "value": value}, "range": doc.range(start, end)}
+
+    def declaration(self, params: Dict) -> Optional[Dict]:
+        doc = self._document(params)
+        found = _identifier_at(doc, params["position"])
+        decl = found and doc.analysis().declarations.get(found[0])
+        if not decl:
+            return None
+        start = doc.token_offset(decl.token.line, decl.token.col)
+        return {"uri": doc.uri, "range": doc.range(start, start + len(decl.nome))}
+
+    def _semantic_result(self, doc: Document, data: List[int]) -> str:
+        self._result_ids += 1
+        doc.semantic = (str(self._result_ids), data)
+        return doc.semantic[0]
+
+    def semantic_tokens_full(self, params: Dict) -> Dict:
+        doc = self._document(params)
+        data = semantic_tokens(doc)
+        return {"resultId": self._semantic_result(doc, data), "data": data}
+
+    def semantic_tokens_delta(self, params: Dict) -> Dict:
+        doc = self._document(params)
+        previous = doc.semantic
+        if previous is None or previous[0] != params.get("previousResultId"):
+            return self.semantic_tokens_full(params)
+        data = semantic_tokens(doc)
+        return {"resultId": self._semantic_result(doc, data), "edits": _semantic_edits(previous[1], data)}
+
+def read_message(stream: BinaryIO) -> Optional[bytes]:
+    # Cabeçalhos "Nome: valor", uma linha em branco e o corpo JSON. Devolve
+    # o corpo, ou None no fim da entrada.
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if length is not None:
+                break
+            continue
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    body = b""
+    while len(body) < length:
+        chunk = stream.read(length - len(body))
+        if not chunk:
+            return None
+        body += chunk
+    return body
+
+def serve(stdin: BinaryIO, stdout: BinaryIO) -> int:
+    # Uma thread só lê a entrada; a principal atende as mensagens em ordem e,
+    # quando elas param de chegar por DIAGNOSTIC_DELAY, publica os
+    # diagnósticos pendentes (uma rajada de edições gera uma única análise).
+    def send(message: Dict):
+        body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        stdout.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        stdout.flush()
+
+    server = LanguageServer(send)
+    inbox: "queue.Queue[Optional[bytes]]" = queue.Queue()
+
+    def read_all():
+        while True:
+            try:
+                body = read_message(stdin)
+            except ValueError:
+                body = None
+            inbox.put(body)
+            if body is None:
+                return
+
+    threading.Thread(target=read_all, daemon=True).start()
+    while not server.exited:
+        try:
+            body = inbox.get(timeout=DIAGNOSTIC_DELAY if server.dirty else None)
+        except queue.Empty:
+            server.publish()
+            continue
+        if body is None:
+            break
+        try:
+            message: Any = json.loads(body)
+        except ValueError as e:
+            send({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(e)}})
+            continue
+        if not isinstance(message, dict):
+            send({"jsonrpc": "2.0", "id": None, "error": {"code": INVALID_REQUEST, "message": "a mensagem deve ser um objeto JSON"}})
+            continue
+        server.handle(message)
+    return 0 if server.shutdown_requested else 1
+
+def main():
+    ap = argparse.ArgumentParser(description="Servidor de linguagem (LSP) da ChurrasLang, pela entrada/saída padrão")
+    # Alguns clientes sempre passam --stdio; é o único transporte
+    ap.add_argument("--stdio", action="store_true", help=argparse.SUPPRESS)
+    ap.parse_args()
+    # Entrada sem buffer: a thread de leitura fica bloqueada nela até o fim,
+    # e o BufferedReader de sys.stdin não pode estar travado quando o
+    # interpretador encerra
+    stdin = open(sys.stdin.fileno(), "rb", buffering=0, closefd=False)
+    return serve(stdin, sys.stdout.buffer)
+
+if __name__ == "__main__":
+    sys.exit(main())
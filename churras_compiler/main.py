@@ -1,11 +1,17 @@
 # Arquivo: main.py (para executar no terminal)
 
-from parser_churras import compile_churras
+import sys
+import mmap
+import json
+import argparse
 
-def main():
-    print("\n--- Compilador ChurrasLang (Modo Terminal) ---")
+from parser_churras import check_churras, run_churras, BACKENDS
+from output_churras import FileSink
+from rows_churras import iter_rows, run_rows, ROW_FORMATS
+from tokens_churras import format_token_row
+
+def ler_codigo_digitado() -> str:
     print("Digite ou cole seu código. Pressione Enter em uma linha vazia e digite 'ASSAR' para compilar.")
-    
     lines = []
     while True:
         try:
@@ -16,12 +22,96 @@ def main():
             lines.append(line)
         except EOFError:
             break
-            
-    code = "\n".join(lines)
-    
-    # Chama o compilador SEM passar a referência da janela.
-    # O segundo argumento (root_window) será None por padrão.
-    result = compile_churras(code)
+    return "\n".join(lines)
+
+def compilar_arquivo(caminho: str, optimize: bool = True, backend: str = "vm", profile: bool = False):
+    # O arquivo é mapeado em memória e lido em blocos pelo léxico, então
+    # receitas enormes não precisam caber inteiras na memória.
+    with open(caminho, "rb") as f:
+        try:
+            fonte = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Arquivos vazios não podem ser mapeados
+            return check_churras(f, optimize=optimize, backend=backend, profile=profile)
+        with fonte:
+            return check_churras(fonte, optimize=optimize, backend=backend, profile=profile)
+
+def listar_erros(result: dict) -> list:
+    # Com mais de um erro de compilação, uma linha para cada um
+    errors = result.get("errors", [])
+    if len(errors) < 2:
+        return [result.get("error_message", "Pronto.")]
+    return [f'[{e["stage"]}] linha {e["line"]}, coluna {e["col"]}: {e["message"]}' for e in errors]
+
+def executar_linhas(caminho: str, entradas: str, formato, cabecalho: bool, optimize: bool, backend: str,
+                    vetorizado: bool = False) -> int:
+    # Compila uma vez e executa o programa para cada linha de entradas,
+    # imprimindo um JSON por linha assim que ela termina
+    with open(caminho, encoding="utf-8") as f:
+        code = f.read()
+    compiled = check_churras(code, optimize=optimize, backend=backend)
+    if compiled["status"] != "success":
+        print(f'[STATUS: {compiled["error_stage"]}]', file=sys.stderr)
+        for line in listar_erros(compiled):
+            print(line, file=sys.stderr)
+        return 1
+    rows = iter_rows(entradas, formato, cabecalho)
+    if vetorizado:
+        # Lê o lote inteiro e executa todas as linhas de uma vez com NumPy
+        from vector_churras import columns_from_rows, run_vectorized
+        try:
+            results = enumerate(run_vectorized(compiled["program"], *columns_from_rows(rows)), 1)
+        except (ValueError, RuntimeError) as e:
+            print(e, file=sys.stderr)
+            return 2
+    else:
+        results = ((result["row"], result) for result in run_rows(compiled["program"], rows))
+    failures = 0
+    for n, result in results:
+        report = {"row": n, "status": result["status"], "output": result["outputs"]}
+        if result["status"] != "success":
+            failures += 1
+            report.update(error_stage=result["error_stage"], error_message=result["error_message"],
+                          line=result["error_line"], col=result["error_col"])
+        print(json.dumps(report, ensure_ascii=False), flush=True)
+    return 1 if failures else 0
+
+def main():
+    ap = argparse.ArgumentParser(description="Compilador ChurrasLang (Modo Terminal)")
+    ap.add_argument("arquivo", nargs="?", help="arquivo .churras (sem ele, o código é lido do teclado)")
+    ap.add_argument("--sem-otimizar", action="store_true", help="desliga o otimizador")
+    ap.add_argument("--backend", choices=BACKENDS, default="vm",
+                    help="vm: bytecode interpretado; python: código Python nativo")
+    ap.add_argument("--entradas", metavar="ARQ",
+                    help="CSV ou JSONL ('-' para a entrada padrão): executa o programa uma vez por linha, "
+                         "com os valores respondendo aos PROVAR em ordem")
+    ap.add_argument("--formato", choices=ROW_FORMATS, help="formato de --entradas (padrão: pela extensão)")
+    ap.add_argument("--cabecalho", action="store_true",
+                    help="a primeira linha do CSV tem os nomes das variáveis")
+    ap.add_argument("--vetorizado", action="store_true",
+                    help="com --entradas, executa todas as linhas de uma vez com NumPy")
+    ap.add_argument("--profile", action="store_true",
+                    help="mostra o tempo de cada fase e de cada linha, tokens e alocações")
+    args = ap.parse_args()
+    optimize = not args.sem_otimizar
+
+    if args.entradas:
+        if not args.arquivo:
+            ap.error("--entradas precisa do arquivo .churras")
+        if args.profile:
+            ap.error("--profile não se aplica a --entradas")
+        if args.vetorizado and args.backend != "vm":
+            ap.error("--vetorizado executa o bytecode da VM (use --backend vm)")
+        return executar_linhas(args.arquivo, args.entradas, args.formato, args.cabecalho, optimize,
+                               args.backend, args.vetorizado)
+
+    print("\n--- Compilador ChurrasLang (Modo Terminal) ---")
+
+    if args.arquivo:
+        result = compilar_arquivo(args.arquivo, optimize, args.backend, args.profile)
+    else:
+        code = ler_codigo_digitado()
+        result = check_churras(code, optimize=optimize, backend=args.backend, profile=args.profile)
 
     print("\n" + "="*50)
     print("--- RELATÓRIO DA COMPILAÇÃO ---")
@@ -30,22 +120,41 @@ def main():
     # Exibe os tokens de forma legível
     print("\n[TOKENS RECONHECIDOS]")
     if result.get("tokens"):
-        for token_line in result["tokens"]:
-            print(token_line)
+        for row in result["tokens"]:
+            print(format_token_row(row))
+    elif args.arquivo:
+        print("<lidos em fluxo a partir do arquivo>")
     else:
         print("<nenhum>")
 
+    # Executa o programa, se compilou, mostrando a saída enquanto é produzida.
+    # Chama a execução SEM passar a referência da janela (root_window).
+    if result["status"] == "success":
+        print("\n[SAÍDA DO PROGRAMA]", flush=True)
+        result = run_churras(result["program"], output=FileSink(sys.stdout), profile=result["profile"] or False)
+        if not result["output_lines"]:
+            print("<nenhuma>")
+
     # Exibe a mensagem de status (sucesso ou erro)
     print(f'\n[STATUS: {result.get("error_stage", "Sucesso")}]')
-    print(result.get("error_message", "Pronto."))
+    for line in listar_erros(result):
+        print(line)
+
+    # Exibe o que o otimizador removeu
+    if result.get("optimizations"):
+        print("\n[OTIMIZAÇÕES]")
+        for line in result["optimizations"].lines():
+            print(line)
+
+    # Exibe o perfil (--profile)
+    if result.get("profile"):
+        print("\n[PERFIL]")
+        for line in result["profile"].lines_report():
+            print(line)
 
-    # Exibe a saída do programa, se houver
-    if result["status"] == "success":
-        print("\n[SAÍDA DO PROGRAMA]")
-        print(result.get("output", "<nenhuma>"))
-    
     print("\n" + "="*50)
+    return 0 if result["status"] == "success" else 1
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
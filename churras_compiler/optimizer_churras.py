@@ -0,0 +1,180 @@
+from typing import Dict, List, Set, Tuple, Any
+from ast_churras import Programa, Numero, Texto, Variavel, OpBinaria, Atribuicao, Servir, Provar, postorder
+from typecheck_churras import INT, REAL, literal_type, binary_type
+
+# --- OTIMIZADOR ---
+# Trabalha sobre a árvore sintática, antes da geração de bytecode, e nunca
+# muda o que o programa imprime nem os erros que ele dá em execução:
+#   1. dobra de constantes: operações entre números viram um único número.
+#      Uma divisão por zero constante não é dobrada (o erro continua na
+#      execução, na mesma posição). O mesmo vale para uma operação cujo
+#      resultado não cabe em um real (ex.: inteiro enorme * 1.0);
+#   2. atribuições mortas: `x = ...` cujo valor é sobrescrito (ou o programa
+#      termina) antes de ser lido. PROVAR conta como leitura, já que sem
+#      entrada a variável mantém o valor. Só sai a atribuição cuja expressão
+#      (e conversão para o tipo da variável) não pode falhar;
+#   3. declarações da DESPENSA que nenhum comando usa.
+
+class OptimizationReport:
+    def __init__(self):
+        self.folded: List[Tuple[int, Any]] = []               # (linha, valor)
+        self.removed_stores: List[Tuple[int, str]] = []       # (linha, variável)
+        self.removed_declarations: List[Tuple[int, str]] = []
+
+    def __bool__(self):
+        return bool(self.folded or self.removed_stores or self.removed_declarations)
+
+    def summary(self) -> dict:
+        return {
+            "folded": len(self.folded),
+            "removed_stores": len(self.removed_stores),
+            "removed_declarations": len(self.removed_declarations),
+        }
+
+    def lines(self) -> List[str]:
+        out = [f"Linha {l}: expressão constante reduzida para {v!r}" for l, v in self.folded]
+        out += [f"Linha {l}: atribuição a '{n}' removida (valor nunca lido)" for l, n in self.removed_stores]
+        out += [f"Linha {l}: declaração de '{n}' removida (variável não usada)" for l, n in self.removed_declarations]
+        return out
+
+_FOLD = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': lambda a, b: a / b,
+}
+
+class Optimizer:
+    def __init__(self):
+        self.report = OptimizationReport()
+
+    def optimize(self, programa: Programa) -> Programa:
+        comandos = [self._fold_comando(cmd) for cmd in programa.comandos]
+        types = {decl.nome: decl.tipo for decl in programa.declaracoes}
+        comandos = self._remove_dead_stores(comandos, types)
+        used: Set[str] = set()
+        for cmd in comandos:
+            if isinstance(cmd, (Atribuicao, Provar)):
+                used.add(cmd.nome)
+            if isinstance(cmd, (Atribuicao, Servir)):
+                _names(cmd.expr, used)
+        declaracoes = []
+        for decl in programa.declaracoes:
+            if decl.nome in used:
+                declaracoes.append(decl)
+            else:
+                self.report.removed_declarations.append((decl.token.line, decl.nome))
+        return Programa(declaracoes, comandos)
+
+    def _fold_comando(self, cmd):
+        if isinstance(cmd, Atribuicao):
+            return Atribuicao(cmd.nome, self._fold_expr(cmd.expr), cmd.token)
+        if isinstance(cmd, Servir):
+            return Servir(self._fold_expr(cmd.expr), cmd.token)
+        return cmd
+
+    def _fold_expr(self, node):
+        folded = self._fold(node)
+        self._record(node, folded)
+        return folded
+
+    def _record(self, original, folded):
+        # Só a maior subexpressão dobrada entra no relatório
+        if isinstance(original, OpBinaria) and isinstance(folded, Numero):
+            self.report.folded.append((folded.token.line, folded.valor))
+
+    def _fold(self, node):
+        # Pós-ordem com uma pilha dos nós já dobrados
+        stack = []
+        for node in postorder(node):
+            if not isinstance(node, OpBinaria):
+                stack.append(node)
+                continue
+            dir = stack.pop()
+            esq = stack.pop()
+            if isinstance(esq, Numero) and isinstance(dir, Numero) and not (node.op == '/' and dir.valor == 0):
+                try:
+                    stack.append(Numero(_FOLD[node.op](esq.valor, dir.valor), node.token))
+                    continue
+                except (OverflowError, ValueError):
+                    pass
+            self._record(node.esq, esq)
+            self._record(node.dir, dir)
+            if esq is node.esq and dir is node.dir:
+                stack.append(node)
+            else:
+                stack.append(OpBinaria(node.op, esq, dir, node.token))
+        return stack[0]
+
+    def _remove_dead_stores(self, comandos, types: Dict[str, str]):
+        # Análise de variáveis vivas de trás para frente: o programa é uma
+        # sequência sem desvios, então uma única passada basta
+        live: Set[str] = set()
+        kept = []
+        for cmd in reversed(comandos):
+            if isinstance(cmd, Atribuicao):
+                if cmd.nome not in live and cmd.nome in types and _cannot_fail(cmd.expr, types[cmd.nome], types):
+                    self.report.removed_stores.append((cmd.token.line, cmd.nome))
+                    continue
+                live.discard(cmd.nome)
+                _names(cmd.expr, live)
+            elif isinstance(cmd, Servir):
+                _names(cmd.expr, live)
+            elif isinstance(cmd, Provar):
+                live.add(cmd.nome)
+            kept.append(cmd)
+        kept.reverse()
+        self.report.removed_stores.reverse()
+        return kept
+
+def _names(node, out: Set[str]):
+    for node in postorder(node):
+        if isinstance(node, Variavel):
+            out.add(node.nome)
+
+def _converts(tipo: str, node, target: str) -> bool:
+    # Converter um int para real estoura se ele for grande demais, e um real
+    # para int falha se for infinito ou NaN. Só a conversão de uma constante
+    # pode ser conferida aqui
+    if tipo == target:
+        return True
+    if not isinstance(node, Numero):
+        return False
+    try:
+        int(node.valor) if target == INT else float(node.valor)
+    except (OverflowError, ValueError):
+        return False
+    return True
+
+def _cannot_fail(node, target: str, types: Dict[str, str]) -> bool:
+    # Podem dar erro: Strings, variáveis não declaradas, divisões por algo que
+    # pode ser zero, operações entre constantes que a dobra não conseguiu
+    # reduzir, operações que convertem um int para real (mistas ou divisão)
+    # e a conversão implícita para o tipo da variável (`target`).
+    # A pilha guarda (tipo, nó) de cada subexpressão já visitada
+    stack = []
+    for node in postorder(node):
+        if isinstance(node, Texto):
+            return False
+        if isinstance(node, Numero):
+            stack.append((literal_type(node.valor), node))
+        elif isinstance(node, Variavel):
+            if node.nome not in types:
+                return False
+            stack.append((types[node.nome], node))
+        else:
+            dir = stack.pop()
+            esq = stack.pop()
+            if isinstance(esq[1], Numero) and isinstance(dir[1], Numero):
+                return False
+            if node.op == '/' and not (isinstance(dir[1], Numero) and dir[1].valor != 0):
+                return False
+            tipo = binary_type(node.op, esq[0], dir[0])
+            if tipo == REAL and not (_converts(*esq, REAL) and _converts(*dir, REAL)):
+                return False
+            stack.append((tipo, node))
+    return _converts(*stack[0], target)
+
+def optimize(programa: Programa) -> Tuple[Programa, OptimizationReport]:
+    optimizer = Optimizer()
+    return optimizer.optimize(programa), optimizer.report
@@ -0,0 +1,155 @@
+import time
+import queue
+from typing import Callable, IO, List, Optional, Union
+
+# --- SAÍDA DO SERVIR ---
+# A VM entrega cada linha do SERVIR a um "sink". As linhas são acumuladas em
+# um buffer e repassadas em blocos: quando o buffer enche ou quando passa
+# `flush_interval` segundos desde o último envio. Assim a saída aparece
+# enquanto o programa roda e a memória usada não depende do tamanho da saída.
+
+DEFAULT_BUFFER_LINES = 256
+DEFAULT_FLUSH_INTERVAL = 0.1
+QUEUE_POLL_INTERVAL = 0.1
+
+class OutputSink:
+    def __init__(self, buffer_lines: int = DEFAULT_BUFFER_LINES, flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL):
+        if buffer_lines < 1:
+            raise ValueError("buffer_lines deve ser pelo menos 1")
+        self.buffer_lines = buffer_lines
+        self.flush_interval = flush_interval
+        self.count = 0                       # linhas recebidas até agora
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def write(self, line: str):
+        buffer = self._buffer
+        buffer.append(line)
+        if len(buffer) >= self.buffer_lines or (
+                self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if self._buffer:
+            lines, self._buffer = self._buffer, []
+            self.count += len(lines)
+            self._emit(lines)
+
+    def _emit(self, lines: List[str]):
+        raise NotImplementedError
+
+class ListSink(OutputSink):
+    # Guarda tudo em memória (comportamento padrão de compile_churras)
+    def __init__(self):
+        super().__init__()
+        self.lines: List[str] = []
+        self.write = self.lines.append
+
+    def flush(self):
+        self.count = len(self.lines)
+
+class CallbackSink(OutputSink):
+    # Chama callback(linhas) com cada bloco
+    def __init__(self, callback: Callable[[List[str]], None], **kwargs):
+        super().__init__(**kwargs)
+        self.callback = callback
+
+    def _emit(self, lines: List[str]):
+        self.callback(lines)
+
+class FileSink(OutputSink):
+    # Escreve uma linha por SERVIR em um arquivo aberto (ou sys.stdout)
+    def __init__(self, file: IO[str], **kwargs):
+        super().__init__(**kwargs)
+        self.file = file
+
+    def _emit(self, lines: List[str]):
+        self.file.write("\n".join(lines) + "\n")
+        self.file.flush()
+
+class QueueSink(OutputSink):
+    # Põe cada bloco em uma fila limitada. Com a fila cheia, a execução
+    # espera o consumidor; `check` é chamada durante a espera e pode lançar
+    # exceção (ex.: cancelamento ou tempo limite).
+    def __init__(self, maxsize: int = 64, check: Optional[Callable[[], None]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.queue: "queue.Queue[List[str]]" = queue.Queue(maxsize=maxsize)
+        self.check = check
+
+    def _emit(self, lines: List[str]):
+        while True:
+            try:
+                self.queue.put(lines, timeout=QUEUE_POLL_INTERVAL)
+                return
+            except queue.Full:
+                if self.check is not None:
+                    self.check()
+
+    def drain(self) -> List[str]:
+        # Para o consumidor: tudo o que está na fila agora, sem esperar
+        lines: List[str] = []
+        try:
+            while True:
+                lines.extend(self.queue.get_nowait())
+        except queue.Empty:
+            return lines
+
+class AsyncSink(OutputSink):
+    # Para o asyncio (run_churras_async): cada bloco vai para uma
+    # asyncio.Queue e o consumidor lê linha a linha com `async for`, até o
+    # fim da execução. Com `maxsize` blocos esperando, a execução para no
+    # próximo PROVAR ou pausa até o consumidor ler (wait_room); com
+    # maxsize=None a fila não tem limite. Só funciona dentro de um laço de
+    # eventos.
+    def __init__(self, maxsize: Optional[int] = 64, **kwargs):
+        import asyncio
+        super().__init__(**kwargs)
+        self.maxsize = maxsize
+        self.queue: "asyncio.Queue[Optional[List[str]]]" = asyncio.Queue()
+        self._room = asyncio.Event()
+        self.closed = False
+
+    def _emit(self, lines: List[str]):
+        self.queue.put_nowait(lines)
+
+    async def wait_room(self):
+        while self.maxsize is not None and self.queue.qsize() >= self.maxsize:
+            self._room.clear()
+            await self._room.wait()
+
+    def close(self):
+        # Fim da saída: o `async for` termina depois das linhas pendentes
+        if not self.closed:
+            self.flush()
+            self.closed = True
+            self.queue.put_nowait(None)
+
+    async def __aiter__(self):
+        while True:
+            lines = await self.queue.get()
+            self._room.set()
+            if lines is None:
+                # Deixa o fim na fila para outros leitores
+                self.queue.put_nowait(None)
+                return
+            for line in lines:
+                yield line
+
+OutputTarget = Union[OutputSink, Callable[[List[str]], None], IO[str], "queue.Queue"]
+
+def make_sink(target: Optional[OutputTarget]) -> OutputSink:
+    # Aceita um sink pronto, uma função, um arquivo ou uma queue.Queue
+    if target is None:
+        return ListSink()
+    if isinstance(target, OutputSink):
+        return target
+    if isinstance(target, queue.Queue):
+        sink = QueueSink()
+        sink.queue = target
+        return sink
+    if hasattr(target, "write"):
+        return FileSink(target)
+    if callable(target):
+        return CallbackSink(target)
+    raise TypeError(f"destino de saída não suportado: {type(target).__name__}")
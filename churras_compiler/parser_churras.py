@@ -1,192 +1,550 @@
-from typing import List, Dict, Any, Optional
-import tkinter as tk
-from tkinter import simpledialog
-from tokens_churras import Token, TokenType
+from __future__ import annotations
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, List, Dict, Optional, Iterable, Deque, IO, Tuple, Union
+from tokens_churras import Token, TokenType, TokenTable
 from lexer_churras import Lexer, LexerError
+from ast_churras import Programa, Declaracao, Atribuicao, Servir, Provar, Numero, Texto, Variavel, OpBinaria
+from bytecode_churras import Program, Compiler
+from vm_churras import (VM, InterpreterError, ExecutionInterrupted, LimitExceeded, InputProvider,
+                        AsyncInputProvider, Steps, check_interrupt, terminal_input, drive, drive_async)
+from typecheck_churras import SemanticError, check_types
+
+if TYPE_CHECKING:
+    # O núcleo não depende do Tk: ele só é carregado quando a IDE passa
+    # root_window (dialog_churras). Cache, saída, perfilador, limites e o
+    # backend Python também só são importados nas funções que os usam, para
+    # que importar o núcleo (ex.: só para verificar) continue barato
+    import threading
+    import tkinter as tk
+    from pycode_churras import NativeProgram
+    from cache_churras import ProgramCache
+    from output_churras import OutputTarget, OutputSink
+    from profile_churras import Profiler
+    from limits_churras import Limits, Budget
 
 class ParseError(Exception):
     def __init__(self, message, token):
         super().__init__(message)
         self.token = token
 
-class InterpreterError(Exception):
-    def __init__(self, message, token):
-        super().__init__(message)
-        self.token = token
+# Tipos usados pelo parser de expressões (acesso a membro de Enum é lento)
+_ID, _STRING = TokenType.ID, TokenType.STRING
+_NUM_INTEIRO, _NUM_REAL = TokenType.NUM_INTEIRO, TokenType.NUM_REAL
+_OP_SOMA, _OP_SUB, _OP_MULT, _OP_DIV = TokenType.OP_SOMA, TokenType.OP_SUB, TokenType.OP_MULT, TokenType.OP_DIV
+_PARENT_ESQ = TokenType.PARENT_ESQ
+
+# Onde a recuperação de erros de sintaxe para de descartar tokens: as
+# seções, as palavras que começam comandos e o início de uma declaração
+# (ID ':') ou atribuição (ID '=')
+_SYNC = (TokenType.COZINHAR, TokenType.FIM_CHURRAS, TokenType.EOF)
+_SYNC_KEYWORDS = _SYNC + (TokenType.INICIAR_CHURRAS, TokenType.DESPENSA, TokenType.SERVIR, TokenType.PROVAR)
+_OPEN = (0, None, None)
 
 class Parser:
-    def __init__(self, tokens: List[Token], gui_root: Optional[tk.Tk] = None):
-        self.tokens = tokens
-        self.i = 0
-        self.types: Dict[str, str] = {}
-        self.values: Dict[str, Any] = {}
-        self.outputs: List[str] = []
-        self.gui_root = gui_root
+    # Os tokens podem vir de uma lista ou direto de Lexer.iter_tokens():
+    # o parser só guarda os poucos tokens de lookahead que já espiou.
+    # Com `errors`, um erro de sintaxe não interrompe a análise (modo pânico):
+    # ele é guardado na lista e o parser descarta tokens até um ';' (que é
+    # consumido) ou até uma palavra-chave ou o início de uma declaração (na
+    # DESPENSA) ou atribuição (no COZINHAR), e continua dali. Um erro na
+    # mesma posição do anterior (ex.: fim do arquivo no meio de uma
+    # expressão) não é registrado de novo.
+    def __init__(self, tokens: Iterable[Token], errors: Optional[List[ParseError]] = None):
+        self._tokens = iter(tokens)
+        self._lookahead: Deque[Token] = deque()
+        self._last: Optional[Token] = None
+        self.errors = errors
 
     def _peek(self, k: int = 0) -> Token:
-        idx = self.i + k
-        if idx >= len(self.tokens):
-            return self.tokens[-1]
-        return self.tokens[idx]
+        lookahead = self._lookahead
+        while len(lookahead) <= k:
+            tok = next(self._tokens, None)
+            if tok is None:
+                # Depois do fim, continua devolvendo o último token (EOF)
+                return lookahead[-1] if lookahead else self._last
+            lookahead.append(tok)
+        return lookahead[k]
 
     def _match(self, *expected: TokenType) -> Token:
         current_token = self._peek()
         if current_token.type in expected:
-            self.i += 1
+            self._last = self._lookahead.popleft()
             return current_token
         exp_str = ", ".join(t.name for t in expected)
         raise ParseError(f"Esperado [{exp_str}], mas veio {current_token.type.name}", current_token)
 
-    def parse(self) -> List[str]:
-        self._match(TokenType.INICIAR_CHURRAS)
-        self._despensa()
-        self._cozinhar()
-        self._match(TokenType.FIM_CHURRAS)
-        return self.outputs
+    def _expect(self, expected: TokenType):
+        # _match para as palavras da estrutura do programa: com recuperação,
+        # a falta delas é registrada e a análise segue sem consumir nada
+        try:
+            self._match(expected)
+        except ParseError as e:
+            if self.errors is None:
+                raise
+            self._record(e)
+
+    def _record(self, e: ParseError):
+        errors = self.errors
+        if errors:
+            last = errors[-1]
+            token = getattr(last, "token", None)
+            position = (token.line, token.col) if token is not None else (getattr(last, "line", None),
+                                                                          getattr(last, "col", None))
+            if position == (e.token.line, e.token.col):
+                return
+        errors.append(e)
 
-    def _despensa(self):
+    def _recover(self, e: ParseError, skip_current: bool = False, statement: TokenType = TokenType.DOIS_PONTOS):
+        # `statement`: o token que, depois de um ID, começa um novo comando
+        # (':' na DESPENSA, '=' no COZINHAR)
+        if self.errors is None:
+            raise e
+        self._record(e)
+        if skip_current and self._peek().type != TokenType.EOF:
+            self._last = self._lookahead.popleft()
+        while True:
+            token_type = self._peek().type
+            if token_type == TokenType.PONTO_VIRGULA:
+                self._last = self._lookahead.popleft()
+                return
+            if token_type in _SYNC_KEYWORDS or token_type == _ID and self._peek(1).type == statement:
+                return
+            self._last = self._lookahead.popleft()
+
+    def parse(self) -> Programa:
+        programa = Programa()
+        self._expect(TokenType.INICIAR_CHURRAS)
+        self._despensa(programa)
+        self._cozinhar(programa)
+        self._expect(TokenType.FIM_CHURRAS)
+        return programa
+
+    def _despensa(self, programa: Programa):
         if self._peek().type == TokenType.DESPENSA:
             self._match(TokenType.DESPENSA)
-            while self._peek().type == TokenType.ID:
-                ident = self._match(TokenType.ID).lexeme
-                self._match(TokenType.DOIS_PONTOS)
-                tipo_tok = self._match(TokenType.PICANHA, TokenType.ARROZ)
-                tipo = "int" if tipo_tok.type == TokenType.PICANHA else "real"
-                self.types[ident] = tipo
-                self.values.setdefault(ident, 0 if tipo == "int" else 0.0)
-                self._match(TokenType.PONTO_VIRGULA)
-
-    def _cozinhar(self):
-        self._match(TokenType.COZINHAR)
+            while True:
+                token_type = self._peek().type
+                if token_type != TokenType.ID:
+                    if self.errors is None or token_type in _SYNC: break
+                    # Token que não começa declaração: o mesmo erro que o
+                    # COZINHAR esperado daria; ele é descartado
+                    self._recover(ParseError(f"Esperado [COZINHAR], mas veio {token_type.name}", self._peek()),
+                                  skip_current=True)
+                    continue
+                try:
+                    ident_tok = self._match(TokenType.ID)
+                    self._match(TokenType.DOIS_PONTOS)
+                    tipo_tok = self._match(TokenType.PICANHA, TokenType.ARROZ)
+                    tipo = "int" if tipo_tok.type == TokenType.PICANHA else "real"
+                    programa.declaracoes.append(Declaracao(ident_tok.lexeme, tipo, ident_tok))
+                    self._match(TokenType.PONTO_VIRGULA)
+                except ParseError as e:
+                    self._recover(e)
+
+    def _cozinhar(self, programa: Programa):
+        self._expect(TokenType.COZINHAR)
+        comandos = programa.comandos
         while self._peek().type != TokenType.FIM_CHURRAS:
             token_type = self._peek().type
-            if token_type == TokenType.ID: self._cmd_atribuicao()
-            elif token_type == TokenType.SERVIR: self._cmd_servir()
-            elif token_type == TokenType.PROVAR: self._cmd_provar()
-            else: break
-
-    
+            try:
+                if token_type == TokenType.ID: comandos.append(self._cmd_atribuicao())
+                elif token_type == TokenType.SERVIR: comandos.append(self._cmd_servir())
+                elif token_type == TokenType.PROVAR: comandos.append(self._cmd_provar())
+                elif self.errors is None or token_type == TokenType.EOF: break
+                else:
+                    # Token que não começa comando: o mesmo erro que o
+                    # FIM_CHURRAS esperado daria; ele é descartado
+                    self._recover(ParseError(f"Esperado [FIM_CHURRAS], mas veio {token_type.name}", self._peek()),
+                                  skip_current=True, statement=TokenType.OP_ATRIB)
+            except ParseError as e:
+                self._recover(e, statement=TokenType.OP_ATRIB)
 
-    def _cmd_provar(self):
+    def _cmd_provar(self) -> Provar:
         self._match(TokenType.PROVAR)
         var_token = self._match(TokenType.ID)
-        ident = var_token.lexeme
         self._match(TokenType.PONTO_VIRGULA)
-        if ident not in self.types:
-            raise InterpreterError(f"Erro Semântico: Variável '{ident}' não declarada.", var_token)
+        return Provar(var_token.lexeme, var_token)
 
-        variable_type = self.types[ident]
-        user_input = None
-
-        
-        if self.gui_root:
-            # Se a GUI existe, usa a caixa de diálogo
-            prompt_text = f"Digite um valor para a variável '{ident}' (tipo: {variable_type}):"
-            user_input = simpledialog.askstring("PROVAR (Entrada de Dados)", prompt_text, parent=self.gui_root)
-        else:
-            # Se não há GUI, usa o input() do terminal
-            try:
-                prompt_text = f"PROVAR > Digite um valor para '{ident}': "
-                user_input = input(prompt_text)
-            except EOFError: 
-                user_input = None
-        
-
-        if user_input is None:
-            return
-
-        try:
-            if variable_type == "int":
-                self.values[ident] = int(user_input)
-            else:
-                self.values[ident] = float(user_input)
-        except ValueError:
-            raise InterpreterError(f"Entrada inválida '{user_input}' para variável do tipo '{variable_type}'.", var_token)
-
-    def _cmd_servir(self):
-        self._match(TokenType.SERVIR)
-        value = self._expr()
+    def _cmd_servir(self) -> Servir:
+        servir_token = self._match(TokenType.SERVIR)
+        expr = self._expr()
         self._match(TokenType.PONTO_VIRGULA)
-        self.outputs.append(str(value))
+        return Servir(expr, servir_token)
 
-    def _cmd_atribuicao(self):
+    def _cmd_atribuicao(self) -> Atribuicao:
         var_token = self._match(TokenType.ID)
-        ident = var_token.lexeme
         self._match(TokenType.OP_ATRIB)
-        value = self._expr()
+        expr = self._expr()
         self._match(TokenType.PONTO_VIRGULA)
-        if ident not in self.types:
-            raise InterpreterError(f"Erro Semântico: Variável '{ident}' não declarada.", var_token)
-        
-        if isinstance(value, str):
-            raise InterpreterError(f"Erro Semântico: Não é possível atribuir String a uma variável numérica.", var_token)
-            
-        if self.types[ident] == "int": self.values[ident] = int(value)
-        else: self.values[ident] = float(value)
+        return Atribuicao(var_token.lexeme, expr, var_token)
 
     def _expr(self):
-        value = self._termo()
-        while self._peek().type in (TokenType.OP_SOMA, TokenType.OP_SUB):
-            op = self._match(TokenType.OP_SOMA, TokenType.OP_SUB)
-            rhs = self._termo()
-            if op.type == TokenType.OP_SOMA: value += rhs
-            else: value -= rhs
-        return value
-
-    def _termo(self):
-        value = self._fator()
-        while self._peek().type in (TokenType.OP_MULT, TokenType.OP_DIV):
-            op = self._match(TokenType.OP_MULT, TokenType.OP_DIV)
-            rhs = self._fator()
-            if op.type == TokenType.OP_MULT: value *= rhs
-            elif op.type == TokenType.OP_DIV:
-                if rhs == 0:
-                    raise InterpreterError("Erro Semântico: Divisão por zero.", op)
-                value /= rhs
-        return value
-
-    def _fator(self):
-        token = self._peek()
-        if token.type in [TokenType.NUM_INTEIRO, TokenType.NUM_REAL]:
-            self._match(token.type)
-            return float(token.lexeme) if '.' in token.lexeme else int(token.lexeme)
-        if token.type == TokenType.STRING:
-            self._match(TokenType.STRING)
-            return token.lexeme
-        if token.type == TokenType.ID:
-            var_token = self._match(TokenType.ID)
-            var_name = var_token.lexeme
-            if var_name not in self.values:
-                raise InterpreterError(f"Erro Semântico: Variável '{var_name}' não declarada.", var_token)
-            return self.values[var_name]
-        if token.type == TokenType.PARENT_ESQ:
-            self._match(TokenType.PARENT_ESQ)
-            value = self._expr()
-            self._match(TokenType.PARENT_DIR)
-            return value
-        raise ParseError("Expressão inválida", token)
-
-def compile_churras(code: str, root_window: Optional[tk.Tk] = None) -> Dict:
-    result = {
-        "status": "success", "tokens": [], "output": "", 
-        "error_stage": "", "error_message": "", "error_token": None
+        # Precedência com pilhas explícitas (shunting-yard), sem recursão: o
+        # aninhamento de parênteses só é limitado pela memória. Consome os
+        # mesmos tokens e dá os mesmos erros da gramática
+        #   expr  -> termo (('+' | '-') termo)*
+        #   termo -> fator (('*' | '/') fator)*
+        #   fator -> NUM_INTEIRO | NUM_REAL | STRING | ID | '(' expr ')'
+        # Laço quente: o próximo token é lido sem passar por _peek/_match e os
+        # tipos são comparados por identidade (mais barato que o hash de Enum).
+        tokens, lookahead = self._tokens, self._lookahead
+        operands = []
+        # (precedência, símbolo, token); um '(' aberto entra como (0, None, None)
+        operators: List[Tuple[int, Optional[str], Optional[Token]]] = []
+        while True:
+            # Esperando um fator
+            while True:
+                if lookahead:
+                    token = lookahead[0]
+                else:
+                    token = next(tokens, None)
+                    if token is None:
+                        token = self._peek()
+                    else:
+                        lookahead.append(token)
+                token_type = token.type
+                if token_type is not _PARENT_ESQ:
+                    break
+                self._last = lookahead.popleft()
+                operators.append(_OPEN)
+            if token_type is _ID:
+                operands.append(Variavel(token.lexeme, token))
+            elif token_type is _NUM_INTEIRO or token_type is _NUM_REAL:
+                lexeme = token.lexeme
+                operands.append(Numero(float(lexeme) if '.' in lexeme else int(lexeme), token))
+            elif token_type is _STRING:
+                operands.append(Texto(token.lexeme, token))
+            else:
+                raise ParseError("Expressão inválida", token)
+            self._last = lookahead.popleft()
+            # Depois de um fator: um operador, um ')' ou o fim da expressão
+            while True:
+                if lookahead:
+                    token = lookahead[0]
+                else:
+                    token = next(tokens, None)
+                    if token is None:
+                        token = self._peek()
+                    else:
+                        lookahead.append(token)
+                token_type = token.type
+                if token_type is _OP_SOMA: prec, symbol = 1, '+'
+                elif token_type is _OP_SUB: prec, symbol = 1, '-'
+                elif token_type is _OP_MULT: prec, symbol = 2, '*'
+                elif token_type is _OP_DIV: prec, symbol = 2, '/'
+                else: prec = 0
+                # Associatividade à esquerda: reduz o que tiver precedência
+                # igual ou maior (no fim da expressão ou antes de um ')',
+                # reduz tudo até o '(')
+                floor = prec or 1
+                while operators and operators[-1][0] >= floor:
+                    _, op_symbol, op = operators.pop()
+                    rhs = operands.pop()
+                    operands[-1] = OpBinaria(op_symbol, operands[-1], rhs, op)
+                if prec:
+                    self._last = lookahead.popleft()
+                    operators.append((prec, symbol, token))
+                    break
+                if not operators:
+                    return operands[0]
+                self._match(TokenType.PARENT_DIR)
+                operators.pop()
+
+# "vm": bytecode interpretado por vm_churras; "python": função Python
+# nativa gerada por pycode_churras
+BACKENDS = ("vm", "python")
+
+def _generate(programa: Programa, optimize: bool, backend: str,
+              errors: Optional[List] = None) -> Union[Program, NativeProgram]:
+    if backend not in BACKENDS:
+        raise ValueError(f"backend desconhecido: {backend!r}")
+    if backend == "python":
+        try:
+            from pycode_churras import compile_native
+            return compile_native(programa, optimize, errors)
+        except (RecursionError, SyntaxError, MemoryError):
+            # Expressão aninhada demais para o compile() do Python: usa a VM
+            pass
+    return Compiler().compile(programa, optimize, errors)
+
+def _measure(profiler: Optional[Profiler], name: str):
+    # profile_churras.measure, sem carregar o módulo quando não há perfilador
+    return profiler.phase(name) if profiler is not None else nullcontext()
+
+def _profiler(profile: Union[bool, Profiler, None]) -> Optional[Profiler]:
+    if profile is None or profile is False:
+        return None
+    from profile_churras import make_profiler
+    return make_profiler(profile)
+
+def _budget(limits: Optional[Limits]) -> Optional[Budget]:
+    if limits is None:
+        return None
+    from limits_churras import Budget
+    return Budget(limits)
+
+def _parse(tokens, errors: Optional[List], profiler: Optional[Profiler]) -> Programa:
+    # Com `errors`, léxico e sintático se recuperam dos erros e registram
+    # todos na lista. Se houve algum, a árvore recuperada ainda passa pela
+    # verificação de tipos (para juntar os erros semânticos) e o primeiro
+    # erro é lançado, sem gerar código
+    with _measure(profiler, "sintático"):
+        programa = Parser(tokens, errors).parse()
+    if errors:
+        try:
+            check_types(programa, errors)
+        except SemanticError:
+            pass
+        raise errors[0]
+    return programa
+
+def _compile(code: str, cache: Optional[ProgramCache] = None, result: Optional[Dict] = None,
+             optimize: bool = True, backend: str = "vm", profiler: Optional[Profiler] = None,
+             errors: Optional[List] = None):
+    # Devolve (tokens, programa). Com cache, código já visto não passa
+    # de novo pelo léxico nem pelo sintático. Se `result` for informado, a
+    # tabela de tokens é preenchida antes do sintático (aparece mesmo com erro).
+    entry = None
+    if cache is not None:
+        from cache_churras import source_key
+        with _measure(profiler, "cache"):
+            key = source_key(code, optimize, backend)
+            entry = cache.lookup(code, key)
+    if entry is None:
+        with _measure(profiler, "léxico"):
+            tokens = Lexer(code, errors=errors).tokenize()
+        if result is not None:
+            result["tokens"] = TokenTable(tokens)
+        if profiler is not None:
+            # Sem o EOF, como na tabela de tokens e na leitura em fluxo
+            profiler.tokens += len(tokens) - 1
+        programa = _parse(tokens, errors, profiler)
+        with _measure(profiler, "compilação"):
+            program = _generate(programa, optimize, backend, errors)
+        entry = (tokens, program)
+        if cache is not None:
+            cache.store(code, entry, key)
+    else:
+        if result is not None:
+            result["tokens"] = TokenTable(entry[0])
+        if profiler is not None:
+            profiler.tokens += len(entry[0]) - 1
+    return entry
+
+def compile_stream(source: IO, optimize: bool = True, backend: str = "vm",
+                   profiler: Optional[Profiler] = None, errors: Optional[List] = None) -> Union[Program, NativeProgram]:
+    # Compila lendo o código em blocos (arquivo aberto ou mmap): nem o
+    # código inteiro nem a lista de tokens ficam na memória.
+    tokens = Lexer(source, errors=errors).iter_tokens()
+    if profiler is not None:
+        tokens = profiler.count_tokens(tokens)
+    programa = _parse(tokens, errors, profiler)
+    with _measure(profiler, "compilação"):
+        return _generate(programa, optimize, backend, errors)
+
+def compile_program(code: Union[str, IO], cache: Optional[ProgramCache] = None, optimize: bool = True,
+                    backend: str = "vm") -> Union[Program, NativeProgram]:
+    # Léxico + sintático + (otimização) + geração de código. O programa
+    # resultante pode ser executado várias vezes com run_churras, sem
+    # reprocessar o código.
+    if not isinstance(code, str):
+        return compile_stream(code, optimize, backend)
+    return _compile(code, cache, optimize=optimize, backend=backend)[1]
+
+def _new_result() -> Dict:
+    return {
+        "status": "success", "tokens": [], "output": "", "outputs": [], "output_lines": 0,
+        "profile": None, "usage": None, "error_stage": "", "error_message": "", "error_token": None,
+        "error_line": None, "error_col": None, "program": None, "optimizations": None,
+        "errors": [],
     }
+
+def _diagnostic(e: Exception) -> Dict:
+    # Um erro no formato de result["errors"]: etapa, mensagem e posição
+    if isinstance(e, LexerError): stage = "Léxico"
+    elif isinstance(e, ParseError): stage = "Sintático"
+    elif isinstance(e, ExecutionInterrupted): stage = "Interrompido"
+    elif isinstance(e, LimitExceeded): stage = "Limite"
+    else: stage = "Semântico"
+    diagnostic = {"stage": stage, "message": str(e), "token": None, "line": None, "col": None}
+    if hasattr(e, 'token') and e.token:
+        diagnostic["token"] = e.token
+        diagnostic["line"], diagnostic["col"] = e.token.line, e.token.col
+    elif isinstance(e, LexerError):
+        diagnostic["line"], diagnostic["col"] = e.line, e.col
+    return diagnostic
+
+def _set_error(result: Dict, e: Exception, errors: Optional[List] = None):
+    # Os campos error_* descrevem o primeiro erro; result["errors"] tem
+    # todos os que a compilação encontrou (ou só `e`)
+    result["status"] = "error"
+    result["errors"] = [_diagnostic(err) for err in (errors or [e])]
+    first = _diagnostic(e)
+    result["error_stage"] = first["stage"]
+    result["error_message"] = first["message"]
+    result["error_token"] = first["token"]
+    result["error_line"], result["error_col"] = first["line"], first["col"]
+
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    return None if timeout is None else time.monotonic() + timeout
+
+def _execute(result: Dict, program: Union[Program, NativeProgram], root_window: Optional["tk.Tk"],
+             input_provider: Optional[InputProvider], cancel_event: Optional[threading.Event],
+             deadline: Optional[float], output: Optional[OutputTarget] = None,
+             profiler: Optional[Profiler] = None, budget: Optional[Budget] = None):
+    if input_provider is None and root_window:
+        from dialog_churras import dialog_input
+        input_provider = dialog_input(root_window)
+    from output_churras import make_sink
+    steps = _execution(result, program, cancel_event, deadline, make_sink(output), profiler, budget)
+    drive(steps, input_provider or terminal_input)
+
+def _execution(result: Dict, program: Union[Program, NativeProgram], cancel_event: Optional[threading.Event],
+               deadline: Optional[float], sink: OutputSink, profiler: Optional[Profiler] = None,
+               budget: Optional[Budget] = None, pause: bool = False) -> Steps:
+    # A execução como gerador (vm_churras.drive): pausa em cada PROVAR e
+    # preenche `result` no fim
+    # A compilação não é interrompível: verifica antes de começar a executar
+    check_interrupt(cancel_event, deadline)
+    if isinstance(program, Program):
+        engine = VM
+    else:
+        from pycode_churras import NativeVM
+        engine = NativeVM
+    engine_output = sink
+    if budget is not None:
+        result["usage"] = budget.usage()
+        budget.check_time()
+        from limits_churras import LimitedSink
+        engine_output = LimitedSink(sink, budget)
     try:
-        lexer = Lexer(code)
-        tokens = lexer.tokenize()
-        result["tokens"] = [f"{t.type.name:<20} | {t.lexeme:<25} | L: {t.line}, C: {t.col}" for t in tokens if t.type != TokenType.EOF]
+        with _measure(profiler, "execução"):
+            yield from engine(program, None, cancel_event, deadline, engine_output, profiler, budget).steps(pause)
+    except LimitExceeded:
+        # Um limite estourado devolve a saída produzida até ali
+        _collect_output(result, sink)
+        raise
+    finally:
+        # Conta também o que foi servido antes de um erro
+        result["output_lines"] = sink.count
+        if budget is not None:
+            result["usage"] = budget.usage()
+    _collect_output(result, sink)
+    result["error_message"] = "Compilado e executado com sucesso!"
 
-        parser = Parser(tokens, root_window)
-        outputs = parser.parse()
+def _collect_output(result: Dict, sink):
+    # Com um destino de saída, as linhas já foram entregues e não ficam
+    # em result["outputs"]
+    from output_churras import ListSink
+    if isinstance(sink, ListSink):
+        outputs = sink.lines
+        result["outputs"] = outputs
         result["output"] = "\n".join(outputs) if outputs else "<nenhuma>"
-        result["error_message"] = "Compilado e executado com sucesso!"
-
-    except (LexerError, ParseError, InterpreterError) as e:
-        result["status"] = "error"
-        if isinstance(e, LexerError): result["error_stage"] = "Léxico"
-        elif isinstance(e, ParseError): result["error_stage"] = "Sintático"
-        else: result["error_stage"] = "Semântico"
-        result["error_message"] = str(e)
-        if hasattr(e, 'token') and e.token:
-            result["error_token"] = e.token
-    return result
\ No newline at end of file
+
+def run_churras(program: Union[Program, NativeProgram], root_window: Optional["tk.Tk"] = None,
+                input_provider: Optional[InputProvider] = None,
+                cancel_event: Optional[threading.Event] = None, timeout: Optional[float] = None,
+                output: Optional[OutputTarget] = None, profile: Union[bool, Profiler] = False,
+                limits: Optional[Limits] = None) -> Dict:
+    # Executa um programa já compilado e devolve o mesmo formato de compile_churras.
+    result = _new_result()
+    result["program"] = program
+    result["optimizations"] = program.optimizations
+    profiler = result["profile"] = _profiler(profile)
+    budget = _budget(limits)
+    try:
+        _execute(result, program, root_window, input_provider, cancel_event, _deadline(timeout), output,
+                 profiler, budget)
+    except (InterpreterError, ExecutionInterrupted, LimitExceeded) as e:
+        _set_error(result, e)
+    return result
+
+async def run_churras_async(program: Union[Program, NativeProgram], input_provider: Optional[AsyncInputProvider] = None,
+                            output: Optional[OutputTarget] = None, cancel_event: Optional[threading.Event] = None,
+                            timeout: Optional[float] = None, limits: Optional[Limits] = None) -> Dict:
+    # run_churras para o asyncio: a execução para em cada PROVAR e espera
+    # `input_provider(variável, tipo)` (função async ou comum; sem ele, as
+    # variáveis mantêm o valor), e entre fatias de instruções devolve o
+    # controle ao laço de eventos. Assim um único laço intercala muitas
+    # execuções interativas, sem uma thread por usuário esperando. Com
+    # output=AsyncSink(), a saída é lida com `async for` enquanto o programa
+    # roda. Cancelar a tarefa interrompe a execução (CancelledError).
+    result = _new_result()
+    result["program"] = program
+    result["optimizations"] = program.optimizations
+    budget = _budget(limits)
+    from output_churras import AsyncSink, make_sink
+    sink = make_sink(output)
+    steps = _execution(result, program, cancel_event, _deadline(timeout), sink, None, budget, pause=True)
+    try:
+        await drive_async(steps, input_provider or _keep_value, sink)
+    except (InterpreterError, ExecutionInterrupted, LimitExceeded) as e:
+        _set_error(result, e)
+    finally:
+        if isinstance(sink, AsyncSink):
+            sink.close()
+    return result
+
+def _keep_value(ident: str, variable_type: str) -> None:
+    return None
+
+def check_churras(code: Union[str, IO], cache: Optional[ProgramCache] = None, optimize: bool = True,
+                  backend: str = "vm", profile: Union[bool, Profiler] = False) -> Dict:
+    # Só verifica (léxico, sintático e geração de código), sem executar o
+    # programa: usado pelo diagnóstico ao vivo da IDE. O programa fica em
+    # result["program"], pronto para run_churras.
+    result = _new_result()
+    profiler = result["profile"] = _profiler(profile)
+    errors = []
+    try:
+        if isinstance(code, str):
+            program = _compile(code, cache, result, optimize, backend, profiler, errors)[1]
+        else:
+            program = compile_stream(code, optimize, backend, profiler, errors)
+        result["program"] = program
+        result["optimizations"] = program.optimizations
+        result["error_message"] = "Nenhum erro encontrado."
+    except (LexerError, ParseError, SemanticError) as e:
+        _set_error(result, e, errors)
+    return result
+
+def compile_churras(code: Union[str, IO], root_window: Optional["tk.Tk"] = None, cache: Optional[ProgramCache] = None,
+                    input_provider: Optional[InputProvider] = None,
+                    cancel_event: Optional[threading.Event] = None, timeout: Optional[float] = None,
+                    optimize: bool = True, backend: str = "vm", output: Optional[OutputTarget] = None,
+                    profile: Union[bool, Profiler] = False, limits: Optional[Limits] = None) -> Dict:
+    # Com um arquivo em vez de string, o código é lido em blocos e a
+    # tabela de tokens não é montada. `input_provider` substitui a entrada
+    # padrão do PROVAR; `cancel_event` e `timeout` (segundos) interrompem a
+    # execução; `optimize=False` desliga o otimizador; `backend="python"`
+    # executa o programa como código Python nativo; `output` (função,
+    # arquivo, queue.Queue ou OutputSink) recebe a saída enquanto o
+    # programa roda, em vez de acumulá-la em result["outputs"]; `profile=True`
+    # deixa em result["profile"] um Profiler com os tempos e contagens.
+    # `limits` (limits_churras.Limits) limita operações, saída, tempo e
+    # memória da execução: ao passar de um deles, a etapa do erro é "Limite",
+    # a saída até ali fica no resultado e result["usage"] mostra o consumo.
+    result = _new_result()
+    deadline = _deadline(timeout)
+    profiler = result["profile"] = _profiler(profile)
+    # O tempo limite conta desde já, com a compilação
+    budget = _budget(limits)
+    if limits is not None and limits.needs_vm():
+        backend = "vm"
+    errors = []
+    try:
+        if isinstance(code, str):
+            program = _compile(code, cache, result, optimize, backend, profiler, errors)[1]
+        else:
+            program = compile_stream(code, optimize, backend, profiler, errors)
+        result["program"] = program
+        result["optimizations"] = program.optimizations
+        _execute(result, program, root_window, input_provider, cancel_event, deadline, output, profiler, budget)
+
+    except (LexerError, ParseError, SemanticError) as e:
+        _set_error(result, e, errors)
+    except (InterpreterError, ExecutionInterrupted, LimitExceeded) as e:
+        _set_error(result, e)
+    return result
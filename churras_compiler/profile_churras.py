@@ -0,0 +1,104 @@
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from tokens_churras import Token
+
+# --- PERFILADOR ---
+# Ligado com profile=True em compile_churras/check_churras/run_churras (ou
+# --profile no terminal). Registra:
+#   - o tempo de parede de cada fase (léxico, sintático, compilação, execução);
+#   - quantas vezes cada comando rodou e quanto tempo levou, por linha do código;
+#   - a quantidade de tokens e de blocos de memória alocados em cada fase
+#     (saldo de sys.getallocatedblocks(), sem o custo do tracemalloc).
+# O tempo de um PROVAR inclui a espera pela entrada.
+
+PHASES = ("léxico", "sintático", "compilação", "cache", "execução")
+
+@dataclass
+class LineStats:
+    count: int = 0
+    time: float = 0.0
+
+class Profiler:
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.allocations: Dict[str, int] = {}
+        self.lines: Dict[int, LineStats] = {}
+        self.tokens = 0
+        # Fases abertas: [nome, tempo das fases internas, blocos das fases internas]
+        self._stack: List[list] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        # Fases podem ser aninhadas: o tempo e as alocações de uma fase
+        # interna não contam para a fase de fora
+        frame = [name, 0.0, 0]
+        self._stack.append(frame)
+        blocks = sys.getallocatedblocks()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            allocated = sys.getallocatedblocks() - blocks
+            self._stack.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed - frame[1]
+            self.allocations[name] = self.allocations.get(name, 0) + allocated - frame[2]
+            if self._stack:
+                self._stack[-1][1] += elapsed
+                self._stack[-1][2] += allocated
+
+    def count_tokens(self, tokens: Iterable[Token]) -> Iterator[Token]:
+        # Para a leitura em fluxo: o léxico roda sob demanda, dentro do
+        # sintático, então cada token é medido à parte
+        it = iter(tokens)
+        while True:
+            with self.phase("léxico"):
+                token = next(it, None)
+            if token is None:
+                return
+            self.tokens += 1
+            yield token
+
+    def record(self, line: int, elapsed: float):
+        stats = self.lines.get(line)
+        if stats is None:
+            stats = self.lines[line] = LineStats()
+        stats.count += 1
+        stats.time += elapsed
+
+    def hot_lines(self, limit: Optional[int] = None) -> List[Tuple[int, LineStats]]:
+        # Linhas em ordem decrescente de tempo
+        ranked = sorted(self.lines.items(), key=lambda item: item[1].time, reverse=True)
+        return ranked if limit is None else ranked[:limit]
+
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def lines_report(self, limit: Optional[int] = 20) -> List[str]:
+        # Texto do relatório (terminal e IDE)
+        out = [f"Tokens: {self.tokens}"]
+        for name in PHASES:
+            if name in self.phases:
+                out.append(f"{name:<11} {self.phases[name] * 1000:10.3f} ms"
+                           f"  {self.allocations.get(name, 0):>10} blocos alocados")
+        out.append(f"{'total':<11} {self.total() * 1000:10.3f} ms")
+        if self.lines:
+            out.append("")
+            out.append(f"{'Linha':>6} {'Execuções':>10} {'Tempo (ms)':>12} {'%':>6}")
+            executed = sum(stats.time for stats in self.lines.values()) or 1.0
+            for line, stats in self.hot_lines(limit):
+                out.append(f"{line:>6} {stats.count:>10} {stats.time * 1000:12.3f} {100 * stats.time / executed:6.1f}")
+        return out
+
+def make_profiler(profile: Union[bool, Profiler, None]) -> Optional[Profiler]:
+    # True cria um perfilador novo; um Profiler já existente continua
+    # acumulando (ex.: check_churras seguido de run_churras)
+    if isinstance(profile, Profiler):
+        return profile
+    return Profiler() if profile else None
+
+def measure(profiler: Optional[Profiler], name: str):
+    return profiler.phase(name) if profiler is not None else nullcontext()
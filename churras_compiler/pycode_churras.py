@@ -0,0 +1,299 @@
+from __future__ import annotations
+import sys
+import math
+import time
+import marshal
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from tokens_churras import Token
+from ast_churras import Programa, Numero, Texto, Variavel, Atribuicao, Servir, postorder
+from typecheck_churras import INT, check_types, literal_type, binary_type, initial_value, resolve_slots
+from optimizer_churras import OptimizationReport, optimize as optimize_ast
+from vm_churras import (InterpreterError, InputProvider, Steps, CHECK_INTERVAL, check_interrupt, terminal_input,
+                        collected, convert_input, drive, arithmetic_error)
+
+if TYPE_CHECKING:
+    import threading
+    from output_churras import OutputSink
+    from profile_churras import Profiler
+    from limits_churras import Budget
+
+# --- BACKEND PYTHON ---
+# Em vez de bytecode para a VM, gera o código-fonte de uma função Python e
+# o compila com compile(): cada operação do programa vira uma operação
+# nativa do CPython, sem o custo de despacho por instrução. Para
+#
+#   x = (a + 1) / b;  SERVIR x;  PROVAR a;
+#
+# com x: ARROZ e a, b: PICANHA, o código gerado é
+#
+#   def __churras(__servir, __ask, __provar, __zerodiv, __check, __str, __k):
+#    v0 = 0
+#    v1 = 0
+#    v2 = 0.0
+#    v2 = (v0 + 1) / (v1 or __zerodiv(0))
+#    __servir(__str(v2))
+#    v0 = __provar(0, v0, 1, (yield __ask(0)))
+#
+# As variáveis da DESPENSA viram locais (v0, v1, ...) e SERVIR chama o
+# `append` da lista de saída. PROVAR faz da função um gerador, como
+# VM.steps: __ask devolve a pergunta (variável, tipo), a resposta volta pelo
+# yield e __provar a converte. Os pontos de verificação (__check) também são
+# pausas. Os inteiros passados para __zerodiv/__provar/__check indexam
+# `positions`, para que os erros apontem para o token de origem; um estouro
+# (arithmetic_error) aponta para o token do comando da linha gerada.
+
+FUNCTION_NAME = "__churras"
+_PARAMS = ("__servir", "__ask", "__provar", "__zerodiv", "__check", "__str", "__k")
+
+# Inteiros maiores que isso não viram literais (o Python limita o tamanho
+# de inteiros convertidos de/para texto)
+_MAX_LITERAL = 10 ** 1000
+
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2}
+
+@dataclass
+class NativeProgram:
+    code: bytes                        # código do módulo, em formato marshal
+    names: Tuple[str, ...]             # variável de cada local v0, v1, ...
+    types: Dict[str, str]
+    positions: Tuple[Token, ...]
+    consts: Tuple[Any, ...]            # constantes sem forma literal (__k)
+    optimizations: Optional[OptimizationReport] = None
+    lines: Tuple[int, ...] = ()        # linha do código de cada linha gerada (0 se não é comando)
+    commands: Tuple[int, ...] = ()     # índice em `positions` do comando de cada linha gerada (-1 se não é comando)
+    _function: Optional[Callable] = field(default=None, repr=False, compare=False)
+
+    def token_at(self, index: int) -> Token:
+        return self.positions[index]
+
+    def function(self) -> Callable:
+        # O objeto de código é guardado serializado (pickle não serializa
+        # code objects); a função é montada uma vez por processo
+        if self._function is None:
+            namespace: Dict[str, Any] = {}
+            exec(marshal.loads(self.code), namespace)
+            self._function = namespace[FUNCTION_NAME]
+        return self._function
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_function"] = None
+        return state
+
+class PythonCodegen:
+    # Gera o código-fonte da função. Montar texto e deixar o compile() do
+    # CPython fazer a análise sai bem mais barato do que construir um nó de
+    # ast.Module para cada operação.
+    def __init__(self, types: Dict[str, str]):
+        self.types = types
+        # Os mesmos slots da VM: o slot i é o local v{i}
+        self._name_index = resolve_slots(types)
+        self.names = list(self._name_index)
+        self._local = {nome: f"v{i}" for nome, i in self._name_index.items()}
+        self.positions: List[Token] = []
+        # Constantes sem forma literal (reais infinitos, inteiros enormes)
+        self.consts: List[Any] = []
+        # Um comando por linha gerada: o perfilador usa este mapa, e os
+        # erros de estouro usam `commands`
+        self.lines: List[int] = []
+        self.commands: List[int] = []
+
+    def generate(self, programa: Programa) -> str:
+        lines = [f"def {FUNCTION_NAME}({', '.join(_PARAMS)}):"]
+        for nome in self.names:
+            lines.append(f" {self._local[nome]} = {initial_value(self.types[nome])!r}")
+        self.lines = [0] * len(lines)
+        self.commands = [-1] * len(lines)
+        for n, cmd in enumerate(programa.comandos):
+            if n and n % CHECK_INTERVAL == 0:
+                lines.append(f" yield __check({self._position(cmd.token)})")
+                self.lines.append(0)
+                self.commands.append(-1)
+            lines.append(" " + self._comando(cmd))
+            self.lines.append(cmd.token.line)
+            self.commands.append(self._position(cmd.token))
+        lines.append(" return None")
+        self.lines.append(0)
+        self.commands.append(-1)
+        return "\n".join(lines) + "\n"
+
+    def _position(self, token: Token) -> int:
+        self.positions.append(token)
+        return len(self.positions) - 1
+
+    def _literal(self, valor) -> str:
+        if isinstance(valor, float) and not math.isfinite(valor) or isinstance(valor, int) and abs(valor) > _MAX_LITERAL:
+            self.consts.append(valor)
+            return f"__k[{len(self.consts) - 1}]"
+        return repr(valor)
+
+    def _comando(self, cmd) -> str:
+        if isinstance(cmd, Atribuicao):
+            target = self.types[cmd.nome]
+            expr = cmd.expr
+            if isinstance(expr, Numero) and literal_type(expr.valor) != target:
+                try:
+                    expr = Numero(int(expr.valor) if target == INT else float(expr.valor), expr.token)
+                except (OverflowError, ValueError):
+                    pass
+            value, tipo = self._expr(expr)
+            if tipo != target:
+                value = f"{'int' if target == INT else 'float'}({value})"
+            return f"{self._local[cmd.nome]} = {value}"
+        if isinstance(cmd, Servir):
+            value, _ = self._expr(cmd.expr)
+            return f"__servir(__str({value}))"
+        # PROVAR
+        local = self._local[cmd.nome]
+        index = self._name_index[cmd.nome]
+        return f"{local} = __provar({index}, {local}, {self._position(cmd.token)}, (yield __ask({index})))"
+
+    def _expr(self, node) -> Tuple[str, str]:
+        # Pós-ordem com uma pilha de (código, tipo) das subexpressões
+        stack: List[Tuple[str, str]] = []
+        for node in postorder(node):
+            if isinstance(node, (Numero, Texto)):
+                stack.append((self._literal(node.valor), literal_type(node.valor)))
+                continue
+            if isinstance(node, Variavel):
+                stack.append((self._local[node.nome], self.types[node.nome]))
+                continue
+            dir, tipo_dir = stack.pop()
+            esq, tipo_esq = stack.pop()
+            # A precedência e a associatividade dos operadores são as mesmas do
+            # Python: só são necessários os parênteses que estavam na árvore
+            # (o parser do Python limita o aninhamento a 200 níveis)
+            prec = _PRECEDENCE[node.op]
+            if _PRECEDENCE.get(getattr(node.esq, "op", None), 3) < prec:
+                esq = f"({esq})"
+            if node.op == '/':
+                # `b or __zerodiv(i)`: 0 e 0.0 são falsos, então o divisor só é
+                # usado se não for zero; senão o erro sai com o token do '/'
+                dir = f"({dir} or __zerodiv({self._position(node.token)}))"
+            elif _PRECEDENCE.get(getattr(node.dir, "op", None), 3) <= prec:
+                dir = f"({dir})"
+            stack.append((f"{esq} {node.op} {dir}", binary_type(node.op, tipo_esq, tipo_dir)))
+        return stack[0]
+
+def compile_native(programa: Programa, optimize: bool = False, errors: Optional[List] = None) -> NativeProgram:
+    # Mesmo caminho do Compiler (tipos, otimizador), com a geração de
+    # código trocada. Expressões aninhadas demais para o compile() do
+    # Python geram RecursionError ou SyntaxError; quem chama decide se volta
+    # para a VM.
+    types = check_types(programa, errors)
+    report = None
+    if optimize:
+        programa, report = optimize_ast(programa)
+        types = {decl.nome: decl.tipo for decl in programa.declaracoes}
+    codegen = PythonCodegen(types)
+    code = compile(codegen.generate(programa), "<churras>", "exec")
+    return NativeProgram(marshal.dumps(code), tuple(codegen.names), types, tuple(codegen.positions),
+                         tuple(codegen.consts), report, tuple(codegen.lines), tuple(codegen.commands))
+
+class NativeVM:
+    # Mesma interface da VM, para programas do backend Python
+    def __init__(self, program: NativeProgram, input_provider: Optional[InputProvider] = None,
+                 cancel_event: Optional[threading.Event] = None, deadline: Optional[float] = None,
+                 output: Optional[OutputSink] = None, profiler: Optional[Profiler] = None,
+                 budget: Optional[Budget] = None):
+        # O código nativo não conta instruções nem mede os valores: com
+        # limite de operações ou de memória, use a VM
+        if budget is not None and budget.limits.needs_vm():
+            raise ValueError("limites de operações e de memória exigem o backend 'vm'")
+        self.program = program
+        self.input_provider = input_provider or terminal_input
+        self.cancel_event = cancel_event
+        self.deadline = deadline
+        if output is None:
+            from output_churras import ListSink
+            output = ListSink()
+        self.output = output
+        self.profiler = profiler
+        self.budget = budget
+
+    def run(self) -> List[str]:
+        drive(self.steps(), self.input_provider)
+        return collected(self.output)
+
+    def steps(self, pause: bool = False) -> Steps:
+        # O código nativo pausa nos PROVAR e nos pontos de verificação (a
+        # cada CHECK_INTERVAL comandos), com ou sem `pause`
+        program = self.program
+        budget = self.budget
+        output = self.output
+
+        def zerodiv(index):
+            raise InterpreterError("Erro Semântico: Divisão por zero.", program.token_at(index))
+
+        def ask(name_index):
+            ident = program.names[name_index]
+            # A saída pendente aparece antes da pergunta
+            output.flush()
+            return ident, program.types[ident]
+
+        def provar(name_index, current, index, user_input):
+            if user_input is None:
+                return current
+            return convert_input(user_input, program.types[program.names[name_index]], program, index)
+
+        if budget is not None:
+            def check(index):
+                check_interrupt(self.cancel_event, self.deadline, program.token_at(index))
+                budget.check_time(program.token_at(index))
+        elif self.cancel_event is not None or self.deadline is not None:
+            def check(index):
+                check_interrupt(self.cancel_event, self.deadline, program.token_at(index))
+        else:
+            def check(index):
+                pass
+
+        function = program.function()
+        previous = sys.gettrace()
+        if self.profiler is not None:
+            sys.settrace(self._tracer())
+        try:
+            steps = function(output.write, ask, provar, zerodiv, check, str, program.consts)
+            # Sem PROVAR nem pontos de verificação, a função não é um gerador
+            # e já rodou inteira
+            if steps is not None:
+                yield from steps
+        except (OverflowError, ValueError) as error:
+            converted = self._arithmetic_error(error)
+            if converted is None:
+                raise
+            raise converted from error
+        finally:
+            if self.profiler is not None:
+                sys.settrace(previous)
+            output.flush()
+
+    def _arithmetic_error(self, error: Exception) -> Optional[InterpreterError]:
+        # A linha gerada em que o erro aconteceu diz qual é o comando
+        index, tb = -1, error.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_name == FUNCTION_NAME:
+                index = self.program.commands[tb.tb_lineno - 1]
+            tb = tb.tb_next
+        if index < 0:
+            return None
+        return arithmetic_error(error, self.program.token_at(index))
+
+    def _tracer(self):
+        # O código gerado tem um comando por linha: o tempo entre dois
+        # eventos "line" da função é o tempo do comando. Um comando que
+        # termina em erro não é registrado (como na VM).
+        lines, record, clock = self.program.lines, self.profiler.record, time.perf_counter
+        current = [0, 0.0]          # linha do comando em andamento, início
+
+        def local(frame, event, arg):
+            now = clock()
+            if current[0] and event != "exception":
+                record(current[0], now - current[1])
+            current[0] = lines[frame.f_lineno - 1] if event == "line" else 0
+            current[1] = clock()
+            return local
+
+        def tracer(frame, event, arg):
+            return local if frame.f_code.co_name == FUNCTION_NAME else None
+        return tracer
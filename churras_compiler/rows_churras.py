@@ -0,0 +1,85 @@
+import os
+import sys
+import csv
+import json
+import threading
+from typing import Any, Dict, IO, Iterable, Iterator, Mapping, Optional, Sequence, Union
+
+from parser_churras import run_churras, compile_program
+from bytecode_churras import Program
+from pycode_churras import NativeProgram
+from cache_churras import ProgramCache
+from vm_churras import InputProvider
+
+# --- ENTRADA EM LOTE ---
+# Executa um programa, compilado uma única vez, para cada linha de uma fonte
+# de entradas (CSV, JSONL ou qualquer iterável do Python). Cada linha
+# responde aos PROVAR do programa:
+#   - sequência (lista, linha de CSV): o i-ésimo PROVAR executado recebe o
+#     i-ésimo valor;
+#   - dicionário (JSONL com objetos, CSV com cabeçalho): cada PROVAR recebe
+#     o valor da chave com o nome da variável.
+# Valores que faltam (ou None/null) fazem a variável manter o valor atual,
+# como quando o usuário não digita nada.
+
+Row = Union[Sequence[Any], Mapping[str, Any]]
+
+ROW_FORMATS = ("csv", "jsonl")
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+def row_input(row: Row) -> InputProvider:
+    if isinstance(row, Mapping):
+        def provider(ident: str, variable_type: str) -> Optional[str]:
+            return _text(row.get(ident))
+        return provider
+    values = iter(row)
+    def provider(ident: str, variable_type: str) -> Optional[str]:
+        return _text(next(values, None))
+    return provider
+
+def _format_of(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        if fmt not in ROW_FORMATS:
+            raise ValueError(f"formato de entrada desconhecido: {fmt!r}")
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    return "jsonl" if ext in (".jsonl", ".ndjson", ".json") else "csv"
+
+def iter_rows(source: Union[str, IO[str]], fmt: Optional[str] = None, header: bool = False) -> Iterator[Row]:
+    # Lê as linhas sob demanda: o arquivo nunca é carregado inteiro.
+    # `source` é um caminho ("-" para a entrada padrão) ou um arquivo aberto.
+    if isinstance(source, str):
+        fmt = _format_of(source, fmt)
+        if source == "-":
+            yield from iter_rows(sys.stdin, fmt, header)
+            return
+        with open(source, encoding="utf-8", newline="") as f:
+            yield from iter_rows(f, fmt, header)
+        return
+    if fmt == "jsonl":
+        for line in source:
+            if line.strip():
+                row = json.loads(line)
+                yield row if isinstance(row, (list, dict)) else [row]
+    elif header:
+        yield from csv.DictReader(source)
+    else:
+        yield from csv.reader(source)
+
+def run_rows(program: Union[str, Program, NativeProgram], rows: Iterable[Row],
+             cache: Optional[ProgramCache] = None, optimize: bool = True, backend: str = "vm",
+             cancel_event: Optional[threading.Event] = None,
+             timeout: Optional[float] = None) -> Iterator[Dict]:
+    # Gera um resultado (mesmo formato de run_churras, mais "row") por linha,
+    # assim que cada linha termina. Um erro em uma linha não interrompe as
+    # seguintes; o cancelamento interrompe o lote. `timeout` vale por linha.
+    if isinstance(program, str):
+        program = compile_program(program, cache, optimize, backend)
+    for n, row in enumerate(rows, 1):
+        result = run_churras(program, input_provider=row_input(row), cancel_event=cancel_event, timeout=timeout)
+        result["row"] = n
+        yield result
+        if cancel_event is not None and cancel_event.is_set():
+            break
@@ -1,5 +1,7 @@
 from enum import Enum, auto
-from dataclasses import dataclass
+from array import array
+from bisect import bisect_right
+from typing import Iterator, Optional, NamedTuple, Sequence, List
 
 class TokenType(Enum):
     INICIAR_CHURRAS = auto()
@@ -36,9 +38,175 @@ KEYWORDS = {
     "SERVIR": TokenType.SERVIR,
 }
 
-@dataclass
+# Símbolos de um único caractere
+SYMBOLS = {
+    "=": TokenType.OP_ATRIB,
+    "+": TokenType.OP_SOMA,
+    "-": TokenType.OP_SUB,
+    "*": TokenType.OP_MULT,
+    "/": TokenType.OP_DIV,
+    "(": TokenType.PARENT_ESQ,
+    ")": TokenType.PARENT_DIR,
+    ";": TokenType.PONTO_VIRGULA,
+    ":": TokenType.DOIS_PONTOS,
+}
+
+# Código numérico de cada tipo (usado nos arrays de TokenStream)
+TYPE_BY_CODE = [None] * (max(t.value for t in TokenType) + 1)
+for _t in TokenType:
+    TYPE_BY_CODE[_t.value] = _t
+
+_STRING_CODE = TokenType.STRING.value
+
 class Token:
-    type: TokenType
+    # Sem __dict__: cada token ocupa só os slots. Um token pode ser
+    # independente (lexema, linha e coluna já conhecidos) ou uma visão de uma
+    # posição de TokenStream, que calcula lexema, linha e coluna só quando
+    # são pedidos.
+    __slots__ = ("type", "_lexeme", "_line", "_col", "_stream", "_index")
+
+    def __init__(self, type: TokenType, lexeme: str, line: int, col: int):
+        self.type = type
+        self._lexeme = lexeme
+        self._line = line
+        self._col = col
+        self._stream = None
+        self._index = -1
+
+    @classmethod
+    def _view(cls, stream: "TokenStream", index: int, type: TokenType) -> "Token":
+        tok = cls.__new__(cls)
+        tok.type = type
+        tok._lexeme = tok._line = tok._col = None
+        tok._stream = stream
+        tok._index = index
+        return tok
+
+    @property
+    def lexeme(self) -> str:
+        if self._lexeme is None:
+            self._lexeme = self._stream.lexeme(self._index)
+        return self._lexeme
+
+    @property
+    def line(self) -> int:
+        if self._line is None:
+            self._line, self._col = self._stream.position(self._index)
+        return self._line
+
+    @property
+    def col(self) -> int:
+        if self._col is None:
+            self._line, self._col = self._stream.position(self._index)
+        return self._col
+
+    def __eq__(self, other):
+        if not isinstance(other, Token):
+            return NotImplemented
+        return (self.type, self.lexeme, self.line, self.col) == (other.type, other.lexeme, other.line, other.col)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Token(type={self.type!r}, lexeme={self.lexeme!r}, line={self.line}, col={self.col})"
+
+class TokenStream:
+    # Tokens guardados como "estrutura de arrays": código do tipo e posições
+    # de início/fim no código-fonte. Lexemas são fatiados do código e
+    # linha/coluna vêm de um índice de inícios de linha (busca binária),
+    # ambos só quando necessário.
+    def __init__(self, source: str, types: array, starts: array, ends: array):
+        self.source = source
+        self.types = types
+        self.starts = starts
+        self.ends = ends
+        self._line_starts: Optional[array] = None
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.types)))]
+        if index < 0:
+            index += len(self.types)
+        return Token._view(self, index, TYPE_BY_CODE[self.types[index]])
+
+    def __iter__(self) -> Iterator[Token]:
+        view, types = Token._view, TYPE_BY_CODE
+        for index, code in enumerate(self.types):
+            yield view(self, index, types[code])
+
+    def lexeme(self, index: int) -> str:
+        start, end = self.starts[index], self.ends[index]
+        if self.types[index] == _STRING_CODE:
+            # Sem as aspas
+            return self.source[start + 1:end - 1]
+        return self.source[start:end]
+
+    def position(self, index: int):
+        return self.offset_position(self.starts[index])
+
+    def offset_position(self, offset: int):
+        line_starts = self._line_starts
+        if line_starts is None:
+            line_starts = self._line_starts = line_start_index(self.source)
+        line = bisect_right(line_starts, offset)
+        return line, offset - line_starts[line - 1] + 1
+
+def line_start_index(source: str) -> array:
+    starts = array("q", [0])
+    find, append = source.find, starts.append
+    i = find("\n")
+    while i != -1:
+        append(i + 1)
+        i = find("\n", i + 1)
+    return starts
+
+class TokenRow(NamedTuple):
+    type: str
     lexeme: str
     line: int
-    col: int
\ No newline at end of file
+    col: int
+
+def format_token_row(row: TokenRow) -> str:
+    return f"{row.type:<20} | {row.lexeme:<25} | L: {row.line}, C: {row.col}"
+
+class TokenTable:
+    # Tabela de tokens (sem o EOF) montada sob demanda: as linhas só são
+    # criadas quando acessadas, então mostrar uma página de um arquivo com
+    # milhares de tokens não formata nem copia os demais.
+    DEFAULT_PAGE_SIZE = 100
+
+    def __init__(self, tokens: Sequence[Token]):
+        self.tokens = tokens
+        n = len(tokens)
+        self._length = n - 1 if n and tokens[n - 1].type == TokenType.EOF else n
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _row(self, index: int) -> TokenRow:
+        t = self.tokens[index]
+        return TokenRow(t.type.name, t.lexeme, t.line, t.col)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("índice fora da tabela de tokens")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[TokenRow]:
+        for index in range(self._length):
+            yield self._row(index)
+
+    def page_count(self, size: int = DEFAULT_PAGE_SIZE) -> int:
+        return (self._length + size - 1) // size
+
+    def page(self, number: int, size: int = DEFAULT_PAGE_SIZE) -> List[TokenRow]:
+        # Páginas numeradas a partir de 0
+        start = number * size
+        return self[start:start + size]
@@ -0,0 +1,101 @@
+from typing import Dict, List, Optional
+from ast_churras import Programa, Numero, Texto, Variavel, Atribuicao, Servir, Provar, postorder
+
+# --- VERIFICAÇÃO DE TIPOS ---
+# Roda antes da geração de bytecode, com os tipos da DESPENSA (PICANHA ->
+# int, ARROZ -> real). Depois dela a VM não precisa mais conferir tipos nem
+# variáveis não declaradas: só a divisão por zero e a entrada do PROVAR
+# continuam sendo verificadas na execução.
+
+INT = "int"
+REAL = "real"
+STRING = "string"
+
+class SemanticError(Exception):
+    def __init__(self, message, token):
+        super().__init__(message)
+        self.token = token
+
+def literal_type(valor) -> str:
+    if isinstance(valor, str): return STRING
+    return INT if isinstance(valor, int) else REAL
+
+def binary_type(op: str, esq: str, dir: str) -> Optional[str]:
+    # Tipo do resultado de `esq op dir`, ou None se a operação é inválida.
+    # Strings só podem ser concatenadas entre si.
+    if esq == STRING or dir == STRING:
+        return STRING if esq == dir == STRING and op == '+' else None
+    if op == '/':
+        return REAL
+    return INT if esq == dir == INT else REAL
+
+class TypeChecker:
+    # Com `errors`, cada comando com erro é registrado na lista e a
+    # verificação segue no comando seguinte; sem ela, o primeiro erro é lançado
+    def __init__(self, types: Dict[str, str], errors: Optional[List[SemanticError]] = None):
+        self.types = types
+        self.errors = errors
+
+    def check(self, programa: Programa):
+        for cmd in programa.comandos:
+            try:
+                self._comando(cmd)
+            except SemanticError as e:
+                if self.errors is None:
+                    raise
+                self.errors.append(e)
+
+    def _comando(self, cmd):
+        if isinstance(cmd, Atribuicao):
+            tipo = self.expr(cmd.expr)
+            self._declared(cmd.nome, cmd.token)
+            if tipo == STRING:
+                raise SemanticError("Erro Semântico: Não é possível atribuir String a uma variável numérica.", cmd.token)
+        elif isinstance(cmd, Servir):
+            self.expr(cmd.expr)
+        elif isinstance(cmd, Provar):
+            self._declared(cmd.nome, cmd.token)
+
+    def expr(self, node) -> str:
+        # Pilha com o tipo de cada subexpressão já visitada (pós-ordem)
+        stack = []
+        for node in postorder(node):
+            if isinstance(node, (Numero, Texto)):
+                stack.append(literal_type(node.valor))
+            elif isinstance(node, Variavel):
+                stack.append(self._declared(node.nome, node.token))
+            else:
+                dir = stack.pop()
+                esq = stack[-1]
+                tipo = binary_type(node.op, esq, dir)
+                if tipo is None:
+                    if esq == dir == STRING:
+                        raise SemanticError(f"Erro Semântico: Operação '{node.op}' inválida entre Strings.", node.token)
+                    raise SemanticError("Erro Semântico: Operação inválida entre String e número.", node.token)
+                stack[-1] = tipo
+        return stack[0]
+
+    def _declared(self, nome: str, token) -> str:
+        tipo = self.types.get(nome)
+        if tipo is None:
+            raise SemanticError(f"Erro Semântico: Variável '{nome}' não declarada.", token)
+        return tipo
+
+def initial_value(tipo: str):
+    # Valor de uma variável antes da primeira atribuição ou PROVAR
+    return 0 if tipo == INT else 0.0
+
+def resolve_slots(types: Dict[str, str]) -> Dict[str, int]:
+    # Cada variável da DESPENSA ganha um índice fixo, na ordem de declaração.
+    # Os backends guardam os valores em posições pré-alocadas (lista na VM,
+    # locais v0, v1, ... no backend Python) e a execução não procura nomes
+    return {nome: i for i, nome in enumerate(types)}
+
+def check_types(programa: Programa, errors: Optional[List] = None) -> Dict[str, str]:
+    # Devolve os tipos das variáveis declaradas (a última declaração vale).
+    # Com `errors`, todos os erros vão para a lista e o primeiro é lançado no fim.
+    types = {decl.nome: decl.tipo for decl in programa.declaracoes}
+    TypeChecker(types, errors).check(programa)
+    if errors:
+        raise errors[0]
+    return types
@@ -0,0 +1,296 @@
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:     # o motor vetorizado é opcional
+    np = None
+
+from bytecode_churras import (Program, LOAD_CONST, LOAD_NAME, STORE_NAME, BIN_ADD, BIN_SUB, BIN_MUL,
+                              BIN_DIV, SERVIR, PROVAR, CONCAT, TO_INT, TO_REAL)
+from parser_churras import compile_program, run_churras
+from rows_churras import Row, row_input
+
+# --- MOTOR VETORIZADO (NumPy) ---
+# Como COZINHAR não tem desvios, todas as linhas de entrada executam a mesma
+# sequência de instruções. O motor executa o bytecode uma única vez, com
+# cada variável guardando um array NumPy (um valor por linha) e cada PROVAR
+# lendo uma coluna inteira.
+#
+# As regras da VM são mantidas linha a linha:
+#   - PICANHA é int64 e ARROZ é float64; TO_INT trunca em direção ao zero;
+#   - divisão por zero e entrada inválida viram erro só nas linhas afetadas
+#     (o primeiro erro de cada linha é o que vale);
+#   - os inteiros do Python não têm limite. Uma linha cujo valor sai da faixa
+#     segura do int64 (ou em que a divisão entre inteiros deixaria de ser
+#     exata em float64) é refeita pela VM comum, valor por valor.
+
+# Acima disso, o resultado inteiro pode não caber no int64
+_INT_LIMIT = 2.0 ** 62
+# Até aqui, inteiros são representados exatamente em float64
+_EXACT_FLOAT = 2 ** 53
+
+_OK, _ERROR, _FALLBACK = 0, 1, 2
+
+Columns = Union[Sequence[Sequence[Any]], Mapping[str, Sequence[Any]]]
+
+class _Unsupported(Exception):
+    # Valor que não cabe no modelo vetorizado: o lote todo vai para a VM
+    pass
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("O motor vetorizado precisa do NumPy (pip install numpy).")
+
+def _is_int(x) -> bool:
+    if isinstance(x, np.ndarray):
+        return x.dtype.kind == "i"
+    return isinstance(x, (int, np.integer))
+
+def _check_scalar(x):
+    if isinstance(x, int) and abs(x) > _INT_LIMIT:
+        raise _Unsupported()
+    return x
+
+def _cell(value) -> str:
+    # Mesmo texto que str() daria na VM
+    if isinstance(value, np.integer): return str(int(value))
+    if isinstance(value, np.floating): return str(float(value))
+    return str(value)
+
+class VectorResult:
+    def __init__(self, n: int, outputs: List[Any], state, error_site, sites: List[Tuple], fallback: Dict[int, Dict]):
+        self.n = n
+        self._outputs = outputs
+        self._state = state
+        self._error_site = error_site
+        self._sites = sites
+        self._fallback = fallback
+
+    @property
+    def outputs(self) -> List["np.ndarray"]:
+        # Um array por SERVIR, com o valor de cada linha. Só vale nas linhas
+        # de `ok`; as demais estão em row().
+        return [x if isinstance(x, np.ndarray) else np.full(self.n, x) for x in self._outputs]
+
+    @property
+    def ok(self) -> "np.ndarray":
+        return self._state == _OK
+
+    def __len__(self):
+        return self.n
+
+    def row(self, i: int) -> Dict:
+        # Resultado da linha i no formato de run_churras (campos principais)
+        if i in self._fallback:
+            return self._fallback[i]
+        result = {"status": "success", "outputs": [], "error_stage": "",
+                  "error_message": "Compilado e executado com sucesso!",
+                  "error_token": None, "error_line": None, "error_col": None}
+        if self._state[i] == _ERROR:
+            kind, token, extra = self._sites[self._error_site[i]]
+            if kind == "div":
+                message = "Erro Semântico: Divisão por zero."
+            else:
+                tipo, column = extra
+                message = f"Entrada inválida '{column[i]}' para variável do tipo '{tipo}'."
+            result.update(status="error", error_stage="Semântico", error_message=message,
+                          error_token=token, error_line=token.line, error_col=token.col)
+        else:
+            result["outputs"] = [_cell(x[i]) if isinstance(x, np.ndarray) else _cell(x) for x in self._outputs]
+        return result
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self.n):
+            yield self.row(i)
+
+class VectorEngine:
+    def __init__(self, program: Program):
+        require_numpy()
+        if not isinstance(program, Program):
+            raise ValueError("o motor vetorizado executa o bytecode da VM (backend='vm')")
+        self.program = program
+
+    def run(self, columns: Columns, rows: Optional[int] = None) -> VectorResult:
+        columns_seq = None if isinstance(columns, Mapping) else list(columns)
+        n = rows
+        if n is None:
+            firsts = list(columns.values()) if columns_seq is None else columns_seq
+            n = len(firsts[0]) if firsts else 0
+        try:
+            return self._run(columns, columns_seq, n)
+        except _Unsupported:
+            state = np.full(n, _FALLBACK, dtype=np.int8)
+            return self._finish(n, [], state, np.full(n, -1, dtype=np.int32), [], columns, columns_seq)
+
+    def _run(self, columns, columns_seq, n: int) -> VectorResult:
+        program = self.program
+        code, consts, names, types = program.code, program.consts, program.names, program.types
+        values: List[Any] = list(program.initial)     # um slot por variável, como na VM
+        state = np.zeros(n, dtype=np.int8)
+        error_site = np.full(n, -1, dtype=np.int32)
+        sites: List[Tuple] = []
+        outputs: List[Any] = []
+        stack: List[Any] = []
+        provar_count = 0
+
+        def mark(mask, new_state, site=-1):
+            mask = mask & (state == _OK)
+            state[mask] = new_state
+            if site >= 0:
+                error_site[mask] = site
+
+        with np.errstate(all="ignore"):
+            for pc in range(0, len(code), 2):
+                op, arg = code[pc], code[pc + 1]
+                if op == LOAD_CONST:
+                    stack.append(consts[arg])
+                elif op == LOAD_NAME:
+                    stack.append(values[arg])
+                elif op == STORE_NAME:
+                    values[arg] = stack.pop()
+                elif op == CONCAT:
+                    rhs = stack.pop(); stack[-1] = stack[-1] + rhs
+                elif op in (BIN_ADD, BIN_SUB, BIN_MUL):
+                    rhs = stack.pop(); lhs = stack[-1]
+                    stack[-1] = self._arith(op, lhs, rhs, n, mark)
+                elif op == BIN_DIV:
+                    rhs = stack.pop(); lhs = stack[-1]
+                    stack[-1] = self._divide(lhs, rhs, n, mark, sites, program.token_at(pc))
+                elif op == TO_INT:
+                    stack[-1] = self._to_int(stack[-1], mark)
+                elif op == TO_REAL:
+                    x = stack[-1]
+                    stack[-1] = x.astype(np.float64) if isinstance(x, np.ndarray) else float(_check_scalar(x))
+                elif op == SERVIR:
+                    outputs.append(stack.pop())
+                elif op == PROVAR:
+                    ident = names[arg]
+                    if columns_seq is not None:
+                        column = columns_seq[provar_count] if provar_count < len(columns_seq) else None
+                    else:
+                        column = columns.get(ident)
+                    provar_count += 1
+                    if column is not None:
+                        values[arg] = self._provar(ident, types[ident], column, values[arg], n,
+                                                     mark, sites, program.token_at(pc))
+        return self._finish(n, outputs, state, error_site, sites, columns, columns_seq)
+
+    def _arith(self, op, lhs, rhs, n, mark):
+        if not isinstance(lhs, np.ndarray) and not isinstance(rhs, np.ndarray):
+            # Dois escalares: conta exata do Python, igual à VM
+            if op == BIN_ADD: return lhs + rhs
+            if op == BIN_SUB: return lhs - rhs
+            return lhs * rhs
+        lhs, rhs = _check_scalar(lhs), _check_scalar(rhs)
+        if op == BIN_ADD: result = np.add(lhs, rhs)
+        elif op == BIN_SUB: result = np.subtract(lhs, rhs)
+        else: result = np.multiply(lhs, rhs)
+        if _is_int(lhs) and _is_int(rhs):
+            # Estimativa em float64 para achar as linhas que estourariam o int64
+            fl, fr = np.asarray(lhs, dtype=np.float64), np.asarray(rhs, dtype=np.float64)
+            estimate = fl + fr if op == BIN_ADD else fl - fr if op == BIN_SUB else fl * fr
+            mark(np.broadcast_to(np.abs(estimate) > _INT_LIMIT, (n,)), _FALLBACK)
+        return result
+
+    def _divide(self, lhs, rhs, n, mark, sites, token):
+        site = len(sites)
+        sites.append(("div", token, None))
+        if not isinstance(rhs, np.ndarray):
+            if rhs == 0:
+                mark(np.ones(n, dtype=bool), _ERROR, site)
+                return np.zeros(n) if isinstance(lhs, np.ndarray) else 0.0
+            if not isinstance(lhs, np.ndarray):
+                return lhs / rhs
+        zero = rhs == 0
+        mark(np.broadcast_to(zero, (n,)), _ERROR, site)
+        for x in (lhs, rhs):
+            # A VM divide inteiros com arredondamento exato; em float64 isso
+            # só vale enquanto os inteiros são representáveis
+            if _is_int(x):
+                x = _check_scalar(x)
+                mark(np.broadcast_to(np.abs(x) > _EXACT_FLOAT, (n,)), _FALLBACK)
+        safe = np.where(zero, 1, rhs)
+        return np.true_divide(lhs, safe)
+
+    def _to_int(self, x, mark):
+        if not isinstance(x, np.ndarray):
+            return int(x)
+        if x.dtype.kind == "i":
+            return x
+        bad = ~np.isfinite(x) | (np.abs(x) > _INT_LIMIT)
+        mark(bad, _FALLBACK)
+        return np.trunc(np.where(bad, 0.0, x)).astype(np.int64)
+
+    def _provar(self, ident, tipo, column, current, n, mark, sites, token):
+        site = len(sites)
+        sites.append(("input", token, (tipo, column)))
+        array = np.asarray(column)
+        if len(array) != n:
+            raise ValueError(f"a coluna de '{ident}' tem {len(array)} valores, esperados {n}")
+        kind = array.dtype.kind
+        if kind == "i" or (kind == "u" and (len(array) == 0 or array.max() <= _INT_LIMIT)):
+            new = array.astype(np.int64 if tipo == "int" else np.float64)
+            return new
+        if kind == "f" and tipo == "real":
+            return array.astype(np.float64)
+        # Caso geral (texto, objetos, valores ausentes): mesma conversão da
+        # VM, valor por valor
+        convert = int if tipo == "int" else float
+        new = np.empty(n, dtype=np.int64 if tipo == "int" else np.float64)
+        present = np.ones(n, dtype=bool)
+        invalid = np.zeros(n, dtype=bool)
+        huge = np.zeros(n, dtype=bool)
+        for i, value in enumerate(column):
+            if value is None:
+                present[i] = False
+                continue
+            try:
+                number = convert(str(value))
+            except ValueError:
+                invalid[i] = True
+                continue
+            if tipo == "int" and abs(number) > _INT_LIMIT:
+                huge[i] = True
+                continue
+            new[i] = number
+        mark(invalid, _ERROR, site)
+        mark(huge, _FALLBACK)
+        keep = ~present | invalid | huge
+        if keep.any():
+            new = np.where(keep, current, new)
+        return new
+
+    def _finish(self, n, outputs, state, error_site, sites, columns, columns_seq) -> VectorResult:
+        # Linhas fora do modelo vetorizado são refeitas pela VM
+        fallback: Dict[int, Dict] = {}
+        for i in np.flatnonzero(state == _FALLBACK):
+            i = int(i)
+            if columns_seq is not None:
+                row = [column[i] for column in columns_seq]
+            else:
+                row = {ident: column[i] for ident, column in columns.items()}
+            fallback[i] = run_churras(self.program, input_provider=row_input(row))
+        return VectorResult(n, outputs, state, error_site, sites, fallback)
+
+def columns_from_rows(rows: Iterable[Row]) -> Tuple[Columns, int]:
+    # Transpõe linhas (listas ou dicionários, como as de rows_churras.iter_rows)
+    # em colunas. Valores que faltam viram None (a variável mantém o valor).
+    rows = list(rows)
+    named = sum(isinstance(row, Mapping) for row in rows)
+    if named and named != len(rows):
+        raise ValueError("as linhas devem ser todas listas ou todas objetos (nome -> valor)")
+    if named:
+        keys = dict.fromkeys(key for row in rows for key in row)
+        return {key: [row.get(key) for row in rows] for key in keys}, len(rows)
+    width = max((len(row) for row in rows), default=0)
+    return [[row[k] if k < len(row) else None for row in rows] for k in range(width)], len(rows)
+
+def run_vectorized(program: Union[str, Program], columns: Columns, rows: Optional[int] = None,
+                   optimize: bool = True) -> VectorResult:
+    # `columns` é uma sequência (a i-ésima coluna responde ao i-ésimo PROVAR
+    # executado) ou um dicionário nome da variável -> coluna. Sem PROVAR,
+    # informe o número de linhas em `rows`.
+    require_numpy()
+    if isinstance(program, str):
+        program = compile_program(program, optimize=optimize, backend="vm")
+    return VectorEngine(program).run(columns, rows)
@@ -0,0 +1,253 @@
+from __future__ import annotations
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Generator, List, Optional, Tuple, Union
+from bytecode_churras import (Program, LOAD_CONST, LOAD_NAME, STORE_NAME,
+                              BIN_ADD, BIN_SUB, BIN_MUL, BIN_DIV, SERVIR, PROVAR,
+                              CONCAT, TO_INT, TO_REAL)
+
+if TYPE_CHECKING:
+    # Saída, perfilador e limites só são carregados por quem os usa
+    import threading
+    from output_churras import OutputSink
+    from profile_churras import Profiler
+    from limits_churras import Budget
+
+class InterpreterError(Exception):
+    def __init__(self, message, token):
+        super().__init__(message)
+        self.token = token
+
+class ExecutionInterrupted(Exception):
+    # Execução cancelada pelo usuário ou interrompida pelo tempo limite
+    def __init__(self, message, token=None):
+        super().__init__(message)
+        self.token = token
+
+class LimitExceeded(Exception):
+    # Execução parada por passar de um limite (limits_churras)
+    def __init__(self, message, token=None):
+        super().__init__(message)
+        self.token = token
+
+# A cada quantas instruções a VM verifica cancelamento e tempo limite
+CHECK_INTERVAL = 4096
+
+def check_interrupt(cancel_event: Optional[threading.Event] = None, deadline: Optional[float] = None, token=None):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExecutionInterrupted("Execução cancelada pelo usuário.", token)
+    if deadline is not None and time.monotonic() > deadline:
+        raise ExecutionInterrupted("Tempo limite de execução esgotado.", token)
+
+# Um provedor de entrada recebe (variável, tipo) e devolve o texto digitado,
+# ou None se o usuário não informou nada (a variável mantém o valor atual).
+InputProvider = Callable[[str, str], Optional[str]]
+
+# Para drive_async, o provedor também pode ser uma função async (ex.: lê
+# de uma asyncio.Queue alimentada por um websocket)
+AsyncInputProvider = Callable[[str, str], Union[Awaitable[Optional[str]], Optional[str]]]
+
+def terminal_input(ident: str, variable_type: str) -> Optional[str]:
+    try:
+        return input(f"PROVAR > Digite um valor para '{ident}': ")
+    except EOFError:
+        return None
+
+def convert_input(user_input: str, variable_type: str, program, index: int):
+    # `index` é a posição do PROVAR (program.token_at), só usada no erro
+    try:
+        if variable_type == "int":
+            return int(user_input)
+        return float(user_input)
+    except ValueError:
+        raise InterpreterError(f"Entrada inválida '{user_input}' para variável do tipo '{variable_type}'.",
+                               program.token_at(index))
+
+def arithmetic_error(error: Exception, token) -> Optional[InterpreterError]:
+    # Estouros do Python nas operações (inteiro enorme com real, infinito ou
+    # NaN para PICANHA, inteiro longo demais para virar texto) viram erro do
+    # programa. Outras exceções (ex.: do destino da saída) devolvem None.
+    message = str(error)
+    if isinstance(error, OverflowError):
+        if "infinity" in message:
+            message = "Valor infinito não pode ser convertido para PICANHA."
+        else:
+            message = "Número grande demais para ARROZ."
+    elif "NaN" in message:
+        message = "Valor indefinido (NaN) não pode ser convertido para PICANHA."
+    elif "digits" in message:
+        message = "Número grande demais para SERVIR."
+    else:
+        return None
+    return InterpreterError(f"Erro Semântico: {message}", token)
+
+# --- EXECUÇÃO SUSPENSA ---
+# Um programa em execução é um gerador (steps() da VM e da NativeVM): em
+# cada PROVAR ele devolve (variável, tipo) e recebe de volta o texto
+# digitado, ou None para manter o valor atual. Ele também pode devolver
+# None, uma pausa sem pergunta, para quem intercala várias execuções. O
+# mesmo gerador serve à execução comum (drive) e ao asyncio (drive_async).
+Steps = Generator[Optional[Tuple[str, str]], Optional[str], None]
+
+def drive(steps: Steps, input_provider: InputProvider):
+    answer = None
+    try:
+        while True:
+            prompt = steps.send(answer)
+            answer = None if prompt is None else input_provider(*prompt)
+    except StopIteration:
+        pass
+    finally:
+        # Se o provedor falhar, a execução é encerrada (e a saída, enviada)
+        steps.close()
+
+async def drive_async(steps: Steps, input_provider: AsyncInputProvider, output: Optional[OutputSink] = None):
+    # Cada PROVAR espera o provedor sem bloquear o laço de eventos, e cada
+    # pausa devolve o controle a ele. Com um `output` que tenha wait_room
+    # (AsyncSink), a execução também espera o consumidor da saída.
+    import asyncio
+    import inspect
+    wait_room = getattr(output, "wait_room", None)
+    answer = None
+    try:
+        while True:
+            prompt = steps.send(answer)
+            if prompt is None:
+                answer = None
+                await asyncio.sleep(0)
+            else:
+                answer = input_provider(*prompt)
+                if inspect.isawaitable(answer):
+                    answer = await answer
+            if wait_room is not None:
+                await wait_room()
+    except StopIteration:
+        pass
+    finally:
+        steps.close()
+
+def collected(sink: OutputSink) -> List[str]:
+    # O que run() devolve: as linhas, se ficaram em memória
+    from output_churras import ListSink
+    return sink.lines if isinstance(sink, ListSink) else []
+
+class VM:
+    # `deadline` é um instante de time.monotonic(). Sem `output`, as linhas do
+    # SERVIR ficam em uma lista devolvida por run(). Com `profiler`, o tempo
+    # e as execuções de cada comando são registrados por linha. Com `budget`,
+    # a execução para ao passar dos limites (limits_churras).
+    def __init__(self, program: Program, input_provider: Optional[InputProvider] = None,
+                 cancel_event: Optional[threading.Event] = None, deadline: Optional[float] = None,
+                 output: Optional[OutputSink] = None, profiler: Optional[Profiler] = None,
+                 budget: Optional[Budget] = None):
+        self.program = program
+        self.input_provider = input_provider or terminal_input
+        self.cancel_event = cancel_event
+        self.deadline = deadline
+        if output is None:
+            from output_churras import ListSink
+            output = ListSink()
+        self.output = output
+        self.profiler = profiler
+        self.budget = budget
+
+    def run(self) -> List[str]:
+        drive(self.steps(), self.input_provider)
+        return collected(self.output)
+
+    def steps(self, pause: bool = False) -> Steps:
+        # Tipos e declarações foram verificados na compilação (typecheck_churras):
+        # aqui só sobram a divisão por zero, os estouros (arithmetic_error) e
+        # a entrada do PROVAR. Cada
+        # variável tem um slot fixo em `values`, já com o valor inicial.
+        # Com `pause`, a execução também pausa ao fim de cada fatia.
+        program = self.program
+        names, types = program.names, program.types
+        code, consts = program.code, program.consts
+        values = list(program.initial)
+        servir = self.output.write
+        stack = []
+        push, pop = stack.append, stack.pop
+        pc, end = 0, len(code)
+        interruptible = self.cancel_event is not None or self.deadline is not None
+        profiler = self.profiler
+        budget = self.budget
+        # Com limite de operações, a execução não passa de `limit` no código;
+        # com limite de memória, os valores são medidos ao fim de cada comando
+        limit = end
+        if budget is not None and budget.limits.max_ops is not None:
+            limit = min(end, 2 * budget.limits.max_ops)
+        track_memory = budget is not None and budget.limits.max_memory is not None
+        if track_memory:
+            budget.start_memory(values)
+        if profiler is not None or track_memory:
+            statements, clock = program.statements(), time.perf_counter
+        try:
+            while pc < end:
+                if pc >= limit:
+                    budget.ops_exceeded(program.token_at(pc))
+                # O laço roda em fatias para verificar a interrupção sem
+                # custo extra por instrução. No perfilador (e com limite de
+                # memória), cada fatia é um comando.
+                if profiler is None and not track_memory:
+                    stop = min(pc + 2 * CHECK_INTERVAL, limit)
+                else:
+                    stop, line = statements[pc]
+                    stop = min(stop, limit)
+                    started = clock()
+                if interruptible:
+                    check_interrupt(self.cancel_event, self.deadline, program.token_at(pc))
+                if budget is not None:
+                    budget.check_time(program.token_at(pc))
+                while pc < stop:
+                    op = code[pc]
+                    arg = code[pc + 1]
+                    pc += 2
+                    if op == LOAD_CONST:
+                        push(consts[arg])
+                    elif op == LOAD_NAME:
+                        push(values[arg])
+                    elif op == STORE_NAME:
+                        values[arg] = pop()
+                    elif op == BIN_ADD or op == CONCAT:
+                        rhs = pop(); stack[-1] = stack[-1] + rhs
+                    elif op == BIN_SUB:
+                        rhs = pop(); stack[-1] = stack[-1] - rhs
+                    elif op == BIN_MUL:
+                        rhs = pop(); stack[-1] = stack[-1] * rhs
+                    elif op == BIN_DIV:
+                        rhs = pop()
+                        if rhs == 0:
+                            raise InterpreterError("Erro Semântico: Divisão por zero.", program.token_at(pc - 2))
+                        stack[-1] = stack[-1] / rhs
+                    elif op == TO_INT:
+                        stack[-1] = int(stack[-1])
+                    elif op == TO_REAL:
+                        stack[-1] = float(stack[-1])
+                    elif op == SERVIR:
+                        servir(str(pop()))
+                    elif op == PROVAR:
+                        ident = names[arg]
+                        # A saída pendente aparece antes da pergunta
+                        self.output.flush()
+                        user_input = yield ident, types[ident]
+                        if user_input is not None:
+                            values[arg] = convert_input(user_input, types[ident], program, pc - 2)
+                if profiler is not None:
+                    profiler.record(line, clock() - started)
+                if track_memory and code[pc - 2] in (STORE_NAME, PROVAR):
+                    budget.store(code[pc - 1], values[code[pc - 1]], program.token_at(pc - 2))
+                if pause:
+                    yield None
+        except (OverflowError, ValueError) as error:
+            # O erro aponta para o comando, como no backend Python
+            while code[pc - 2] not in (STORE_NAME, SERVIR, PROVAR):
+                pc += 2
+            converted = arithmetic_error(error, program.token_at(pc - 2))
+            if converted is None:
+                raise
+            raise converted from error
+        finally:
+            if budget is not None:
+                budget.ops = pc // 2
+            # Mesmo com erro, o que já foi servido chega ao destino
+            self.output.flush()
@@ -0,0 +1,83 @@
+import time
+import queue
+import threading
+from typing import Dict, Optional
+from parser_churras import compile_churras
+from cache_churras import ProgramCache
+from vm_churras import check_interrupt
+from output_churras import QueueSink
+
+# Intervalo (segundos) em que a espera por um PROVAR verifica cancelamento
+INPUT_POLL_INTERVAL = 0.1
+
+class InputRequest:
+    # Pedido de PROVAR feito pela thread de execução. A interface mostra a
+    # pergunta na sua própria thread e responde com answer().
+    def __init__(self, ident: str, variable_type: str):
+        self.ident = ident
+        self.variable_type = variable_type
+        self._reply: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=1)
+
+    def answer(self, value: Optional[str]):
+        try:
+            self._reply.put_nowait(value)
+        except queue.Full:
+            pass
+
+class CompileJob:
+    # Compila e executa um programa em uma thread separada. Tudo o que a
+    # interface precisa saber chega pela fila `messages`:
+    #   ("input", InputRequest) - o programa está esperando um PROVAR
+    #   ("done", result)        - o dicionário de compile_churras (uma falha
+    #                             inesperada vem com error_stage "Interno")
+    # A saída do SERVIR chega à parte, em blocos, por `output` (drain()).
+    def __init__(self, code: str, cache: Optional[ProgramCache] = None, timeout: Optional[float] = None,
+                 profile: bool = False):
+        self.code = code
+        self.cache = cache
+        self.timeout = timeout
+        self.profile = profile
+        self.messages: queue.Queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self._deadline: Optional[float] = None
+        # Com a fila cheia, a execução espera a interface (sem passar do tempo limite)
+        self.output = QueueSink(check=lambda: check_interrupt(self.cancel_event, self._deadline))
+        self._thread = threading.Thread(target=self._run, name="churras-worker", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def _input(self, ident: str, variable_type: str) -> Optional[str]:
+        request = InputRequest(ident, variable_type)
+        self.messages.put(("input", request))
+        while True:
+            try:
+                return request._reply.get(timeout=INPUT_POLL_INTERVAL)
+            except queue.Empty:
+                check_interrupt(self.cancel_event, self._deadline)
+
+    def _run(self):
+        if self.timeout is not None:
+            self._deadline = time.monotonic() + self.timeout
+        try:
+            result = compile_churras(self.code, cache=self.cache, input_provider=self._input,
+                                     cancel_event=self.cancel_event, timeout=self.timeout, output=self.output,
+                                     profile=self.profile)
+        except Exception as e:
+            # Uma falha inesperada do compilador também encerra o job: sem o
+            # "done" a interface ficaria esperando para sempre
+            result = _internal_error(e)
+        self.messages.put(("done", result))
+
+def _internal_error(e: Exception) -> Dict:
+    # Mesmo formato do resultado de compile_churras, com error_stage "Interno"
+    message = f"{type(e).__name__}: {e}"
+    return {"status": "error", "tokens": [], "outputs": [], "profile": None, "error_stage": "Interno",
+            "error_message": message, "error_token": None, "error_line": None, "error_col": None,
+            "errors": [{"stage": "Interno", "message": message, "token": None, "line": None, "col": None}]}
@@ -0,0 +1,62 @@
+import os
+import sys
+import random
+
+# Os testes importam os módulos direto das pastas, como os benchmarks
+_RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(_RAIZ, "churras_compiler"))
+sys.path.insert(0, os.path.join(_RAIZ, "benchmarks"))
+
+# Inteiro que não cabe em um real: float(ENORME) dá OverflowError
+ENORME = "9" * 400
+
+def programa(comandos: str, declaracoes=("x : ARROZ", "p : PICANHA")) -> str:
+    # Receita com a DESPENSA dada (linhas 3 em diante) e todos os comandos
+    # na linha logo depois de COZINHAR
+    despensa = "".join(f"    {decl};\n" for decl in declaracoes)
+    return f"INICIAR_CHURRAS\nDESPENSA\n{despensa}COZINHAR\n    {comandos}\nFIM_CHURRAS\n"
+
+def receita_aleatoria(semente: int, comandos: int = 30, textos: bool = True) -> str:
+    # Receita sintética (sempre a mesma para a mesma semente) com contas
+    # entre int e real, parênteses, divisões, Strings, PROVAR e, de vez em
+    # quando, uma variável não declarada ou uma divisão por zero
+    rnd = random.Random(semente)
+    nomes = [f"v{i}" for i in range(6)]
+    declarados = rnd.sample(nomes, rnd.randint(2, 6))
+
+    def expr(nivel: int = 0) -> str:
+        c = rnd.random()
+        if nivel > 3 or c < 0.3:
+            k = rnd.random()
+            if k < 0.4: return str(rnd.randint(0, 5))
+            if k < 0.55: return f"{rnd.randint(0, 5)}.{rnd.randint(0, 9)}"
+            if k < 0.57 and textos and rnd.random() < 0.3: return '"s"'
+            return rnd.choice(declarados if rnd.random() < 0.97 else nomes)
+        if c < 0.4:
+            return f"({expr(nivel + 1)})"
+        op = rnd.choice("+-*+-*/")
+        if op == "/" and rnd.random() < 0.9:
+            return f"{expr(nivel + 1)} / {rnd.randint(1, 5)}" + (f".{rnd.randint(0, 9)}" if rnd.random() < 0.3 else "")
+        return f"{expr(nivel + 1)} {op} {expr(nivel + 1)}"
+
+    linhas = ["INICIAR_CHURRAS", "DESPENSA"]
+    linhas += [f"    {nome} : {rnd.choice(['PICANHA', 'ARROZ'])};" for nome in declarados]
+    linhas.append("COZINHAR")
+    for _ in range(comandos):
+        k = rnd.random()
+        if k < 0.55: linhas.append(f"    {rnd.choice(declarados if rnd.random() < 0.95 else nomes)} = {expr()};")
+        elif k < 0.85: linhas.append(f"    SERVIR {expr()};")
+        else: linhas.append(f"    PROVAR {rnd.choice(declarados)};")
+    linhas.append("FIM_CHURRAS")
+    return "\n".join(linhas) + "\n"
+
+def entradas(semente: int):
+    # Provedor de PROVAR determinístico: às vezes não responde (None) e às
+    # vezes responde algo inválido
+    rnd = random.Random(semente * 7 + 1)
+    def provedor(ident: str, tipo: str):
+        k = rnd.random()
+        if k < 0.3: return None
+        if k < 0.35: return "x"
+        return str(rnd.randint(-3, 3)) if k < 0.8 or tipo == "int" else "1.5"
+    return provedor
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+
+from conftest import programa, receita_aleatoria, entradas
+from output_churras import AsyncSink
+from limits_churras import Limits
+from parser_churras import compile_program, run_churras, run_churras_async
+
+def _resumo(result):
+    return (result["status"], result["outputs"], result["error_stage"], result["error_message"],
+            result["error_line"], result["error_col"])
+
+class AsyncTest(unittest.TestCase):
+    def test_igual_a_run_churras(self):
+        # Provedor async e comum dão a mesma execução
+        for backend in ("vm", "python"):
+            for semente in range(60):
+                codigo = receita_aleatoria(semente)
+                try:
+                    program = compile_program(codigo, backend=backend)
+                except Exception:
+                    continue
+                provedor = entradas(semente)
+
+                async def provedor_async(ident, tipo):
+                    await asyncio.sleep(0)
+                    return provedor(ident, tipo)
+
+                with self.subTest(backend=backend, semente=semente):
+                    esperado = run_churras(program, input_provider=entradas(semente))
+                    result = asyncio.run(run_churras_async(program, provedor_async))
+                    self.assertEqual(_resumo(result), _resumo(esperado))
+
+    def test_saida_em_fluxo(self):
+        # Com AsyncSink (e fila de um bloco só) a saída é lida enquanto o
+        # programa roda e chega inteira, em ordem
+        program = compile_program(programa(" ".join(f"SERVIR {i};" for i in range(2000))))
+
+        async def roda():
+            sink = AsyncSink(maxsize=1, buffer_lines=10)
+            tarefa = asyncio.create_task(run_churras_async(program, output=sink))
+            linhas = [linha async for linha in sink]
+            return linhas, await tarefa
+
+        linhas, result = asyncio.run(roda())
+        self.assertEqual(linhas, [str(i) for i in range(2000)])
+        self.assertEqual((result["status"], result["output_lines"]), ("success", 2000))
+
+    def test_execucoes_intercaladas(self):
+        # Duas execuções no mesmo laço, cada uma esperando a própria fila
+        program = compile_program(programa("PROVAR p; SERVIR p; PROVAR p; SERVIR p * 2;"))
+
+        async def roda():
+            filas = [asyncio.Queue(), asyncio.Queue()]
+            tarefas = [asyncio.create_task(run_churras_async(program, lambda ident, tipo, f=fila: f.get()))
+                       for fila in filas]
+            for resposta in ("1", "2", "3", "4"):
+                await filas[int(resposta) % 2].put(resposta)
+                await asyncio.sleep(0)
+            return await asyncio.gather(*tarefas)
+
+        um, dois = asyncio.run(roda())
+        self.assertEqual((um["outputs"], dois["outputs"]), (["2", "8"], ["1", "6"]))
+
+    def test_cancelamento_e_limites(self):
+        program = compile_program(programa("PROVAR p; SERVIR p;"))
+
+        async def cancela():
+            nunca = asyncio.Event()
+
+            async def espera(ident, tipo):
+                await nunca.wait()
+
+            tarefa = asyncio.create_task(run_churras_async(program, espera))
+            await asyncio.sleep(0.01)
+            tarefa.cancel()
+            await tarefa
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancela())
+        result = asyncio.run(run_churras_async(program, lambda ident, tipo: "12345",
+                                               limits=Limits(max_output_bytes=3)))
+        self.assertEqual((result["status"], result["error_stage"], result["outputs"]), ("error", "Limite", []))
+
+if __name__ == "__main__":
+    unittest.main()
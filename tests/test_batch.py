@@ -0,0 +1,87 @@
+import io
+import os
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from unittest import mock
+
+from conftest import receita_aleatoria
+import batch_churras
+from parser_churras import compile_churras
+
+def _sem_tempo(report):
+    return {k: v for k, v in report.items() if k != "elapsed"}
+
+class LoteTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        for i in range(1, 4):
+            with open(os.path.join(self.dir.name, f"r{i}.churras"), "w", encoding="utf-8") as f:
+                f.write(f"INICIAR_CHURRAS COZINHAR SERVIR {i}; FIM_CHURRAS\n")
+        self.files = batch_churras.expand_paths([self.dir.name])
+
+    def test_falha_interna_nao_para_o_lote(self):
+        compile_churras = batch_churras.compile_churras
+
+        def quebra_no_dois(code, **kwargs):
+            if "SERVIR 2" in code:
+                raise OverflowError("estouro")
+            return compile_churras(code, **kwargs)
+
+        with mock.patch.object(batch_churras, "compile_churras", side_effect=quebra_no_dois):
+            reports = list(batch_churras.run_batch(self.files, jobs=1))
+        self.assertEqual([r["status"] for r in reports], ["success", "error", "success"])
+        self.assertEqual(reports[1]["error_stage"], "Interno")
+        self.assertEqual(reports[2]["output"], ["3"])
+
+class LoteParaleloTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        os.makedirs(os.path.join(self.dir.name, "sub"))
+        self.codigos = {}
+        for semente in range(24):
+            pasta = "sub" if semente % 3 else ""
+            path = os.path.join(self.dir.name, pasta, f"r{semente:02d}.churras")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(receita_aleatoria(semente))
+            self.codigos[path] = receita_aleatoria(semente)
+        with open(os.path.join(self.dir.name, "leia.txt"), "w") as f:
+            f.write("não é receita")
+
+    def test_expand_paths(self):
+        # Diretório busca *.churras recursivamente; repetidos saem uma vez
+        raiz = self.dir.name
+        files = batch_churras.expand_paths([raiz, os.path.join(raiz, "sub", "*.churras"), os.path.join(raiz, "r00.churras")])
+        self.assertEqual(sorted(files), sorted(self.codigos))
+        self.assertEqual(len(files), len(set(files)))
+
+    def test_paralelo_igual_ao_sequencial(self):
+        files = batch_churras.expand_paths([self.dir.name])
+        sequencial = [_sem_tempo(r) for r in batch_churras.run_batch(files, jobs=1)]
+        paralelo = [_sem_tempo(r) for r in batch_churras.run_batch(files, jobs=3)]
+        self.assertEqual(paralelo, sequencial)
+        self.assertEqual([r["file"] for r in paralelo], files)
+        for report in sequencial:
+            # PROVAR sem resposta mantém o valor, como compile_churras com None
+            result = compile_churras(self.codigos[report["file"]], input_provider=lambda ident, tipo: None)
+            self.assertEqual((report["status"], report["error_message"]), (result["status"], result["error_message"]))
+            if result["status"] == "success":
+                self.assertEqual(report["output"], result["outputs"])
+
+    def test_main(self):
+        saida, erros = io.StringIO(), io.StringIO()
+        with redirect_stdout(saida), redirect_stderr(erros):
+            codigo = batch_churras.main([self.dir.name, "-j", "2", "--check"])
+        reports = [json.loads(linha) for linha in saida.getvalue().splitlines()]
+        self.assertEqual(len(reports), len(self.codigos))
+        falhas = sum(r["status"] != "success" for r in reports)
+        self.assertEqual(codigo, batch_churras.EXIT_FAILURES if falhas else batch_churras.EXIT_OK)
+        with redirect_stderr(erros):
+            self.assertEqual(batch_churras.main([os.path.join(self.dir.name, "nada", "*.churras")]),
+                             batch_churras.EXIT_NO_FILES)
+
+if __name__ == "__main__":
+    unittest.main()
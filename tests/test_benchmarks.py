@@ -0,0 +1,44 @@
+import unittest
+
+from gerador_churras import CASOS, gerar
+from bench_suite import comparar, medir_caso
+from parser_churras import compile_churras
+
+class GeradorTest(unittest.TestCase):
+    def test_deterministico(self):
+        for caso in CASOS:
+            with self.subTest(caso=caso):
+                self.assertEqual(gerar(caso, 200, 7), gerar(caso, 200, 7))
+                self.assertNotEqual(gerar(caso, 200, 7)[0], gerar(caso, 200, 8)[0])
+
+    def test_receitas_validas(self):
+        # Toda receita gerada compila e roda com as entradas geradas
+        for caso in CASOS:
+            codigo, valores = gerar(caso, 300)
+            respostas = iter(valores)
+            with self.subTest(caso=caso):
+                result = compile_churras(codigo, input_provider=lambda ident, tipo: next(respostas))
+                self.assertEqual(result["status"], "success", result["error_message"])
+                self.assertEqual(next(respostas, None), None)
+
+    def test_caso_desconhecido(self):
+        with self.assertRaises(ValueError):
+            gerar("sobremesa", 10)
+
+class SuiteTest(unittest.TestCase):
+    def test_medir_caso(self):
+        metricas = medir_caso("provar", 50, 42, 1)
+        self.assertEqual(metricas["tamanho"], 50)
+        self.assertGreater(metricas["execucao_ops_s"], 0)
+
+    def test_comparar(self):
+        base = {"casos": {"a": {"tamanho": 10, "lexico_tokens_s": 1000.0, "compile_churras_s": 1.0}}}
+        igual = {"casos": {"a": {"tamanho": 10, "lexico_tokens_s": 900.0, "compile_churras_s": 1.2}}}
+        pior = {"casos": {"a": {"tamanho": 10, "lexico_tokens_s": 500.0, "compile_churras_s": 2.0}}}
+        outro = {"casos": {"a": {"tamanho": 20, "lexico_tokens_s": 500.0}}}
+        self.assertEqual(comparar(igual, base, 0.25), [])
+        self.assertEqual(len(comparar(pior, base, 0.25)), 2)
+        self.assertEqual(len(comparar(outro, base, 0.25)), 1)
+
+if __name__ == "__main__":
+    unittest.main()
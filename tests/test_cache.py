@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from conftest import programa, receita_aleatoria, entradas
+from cache_churras import ProgramCache, ARTIFACT_EXT
+from parser_churras import compile_churras, check_churras
+
+RECEITAS = 40
+# Só os programas que compilam vão para o cache
+COMPILAM = sum(check_churras(receita_aleatoria(semente))["status"] == "success" for semente in range(RECEITAS))
+
+def _executa(codigo: str, semente: int, cache, backend: str = "vm"):
+    result = compile_churras(codigo, cache=cache, input_provider=entradas(semente), backend=backend)
+    tokens = [tuple(linha) for linha in result["tokens"]]
+    return (result["status"], result["outputs"], result["error_message"], tokens)
+
+class CacheTest(unittest.TestCase):
+    # Um programa vindo do cache (memória ou disco) roda igual a um recém
+    # compilado, com a mesma tabela de tokens
+    def _compara(self, cache_de_leitura, backend: str):
+        for semente in range(RECEITAS):
+            codigo = receita_aleatoria(semente)
+            with self.subTest(semente=semente, backend=backend):
+                self.assertEqual(_executa(codigo, semente, cache_de_leitura, backend),
+                                 _executa(codigo, semente, None, backend))
+
+    def test_memoria(self):
+        for backend in ("vm", "python"):
+            cache = ProgramCache()
+            for semente in range(RECEITAS):
+                compile_churras(receita_aleatoria(semente), cache=cache, input_provider=entradas(semente),
+                                backend=backend)
+            self._compara(cache, backend)
+            self.assertEqual(cache.stats()["hits"], COMPILAM)
+
+    def test_disco(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            for backend in ("vm", "python"):
+                escrita = ProgramCache(cache_dir=pasta)
+                for semente in range(RECEITAS):
+                    compile_churras(receita_aleatoria(semente), cache=escrita, backend=backend,
+                                    input_provider=entradas(semente))
+                leitura = ProgramCache(cache_dir=pasta)
+                self._compara(leitura, backend)
+                self.assertEqual(leitura.stats()["disk_hits"], COMPILAM)
+
+    def test_artefato_corrompido_recompila(self):
+        codigo = programa("PROVAR x; p = x * 2; SERVIR p;")
+        with tempfile.TemporaryDirectory() as pasta:
+            compile_churras(codigo, cache=ProgramCache(cache_dir=pasta), input_provider=entradas(1))
+            for nome in os.listdir(pasta):
+                with open(os.path.join(pasta, nome), "wb") as f:
+                    f.write(b"lixo")
+            cache = ProgramCache(cache_dir=pasta)
+            self.assertEqual(_executa(codigo, 1, cache), _executa(codigo, 1, None))
+            self.assertEqual(cache.stats()["misses"], 1)
+            self.assertEqual([nome.endswith(ARTIFACT_EXT) for nome in os.listdir(pasta)], [True])
+
+    def test_lru(self):
+        cache = ProgramCache(max_entries=2)
+        for n in (1, 2, 1, 3, 1, 2):
+            compile_churras(programa(f"SERVIR {n};"), cache=cache)
+        # 2 sai quando 3 entra (1 tinha sido usado depois) e volta como falta
+        self.assertEqual(cache.stats()["evictions"], 2)
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (2, 4))
+
+if __name__ == "__main__":
+    unittest.main()
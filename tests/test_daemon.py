@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import socket
+import tempfile
+import threading
+import subprocess
+import unittest
+from unittest import mock
+
+from conftest import receita_aleatoria
+import daemon_churras
+from cache_churras import ProgramCache
+from parser_churras import compile_churras, check_churras
+
+RECEITA = "INICIAR_CHURRAS DESPENSA x : ARROZ; p : PICANHA; COZINHAR PROVAR x; p = x; SERVIR p; FIM_CHURRAS"
+
+def _atende(*pedidos):
+    respostas = []
+    daemon_churras.serve_lines([json.dumps(p) for p in pedidos], respostas.append, ProgramCache())
+    return [json.loads(r) for r in respostas]
+
+class DaemonTest(unittest.TestCase):
+    def test_erro_de_execucao_nao_e_do_pedido(self):
+        nan, ok = _atende({"id": 1, "op": "run", "code": RECEITA, "inputs": ["nan"]},
+                          {"id": 2, "op": "run", "code": RECEITA, "inputs": ["2.5"]})
+        self.assertEqual((nan["id"], nan["status"], nan["error_stage"]), (1, "error", "Semântico"))
+        self.assertEqual((ok["id"], ok["status"], ok["output"]), (2, "success", ["2"]))
+
+    def test_falha_interna_fica_no_pedido(self):
+        with mock.patch.object(daemon_churras, "compile_churras", side_effect=OverflowError("estouro")):
+            falha, stats = _atende({"id": 1, "op": "run", "code": RECEITA}, {"id": 2, "op": "stats"})
+        self.assertEqual((falha["id"], falha["status"], falha["error_stage"]), (1, "error", "Interno"))
+        self.assertIn("OverflowError", falha["error_message"])
+        self.assertEqual(stats["status"], "success")
+
+    def test_pedido_malformado(self):
+        resposta, = _atende({"id": 1, "op": "run"})
+        self.assertEqual((resposta["status"], resposta["error_stage"]), ("error", "Pedido"))
+
+    def test_respostas_iguais_a_compile_churras(self):
+        cache = ProgramCache()
+        for semente in range(40):
+            codigo = receita_aleatoria(semente)
+            inputs = ["2", "1.5", "x"] * 4
+            with self.subTest(semente=semente):
+                respostas = []
+                daemon_churras.serve_lines([json.dumps({"id": semente, "op": "run", "code": codigo, "inputs": inputs}),
+                                            json.dumps({"op": "check", "code": codigo})], respostas.append, cache)
+                run, check = (json.loads(r) for r in respostas)
+                respostas_provar = iter(inputs)
+                result = compile_churras(codigo, input_provider=lambda ident, tipo: next(respostas_provar, None))
+                self.assertEqual((run["id"], run["status"], run["error_stage"], run["error_message"], run["output"]),
+                                 (semente, result["status"], result["error_stage"], result["error_message"],
+                                  result["outputs"]))
+                verificado = check_churras(codigo)
+                self.assertEqual((check["status"], check["error_message"]),
+                                 (verificado["status"], verificado["error_message"]))
+
+    def test_cache_quente_e_shutdown(self):
+        # O segundo pedido com o mesmo código não recompila; depois do
+        # shutdown as linhas seguintes não são lidas
+        respostas = []
+        pedidos = [json.dumps({"op": "run", "code": RECEITA})] * 2 + [json.dumps({"op": "shutdown"}), "não lido"]
+        self.assertTrue(daemon_churras.serve_lines(pedidos, respostas.append, ProgramCache()))
+        self.assertEqual(len(respostas), 3)
+        stats, = _atende({"op": "run", "code": RECEITA}, {"op": "run", "code": RECEITA}, {"op": "stats"})[2:]
+        self.assertEqual((stats["cache"]["misses"], stats["cache"]["hits"]), (1, 1))
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "sem sockets Unix")
+    def test_socket(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "churras.sock")
+            server = daemon_churras.make_server(caminho, ProgramCache())
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                with socket.socket(socket.AF_UNIX) as cliente:
+                    cliente.connect(caminho)
+                    arquivo = cliente.makefile("rw", encoding="utf-8")
+                    for i in range(3):
+                        arquivo.write(json.dumps({"id": i, "op": "run", "code": RECEITA, "inputs": [str(i)]}) + "\n")
+                    arquivo.write(json.dumps({"id": 9, "op": "shutdown"}) + "\n")
+                    arquivo.flush()
+                    respostas = [json.loads(arquivo.readline()) for _ in range(4)]
+                self.assertEqual([r["id"] for r in respostas], [0, 1, 2, 9])
+                self.assertEqual([r["output"] for r in respostas[:3]], [["0"], ["1"], ["2"]])
+                thread.join(5)
+                self.assertFalse(thread.is_alive())
+            finally:
+                server.server_close()
+
+class NucleoSemTkTest(unittest.TestCase):
+    def test_importar_o_nucleo_nao_carrega_tk(self):
+        pasta = os.path.dirname(daemon_churras.__file__)
+        script = ("import sys; import parser_churras, daemon_churras, batch_churras; "
+                  "r = parser_churras.compile_churras('INICIAR_CHURRAS COZINHAR SERVIR 1; FIM_CHURRAS'); "
+                  "print(r['outputs'], sorted(m for m in ('tkinter', '_tkinter', 'gui') if m in sys.modules))")
+        saida = subprocess.run([sys.executable, "-c", script], cwd=pasta, capture_output=True, text=True,
+                               env={**os.environ, "DISPLAY": ""}, check=True).stdout
+        self.assertEqual(saida.strip(), "['1'] []")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from conftest import ENORME, programa, receita_aleatoria, entradas
+from legacy_interpreter import interpret
+from gerador_churras import gerar
+from parser_churras import compile_churras, check_churras
+
+RECEITAS = 200
+
+def _resumo(result):
+    # A saída só é comparada em caso de sucesso (o original não devolvia a
+    # saída parcial de um programa com erro)
+    saida = result["outputs"] if result["status"] == "success" else None
+    return (result["status"], saida, result["error_stage"], result["error_message"],
+            result["error_line"], result["error_col"])
+
+class InterpretadorOriginalTest(unittest.TestCase):
+    # A VM executa como o interpretador original: mesma saída e mesmo erro,
+    # na mesma posição. Só os erros que agora são achados antes de executar
+    # (variável não declarada, String em conta) podem sair antes dos do
+    # original, que só os via ao chegar no comando
+    def test_receitas_aleatorias(self):
+        for semente in range(RECEITAS):
+            codigo = receita_aleatoria(semente, textos=False)
+            original = interpret(codigo, entradas(semente))
+            with self.subTest(semente=semente):
+                if check_churras(codigo)["status"] == "error":
+                    self.assertEqual(original["status"], "error")
+                    continue
+                result = compile_churras(codigo, input_provider=entradas(semente), optimize=False)
+                self.assertEqual(_resumo(result), _resumo(original))
+
+class BackendPythonTest(unittest.TestCase):
+    # O código Python gerado executa igual à VM, inclusive nos erros
+    def test_receitas_aleatorias(self):
+        for semente in range(RECEITAS):
+            codigo = receita_aleatoria(semente)
+            with self.subTest(semente=semente):
+                vm, python = (compile_churras(codigo, input_provider=entradas(semente), backend=backend)
+                              for backend in ("vm", "python"))
+                self.assertEqual(_resumo(python), _resumo(vm))
+                self.assertEqual(python["outputs"], vm["outputs"])
+
+    def test_programas_grandes(self):
+        for caso in ("cozinhar", "aninhado", "provar"):
+            codigo, respostas = gerar(caso, 600)
+            with self.subTest(caso=caso):
+                vm, python = (compile_churras(codigo, input_provider=lambda ident, tipo, r=iter(respostas): next(r),
+                                              backend=backend) for backend in ("vm", "python"))
+                self.assertEqual((python["status"], python["outputs"]), ("success", vm["outputs"]))
+
+class EstouroTest(unittest.TestCase):
+    # Estouros do Python viram erro do programa, iguais nos dois backends
+    def _executa(self, comandos: str, entrada: str = "0"):
+        resultados = []
+        for backend in ("vm", "python"):
+            for optimize in (False, True):
+                result = compile_churras(programa(comandos), input_provider=lambda ident, tipo: entrada,
+                                         optimize=optimize, backend=backend)
+                resultados.append((result["status"], result["error_stage"], result["error_message"],
+                                   result["error_line"], result["error_col"]))
+        self.assertEqual(len(set(resultados)), 1, resultados)
+        return resultados[0]
+
+    def test_inteiro_enorme_com_real(self):
+        status, stage, message, line, col = self._executa(f"p = {ENORME}; x = p * 1.0; SERVIR x;")
+        self.assertEqual((status, stage), ("error", "Semântico"))
+        self.assertEqual(message, "Erro Semântico: Número grande demais para ARROZ.")
+        self.assertEqual((line, col), (6, 5 + len(f"p = {ENORME}; ")))
+
+    def test_infinito_para_picanha(self):
+        status, _, message, _, _ = self._executa("PROVAR x; p = x; SERVIR p;", "inf")
+        self.assertEqual(status, "error")
+        self.assertEqual(message, "Erro Semântico: Valor infinito não pode ser convertido para PICANHA.")
+
+    def test_nan_para_picanha(self):
+        status, _, message, _, _ = self._executa("PROVAR x; p = x + 1; SERVIR p;", "nan")
+        self.assertEqual(status, "error")
+        self.assertEqual(message, "Erro Semântico: Valor indefinido (NaN) não pode ser convertido para PICANHA.")
+
+class AtribuicaoMortaTest(EstouroTest):
+    # Uma atribuição nunca lida só sai se não puder falhar: o otimizador não
+    # pode esconder o erro da conversão
+    def test_infinito_para_picanha_nao_lido(self):
+        status, _, message, _, _ = self._executa('PROVAR x; p = x; SERVIR "fim";', "inf")
+        self.assertEqual(status, "error")
+        self.assertEqual(message, "Erro Semântico: Valor infinito não pode ser convertido para PICANHA.")
+
+    def test_inteiro_enorme_com_real_nao_lido(self):
+        status, _, message, _, _ = self._executa(f"p = {ENORME}; x = p * 1.0;")
+        self.assertEqual(status, "error")
+        self.assertEqual(message, "Erro Semântico: Número grande demais para ARROZ.")
+
+    def test_atribuicao_segura_sai(self):
+        status, _, _, _, _ = self._executa('PROVAR x; x = x * 2.0; SERVIR "fim";', "inf")
+        self.assertEqual(status, "success")
+
+if __name__ == "__main__":
+    unittest.main()
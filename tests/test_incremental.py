@@ -0,0 +1,99 @@
+import random
+import unittest
+
+from conftest import receita_aleatoria
+from incremental_churras import IncrementalLexer
+from lexer_churras import Lexer
+from tokens_churras import TokenType, KEYWORDS
+
+# Edições que mudam o estado das linhas seguintes (aspas, comentário) ou
+# criam erros
+TRECHOS = ('"', '# ', "@", "1.", " x = 2;", 'SERVIR "a', "")
+
+def _do_zero(linhas):
+    lexer = IncrementalLexer()
+    lexer.update(linhas)
+    lexer.ensure(len(linhas))
+    return [(info.spans, info.state_out, info.error) for info in lexer.lines]
+
+class IncrementalLexerTest(unittest.TestCase):
+    # Depois de qualquer sequência de edições, o resultado guardado é o
+    # mesmo de analisar o texto todo de novo
+    def test_edicoes_aleatorias(self):
+        for semente in range(30):
+            rnd = random.Random(semente)
+            linhas = receita_aleatoria(semente).split("\n")
+            lexer = IncrementalLexer()
+            for passo in range(40):
+                n = rnd.randrange(len(linhas))
+                k = rnd.random()
+                if k < 0.5:
+                    col = rnd.randint(0, len(linhas[n]))
+                    linhas[n] = linhas[n][:col] + rnd.choice(TRECHOS) + linhas[n][col:]
+                elif k < 0.75 and len(linhas) > 1:
+                    del linhas[n]
+                else:
+                    linhas.insert(n, rnd.choice(TRECHOS))
+                lexer.update(list(linhas))
+                # A IDE só pede as linhas visíveis: às vezes só uma parte
+                lexer.ensure(rnd.randint(0, len(linhas)) if rnd.random() < 0.5 else len(linhas))
+                with self.subTest(semente=semente, passo=passo):
+                    lexer.ensure(len(linhas))
+                    self.assertEqual([(info.spans, info.state_out, info.error) for info in lexer.lines],
+                                     _do_zero(linhas))
+
+    def test_cores_iguais_aos_tokens(self):
+        # Palavras-chave, números e Strings coloridos nas posições dos tokens
+        # do léxico do compilador
+        tipos = {t: "keyword" for t in KEYWORDS.values()}
+        tipos.update({TokenType.STRING: "string", TokenType.NUM_INTEIRO: "number", TokenType.NUM_REAL: "number"})
+        for semente in range(30):
+            codigo = receita_aleatoria(semente)
+            esperado = set()
+            for t in Lexer(codigo).tokenize():
+                if t.type in tipos:
+                    tamanho = len(t.lexeme) + (2 if t.type == TokenType.STRING else 0)
+                    esperado.add((t.line, tipos[t.type], t.col - 1, t.col - 1 + tamanho))
+            lexer = IncrementalLexer()
+            lexer.update(codigo.split("\n"))
+            lexer.ensure(len(lexer))
+            cores = {(n + 1, *span) for n, info in enumerate(lexer.lines) for span in info.spans}
+            with self.subTest(semente=semente):
+                self.assertEqual(cores, esperado)
+
+class RegiaoVisivelTest(unittest.TestCase):
+    # A IDE só colore as linhas visíveis: o léxico não passa delas
+    def setUp(self):
+        self.linhas = receita_aleatoria(3, comandos=200).split("\n")
+        self.lexer = IncrementalLexer()
+        self.lexer.update(list(self.linhas))
+
+    def test_update_nao_analisa(self):
+        self.assertEqual(self.lexer.lines, [None] * len(self.linhas))
+        self.lexer.info(9)
+        self.assertTrue(all(self.lexer.lines[:10]))
+        self.assertEqual(self.lexer.lines[10:], [None] * (len(self.linhas) - 10))
+
+    def test_edicao_reaproveita_as_outras_linhas(self):
+        self.lexer.ensure(len(self.linhas))
+        antes = list(self.lexer.lines)
+        self.linhas[100] += " # comentário"
+        self.assertEqual(self.lexer.update(list(self.linhas)), 100)
+        self.assertIsNone(self.lexer.lines[100])
+        self.lexer.ensure(len(self.linhas))
+        mudaram = [n for n, (a, b) in enumerate(zip(antes, self.lexer.lines)) if a is not b]
+        self.assertEqual(mudaram, [100])
+
+    def test_aspas_abertas_reanalisam_so_ate_a_parte_visivel(self):
+        # Uma String aberta muda o estado das linhas seguintes, mas só as
+        # pedidas são analisadas de novo
+        self.lexer.ensure(len(self.linhas))
+        self.linhas[20] += ' "'
+        self.lexer.update(list(self.linhas))
+        self.assertTrue(self.lexer.info(40).state_in)
+        self.assertFalse(self.lexer.lines[41].state_in)
+        self.lexer.ensure(len(self.linhas))
+        self.assertTrue(self.lexer.lines[41].state_in)
+
+if __name__ == "__main__":
+    unittest.main()
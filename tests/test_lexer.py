@@ -0,0 +1,103 @@
+import io
+import random
+import unittest
+
+from conftest import receita_aleatoria, entradas
+from lexer_churras import Lexer, LexerError
+from parser_churras import compile_churras
+import legacy_lexer
+from gerador_churras import CASOS, gerar
+
+# Trechos inseridos em posições aleatórias para provocar erros e casos de
+# borda (símbolo inválido, String sem fim, real sem dígitos, acentos...)
+PEDACOS = ("@", '"', "1.", ".5", "#", "\n", "\t", "\r", "é", "ç", "_", "x9", "99.01", '"a b"', "é1", "€", "  ")
+
+def _tokens(ler, erro_cls, codigo: str):
+    # Tokens (tipo, lexema, linha, coluna) de ler(codigo), ou a mensagem do
+    # primeiro erro
+    try:
+        return [(t.type, t.lexeme, t.line, t.col) for t in ler(codigo)]
+    except erro_cls as e:
+        return str(e)
+
+def _corpus():
+    for semente in range(300):
+        codigo = receita_aleatoria(semente)
+        yield codigo
+        rnd = random.Random(semente)
+        partes = list(codigo)
+        for _ in range(rnd.randint(1, 6)):
+            partes.insert(rnd.randrange(len(partes) + 1), rnd.choice(PEDACOS))
+        yield "".join(partes)
+    for caso in CASOS:
+        yield gerar(caso, 300)[0]
+
+class LexerOriginalTest(unittest.TestCase):
+    # O léxico por tabelas gera os mesmos tokens, nas mesmas posições, e o
+    # mesmo primeiro erro que o léxico original (benchmarks/legacy_lexer.py)
+    def test_corpus(self):
+        for n, codigo in enumerate(_corpus()):
+            with self.subTest(n=n):
+                self.assertEqual(_tokens(lambda c: Lexer(c).tokenize(), LexerError, codigo),
+                                 _tokens(lambda c: legacy_lexer.Lexer(c).tokenize(), legacy_lexer.LexerError, codigo))
+
+class LeituraEmBlocosTest(unittest.TestCase):
+    # Lendo o código em blocos de qualquer tamanho, o léxico entrega os
+    # mesmos tokens (e o mesmo primeiro erro) que com o código na memória
+    def test_tokens(self):
+        for n, codigo in enumerate(_corpus()):
+            esperado = _tokens(lambda c: Lexer(c).tokenize(), LexerError, codigo)
+            # Blocos de um caractere são lentos: só nos primeiros códigos
+            for tamanho in ((1, 7, 64) if n < 20 else (7, 64)):
+                with self.subTest(n=n, tamanho=tamanho):
+                    em_blocos = lambda c: Lexer(io.StringIO(c), chunk_size=tamanho).iter_tokens()
+                    self.assertEqual(_tokens(em_blocos, LexerError, codigo), esperado)
+
+    def test_compilacao(self):
+        # O programa compilado lendo do arquivo roda igual. Com erros, a
+        # leitura em fluxo pode apontar outro primeiro erro (ela não vê um
+        # erro léxico que está depois de um erro sintático)
+        for semente in range(300):
+            codigo = receita_aleatoria(semente)
+            with self.subTest(semente=semente):
+                em_memoria = compile_churras(codigo, input_provider=entradas(semente))
+                em_blocos = compile_churras(io.StringIO(codigo), input_provider=entradas(semente))
+                self.assertEqual(em_blocos["status"], em_memoria["status"])
+                if em_memoria["status"] == "success" or em_memoria["error_stage"] not in ("Léxico", "Sintático"):
+                    self.assertEqual((em_blocos["outputs"], em_blocos["error_message"]),
+                                     (em_memoria["outputs"], em_memoria["error_message"]))
+
+class ErrosLexicosTest(unittest.TestCase):
+    def test_posicao_de_cada_erro(self):
+        codigo = "SERVIR 1 @ 2;\n\n  SERVIR $;\nSERVIR 1.;\n" * 3
+        erros = []
+        Lexer(codigo, errors=erros).tokenize()
+        esperado = []
+        for bloco in range(3):
+            esperado += [(4 * bloco + 1, 10), (4 * bloco + 3, 10), (4 * bloco + 4, 8)]
+        self.assertEqual([(e.line, e.col) for e in erros], esperado)
+
+    def test_posicao_lendo_em_blocos(self):
+        codigo = "SERVIR 1;\n@\n  $ SERVIR 2;\n"
+        em_memoria, em_blocos = [], []
+        Lexer(codigo, errors=em_memoria).tokenize()
+        list(Lexer(io.StringIO(codigo), chunk_size=3, errors=em_blocos).iter_tokens())
+        self.assertEqual([(e.line, e.col) for e in em_blocos], [(2, 1), (3, 3)])
+        self.assertEqual([(e.line, e.col) for e in em_memoria], [(2, 1), (3, 3)])
+
+class DigitosUnicodeTest(unittest.TestCase):
+    # Só '0'-'9' formam números: os outros dígitos Unicode são símbolos
+    # inválidos (antes passavam pelo léxico e quebravam o parser)
+    def test_simbolo_invalido(self):
+        for ch in ("²", "٣", "①"):
+            with self.subTest(ch=ch):
+                with self.assertRaises(LexerError) as ctx:
+                    Lexer(f"SERVIR {ch};").tokenize()
+                self.assertEqual(str(ctx.exception), f"Símbolo inválido '{ch}' na linha 1, coluna 8")
+
+    def test_compilacao_da_erro_lexico(self):
+        result = compile_churras("INICIAR_CHURRAS DESPENSA COZINHAR SERVIR ²; FIM_CHURRAS")
+        self.assertEqual((result["status"], result["error_stage"]), ("error", "Léxico"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from conftest import programa
+from limits_churras import Limits
+from bytecode_churras import Program
+from parser_churras import compile_churras
+
+# Dez SERVIR de duas instruções (LOAD_CONST, SERVIR) e dois bytes cada
+SERVE_DEZ = programa(" ".join(f"SERVIR {i};" for i in range(10)))
+# p cresce a cada comando: 10, 100, 10000, ...
+QUADRADOS = programa("p = 10; " + "p = p * p; " * 12 + "SERVIR p;")
+
+class LimitesTest(unittest.TestCase):
+    def _limite(self, codigo, **kwargs):
+        result = compile_churras(codigo, limits=Limits(**kwargs))
+        self.assertEqual((result["status"], result["error_stage"]), ("error", "Limite"))
+        return result
+
+    def test_operacoes(self):
+        folgado = compile_churras(SERVE_DEZ, limits=Limits(max_ops=20))
+        self.assertEqual(folgado["status"], "success")
+        self.assertEqual((folgado["usage"]["ops"], folgado["usage"]["output_bytes"]), (20, 20))
+        result = self._limite(SERVE_DEZ, max_ops=7)
+        self.assertEqual(result["error_message"], "Limite de operações excedido (7 instruções).")
+        self.assertEqual((result["outputs"], result["usage"]["ops"]), (["0", "1", "2"], 7))
+        # O erro aponta para o comando em que a execução parou
+        self.assertEqual(result["error_token"].lexeme, "SERVIR")
+
+    def test_saida(self):
+        for backend in ("vm", "python"):
+            with self.subTest(backend=backend):
+                result = compile_churras(SERVE_DEZ, backend=backend, limits=Limits(max_output_bytes=9))
+                self.assertEqual(result["error_message"], "Limite de saída excedido (9 bytes).")
+                self.assertEqual(result["outputs"], ["0", "1", "2", "3"])
+                self.assertEqual(result["usage"]["output_bytes"], 10)
+
+    def test_memoria(self):
+        result = self._limite(QUADRADOS, max_memory=1000)
+        self.assertEqual(result["error_message"], "Limite de memória excedido (1000 bytes).")
+        self.assertGreater(result["usage"]["peak_memory"], 1000)
+        self.assertEqual(compile_churras(QUADRADOS, limits=Limits(max_memory=10 ** 6))["status"], "success")
+
+    def test_tempo(self):
+        result = self._limite(SERVE_DEZ, max_time=0)
+        self.assertEqual(result["error_message"], "Limite de tempo excedido (0 s).")
+        self.assertEqual(result["outputs"], [])
+
+    def test_operacoes_e_memoria_usam_a_vm(self):
+        result = compile_churras(SERVE_DEZ, backend="python", limits=Limits(max_ops=100))
+        self.assertIsInstance(result["program"], Program)
+        self.assertEqual(result["usage"]["ops"], 20)
+
+    def test_tightened(self):
+        servidor = Limits(max_ops=100, max_time=2.0)
+        pedido = Limits(max_ops=500, max_output_bytes=10, max_time=1.0)
+        self.assertEqual(servidor.tightened(pedido), Limits(100, 10, 1.0, None))
+        self.assertEqual(servidor.tightened(None), servidor)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import io
+import unittest
+
+from conftest import programa
+from parser_churras import compile_churras
+from rows_churras import iter_rows, run_rows, row_input
+
+RECEITA = programa("PROVAR p; PROVAR x; x = x * p; SERVIR x; SERVIR p;")
+LINHAS = [["2", "1.5"], ["3"], [], ["x", "1"], ["4", "0.25"]]
+
+def _resumo(result):
+    return (result["status"], result["outputs"], result["error_message"])
+
+class EntradaEmLoteTest(unittest.TestCase):
+    # Cada linha roda como uma execução separada com as mesmas respostas
+    def test_igual_a_compilar_por_linha(self):
+        for backend in ("vm", "python"):
+            with self.subTest(backend=backend):
+                results = list(run_rows(RECEITA, LINHAS, backend=backend))
+                self.assertEqual([r["row"] for r in results], [1, 2, 3, 4, 5])
+                esperado = [_resumo(compile_churras(RECEITA, input_provider=row_input(linha), backend=backend))
+                            for linha in LINHAS]
+                self.assertEqual([_resumo(r) for r in results], esperado)
+                # Uma linha com erro não interrompe as seguintes
+                self.assertEqual([r["status"] for r in results], ["success"] * 3 + ["error", "success"])
+
+    def test_formatos(self):
+        csv_sem_cabecalho = list(iter_rows(io.StringIO("2,1.5\n3\n"), "csv"))
+        csv_com_cabecalho = list(iter_rows(io.StringIO("x,p\n1.5,2\n,3\n"), "csv", header=True))
+        jsonl = list(iter_rows(io.StringIO('{"p": 2, "x": 1.5}\n\n{"p": 3, "x": null}\n'), "jsonl"))
+        esperado = [["3.0", "2"], ["0.0", "3"]]
+        for linhas in (csv_sem_cabecalho, jsonl):
+            self.assertEqual([r["outputs"] for r in run_rows(RECEITA, linhas)], esperado)
+        # No CSV, um campo vazio é uma resposta vazia (inválida para ARROZ)
+        results = list(run_rows(RECEITA, csv_com_cabecalho))
+        self.assertEqual(results[0]["outputs"], esperado[0])
+        self.assertEqual(results[1]["status"], "error")
+
+if __name__ == "__main__":
+    unittest.main()
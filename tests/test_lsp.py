@@ -0,0 +1,150 @@
+import io
+import json
+import random
+import unittest
+from unittest import mock
+
+from conftest import receita_aleatoria
+import lsp_churras
+from lsp_churras import LanguageServer, TOKEN_KINDS
+from parser_churras import check_churras
+
+RECEITA = "INICIAR_CHURRAS DESPENSA x : ARROZ; COZINHAR x = 1.5; SERVIR y; FIM_CHURRAS"
+
+def _abre(server: LanguageServer, uri: str, text: str):
+    server.handle({"jsonrpc": "2.0", "method": "textDocument/didOpen",
+                   "params": {"textDocument": {"uri": uri, "text": text, "version": 1}}})
+
+class PublishTest(unittest.TestCase):
+    def test_falha_na_analise_vira_diagnostico(self):
+        # Um documento que derruba a análise não derruba o servidor nem
+        # impede os diagnósticos dos outros
+        enviados = []
+        server = LanguageServer(enviados.append)
+        _abre(server, "file:///a.churras", "quebra")
+        _abre(server, "file:///b.churras", RECEITA)
+        analyze = lsp_churras.analyze
+
+        def falha(text):
+            if text == "quebra":
+                raise ValueError("quebrou")
+            return analyze(text)
+
+        with mock.patch.object(lsp_churras, "analyze", side_effect=falha):
+            server.publish()
+        a, b = (m["params"] for m in enviados)
+        self.assertEqual([(d["code"], d["message"]) for d in a["diagnostics"]], [("Interno", "ValueError: quebrou")])
+        self.assertEqual([d["code"] for d in b["diagnostics"]], ["Semântico"])
+        self.assertFalse(server.dirty)
+
+def _posicao(texto: str, offset: int) -> dict:
+    # Posição do LSP (coluna em unidades UTF-16)
+    antes = texto[:offset]
+    inicio = antes.rfind("\n") + 1
+    return {"line": antes.count("\n"), "character": len(antes[inicio:].encode("utf-16-le")) // 2}
+
+def _edita(server: LanguageServer, uri: str, texto: str, rnd: random.Random, versao: int) -> str:
+    # Troca um trecho aleatório do texto por outro, como um editor mandaria
+    inicio = rnd.randint(0, len(texto))
+    fim = min(len(texto), inicio + rnd.randint(0, 8))
+    novo = rnd.choice(["", "x", " = 1;", "\n", '"🍖', "# 🔥\n", "SERVIR x;", "@", "ARROZ"])
+    server.handle({"jsonrpc": "2.0", "method": "textDocument/didChange", "params": {
+        "textDocument": {"uri": uri, "version": versao},
+        "contentChanges": [{"range": {"start": _posicao(texto, inicio), "end": _posicao(texto, fim)}, "text": novo}]}})
+    return texto[:inicio] + novo + texto[fim:]
+
+def _pedido(server: LanguageServer, enviados: list, method: str, params: dict):
+    server.handle({"jsonrpc": "2.0", "id": len(enviados), "method": method, "params": params})
+    return enviados[-1]["result"]
+
+class SincronizacaoTest(unittest.TestCase):
+    def test_edicoes_incrementais(self):
+        # Depois de cada edição, o texto, os diagnósticos e os tokens
+        # semânticos (aplicando as edições do delta) são os do texto inteiro
+        uri = "file:///r.churras"
+        for semente in range(10):
+            rnd = random.Random(semente)
+            texto = receita_aleatoria(semente, comandos=15)
+            enviados = []
+            server = LanguageServer(enviados.append)
+            _abre(server, uri, texto)
+            dados = _pedido(server, enviados, "textDocument/semanticTokens/full", {"textDocument": {"uri": uri}})
+            for versao in range(2, 30):
+                texto = _edita(server, uri, texto, rnd, versao)
+                with self.subTest(semente=semente, versao=versao):
+                    self.assertEqual(server.documents[uri].text, texto)
+                    delta = _pedido(server, enviados, "textDocument/semanticTokens/full/delta",
+                                    {"textDocument": {"uri": uri}, "previousResultId": dados["resultId"]})
+                    data = list(dados["data"])
+                    for edit in delta["edits"]:
+                        data[edit["start"]:edit["start"] + edit["deleteCount"]] = edit["data"]
+                    do_zero = LanguageServer(lambda m: None)
+                    _abre(do_zero, uri, texto)
+                    self.assertEqual(data, lsp_churras.semantic_tokens(do_zero.documents[uri]))
+                    dados = {"resultId": delta["resultId"], "data": data}
+            server.publish()
+            publicados = enviados[-1]["params"]
+            erros = check_churras(texto)["errors"]
+            self.assertEqual(publicados["version"], 29)
+            self.assertEqual([(d["code"], d["message"]) for d in publicados["diagnostics"]],
+                             [(e["stage"], e["message"]) for e in erros])
+
+class DiagnosticosTest(unittest.TestCase):
+    def test_posicoes_utf16(self):
+        # A coluna conta o emoji da String como duas unidades
+        texto = "INICIAR_CHURRAS DESPENSA x : ARROZ; COZINHAR # 🍖\n  SERVIR \"🔥\" + y; FIM_CHURRAS"
+        enviados = []
+        server = LanguageServer(enviados.append)
+        _abre(server, "file:///u.churras", texto)
+        server.publish()
+        diagnostico, = enviados[-1]["params"]["diagnostics"]
+        self.assertEqual(diagnostico["message"], "Erro Semântico: Variável 'y' não declarada.")
+        self.assertEqual(diagnostico["range"], {"start": {"line": 1, "character": 16},
+                                                "end": {"line": 1, "character": 17}})
+        tokens = lsp_churras.semantic_tokens(server.documents["file:///u.churras"])
+        # A String "🔥" ocupa quatro unidades UTF-16
+        strings = [tokens[i + 2] for i in range(0, len(tokens), 5) if TOKEN_KINDS[tokens[i + 3]] == "string"]
+        self.assertEqual(strings, [4])
+
+class NavegacaoTest(unittest.TestCase):
+    def setUp(self):
+        self.enviados = []
+        self.server = LanguageServer(self.enviados.append)
+        _abre(self.server, "file:///n.churras", "INICIAR_CHURRAS\nDESPENSA\n    total : PICANHA;\nCOZINHAR\n    SERVIR total;\nFIM_CHURRAS")
+
+    def _em(self, method, line, character):
+        return _pedido(self.server, self.enviados, method,
+                       {"textDocument": {"uri": "file:///n.churras"}, "position": {"line": line, "character": character}})
+
+    def test_hover(self):
+        hover = self._em("textDocument/hover", 4, 13)
+        self.assertIn("total : PICANHA;", hover["contents"]["value"])
+        self.assertEqual(hover["range"], {"start": {"line": 4, "character": 11}, "end": {"line": 4, "character": 16}})
+        self.assertIsNone(self._em("textDocument/hover", 4, 5))
+
+    def test_declaracao(self):
+        local = self._em("textDocument/definition", 4, 11)
+        self.assertEqual(local["range"], {"start": {"line": 2, "character": 4}, "end": {"line": 2, "character": 9}})
+
+class ServeTest(unittest.TestCase):
+    def test_sessao_pela_entrada_padrao(self):
+        mensagens = [
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+            {"jsonrpc": "2.0", "method": "textDocument/didOpen",
+             "params": {"textDocument": {"uri": "file:///s.churras", "text": RECEITA, "version": 1}}},
+            {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+            {"jsonrpc": "2.0", "method": "exit"},
+        ]
+        entrada = b"".join(b"Content-Length: %d\r\n\r\n%s" % (len(corpo), corpo)
+                           for corpo in (json.dumps(m).encode("utf-8") for m in mensagens))
+        saida = io.BytesIO()
+        self.assertEqual(lsp_churras.serve(io.BytesIO(entrada), saida), 0)
+        leitor = io.BytesIO(saida.getvalue())
+        respostas = []
+        while (corpo := lsp_churras.read_message(leitor)) is not None:
+            respostas.append(json.loads(corpo))
+        self.assertEqual([r.get("id") for r in respostas if "id" in r], [1, 2])
+        self.assertEqual(respostas[0]["result"]["capabilities"]["textDocumentSync"]["change"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from conftest import ENORME, programa, receita_aleatoria, entradas
+from lexer_churras import Lexer
+from parser_churras import Parser, check_churras, compile_churras
+from optimizer_churras import optimize
+from ast_churras import OpBinaria
+
+class DobraComEstouroTest(unittest.TestCase):
+    # Uma operação constante que estoura o real não é dobrada: o erro fica
+    # para a execução, como na divisão por zero constante
+    def test_check_nao_quebra(self):
+        for expr in (f"{ENORME} * 1.0", f"{ENORME} / 1", f"{ENORME} + 0.5"):
+            with self.subTest(expr=expr):
+                result = check_churras(programa(f"x = {expr}; SERVIR x;"))
+                self.assertEqual(result["status"], "success")
+
+    def test_operacao_fica_sem_dobrar(self):
+        otimizado, report = optimize(Parser(Lexer(programa(f"x = {ENORME} * 1.0; SERVIR x;")).tokenize()).parse())
+        self.assertIsInstance(otimizado.comandos[0].expr, OpBinaria)
+        self.assertFalse(report.folded)
+        self.assertFalse(report.removed_stores)
+
+    def test_dobra_normal(self):
+        otimizado, report = optimize(Parser(Lexer(programa("x = 2 * 1.5; SERVIR x;")).tokenize()).parse())
+        self.assertEqual(otimizado.comandos[0].expr.valor, 3.0)
+        self.assertEqual(len(report.folded), 1)
+
+def _otimiza(codigo: str):
+    return optimize(Parser(Lexer(codigo).tokenize()).parse())
+
+class OtimizadorTest(unittest.TestCase):
+    def test_mesmo_resultado_sem_otimizar(self):
+        # O otimizador nunca muda a saída nem o erro (nem a posição dele)
+        chaves = ("status", "outputs", "error_stage", "error_message", "error_line", "error_col")
+        for semente in range(200):
+            codigo = receita_aleatoria(semente)
+            for backend in ("vm", "python"):
+                with self.subTest(semente=semente, backend=backend):
+                    resultados = [compile_churras(codigo, input_provider=entradas(semente), optimize=otimizar,
+                                                  backend=backend) for otimizar in (False, True)]
+                    self.assertEqual(*[[r[k] for k in chaves] for r in resultados])
+
+    def test_relatorio(self):
+        codigo = programa("x = 1; p = 2 * 3 + 1; x = p / 2; SERVIR x;", ("x : ARROZ", "p : PICANHA", "n : ARROZ"))
+        otimizado, report = _otimiza(codigo)
+        self.assertEqual(report.folded, [(7, 7)])
+        self.assertEqual(report.removed_stores, [(7, "x")])
+        self.assertEqual(report.removed_declarations, [(5, "n")])
+        self.assertEqual([d.nome for d in otimizado.declaracoes], ["x", "p"])
+        self.assertEqual(report.summary(), {"folded": 1, "removed_stores": 1, "removed_declarations": 1})
+
+    def test_divisao_por_zero_constante_fica(self):
+        otimizado, report = _otimiza(programa("x = 1 / 0; SERVIR 1;"))
+        self.assertIsInstance(otimizado.comandos[0].expr, OpBinaria)
+        self.assertFalse(report.removed_stores)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import random
+import unittest
+
+from conftest import programa
+from legacy_interpreter import interpret
+from ast_churras import Numero, OpBinaria, Variavel
+from lexer_churras import Lexer
+from parser_churras import Parser, compile_churras
+
+def _expr(codigo: str):
+    return Parser(Lexer(programa(f"SERVIR {codigo};")).tokenize()).parse().comandos[0].expr
+
+def _forma(node):
+    # A árvore como tuplas aninhadas, sem os tokens
+    if isinstance(node, OpBinaria):
+        return (node.op, _forma(node.esq), _forma(node.dir))
+    if isinstance(node, Variavel):
+        return node.nome
+    return node.valor
+
+def _expressao_aleatoria(rnd: random.Random, nivel: int = 0) -> str:
+    c = rnd.random()
+    if nivel > 5 or c < 0.25:
+        k = rnd.random()
+        if k < 0.5: return str(rnd.randint(0, 9))
+        if k < 0.7: return f"{rnd.randint(0, 9)}.{rnd.randint(0, 9)}"
+        return rnd.choice("xp")
+    if c < 0.4:
+        return f"({_expressao_aleatoria(rnd, nivel + 1)})"
+    op = rnd.choice("+-*/")
+    # Divisor constante e diferente de zero: o erro de execução não entra na comparação
+    dir = str(rnd.randint(1, 9)) if op == "/" else _expressao_aleatoria(rnd, nivel + 1)
+    return f"{_expressao_aleatoria(rnd, nivel + 1)} {op} {dir}"
+
+class PrecedenciaTest(unittest.TestCase):
+    def test_forma_da_arvore(self):
+        casos = {
+            "1 + 2 * 3": ('+', 1, ('*', 2, 3)),
+            "1 * 2 + 3": ('+', ('*', 1, 2), 3),
+            "1 - 2 - 3": ('-', ('-', 1, 2), 3),
+            "8 / 4 / 2": ('/', ('/', 8, 4), 2),
+            "1 - 2 + 3 * x / 4": ('+', ('-', 1, 2), ('/', ('*', 3, 'x'), 4)),
+            "(1 + 2) * (x - 3.5)": ('*', ('+', 1, 2), ('-', 'x', 3.5)),
+            "((x))": 'x',
+            "1 - (2 - 3)": ('-', 1, ('-', 2, 3)),
+        }
+        for codigo, esperado in casos.items():
+            with self.subTest(codigo=codigo):
+                self.assertEqual(_forma(_expr(codigo)), esperado)
+
+    def test_token_do_operador(self):
+        expr = _expr("x + 2 * 3")
+        self.assertEqual((expr.token.lexeme, expr.dir.token.lexeme), ("+", "*"))
+        self.assertIsInstance(expr.dir.dir, Numero)
+
+    def test_aninhamento_profundo(self):
+        # Sem recursão no parser, o aninhamento não esbarra no limite da pilha
+        n = 100_000
+        result = compile_churras(programa("SERVIR " + "(" * n + "2 + 1" + ")" * n + ";"))
+        self.assertEqual((result["status"], result["outputs"]), ("success", ["3"]))
+        expr = _expr("1" + " - 1" * n)
+        for _ in range(n):
+            self.assertEqual(expr.dir.valor, 1)
+            expr = expr.esq
+        self.assertEqual(expr.valor, 1)
+
+class InterpretadorOriginalTest(unittest.TestCase):
+    # O valor das expressões e os erros de sintaxe são os do parser
+    # recursivo original
+    def _compara(self, codigo):
+        result = compile_churras(codigo, input_provider=lambda ident, tipo: None)
+        original = interpret(codigo, lambda ident, tipo: None)
+        saida = result["outputs"] if result["status"] == "success" else None
+        self.assertEqual((result["status"], saida, result["error_stage"], result["error_message"],
+                          result["error_line"], result["error_col"]),
+                         (original["status"], original["outputs"] if original["status"] == "success" else None,
+                          original["error_stage"], original["error_message"],
+                          original["error_line"], original["error_col"]))
+
+    def test_expressoes_aleatorias(self):
+        rnd = random.Random(18)
+        for _ in range(300):
+            expr = _expressao_aleatoria(rnd)
+            with self.subTest(expr=expr):
+                self._compara(programa(f"x = 3; p = 0.5; SERVIR {expr};"))
+
+    def test_expressoes_malformadas(self):
+        # Cada expressão perde um token ou ganha um a mais
+        rnd = random.Random(19)
+        for _ in range(300):
+            partes = _expressao_aleatoria(rnd).replace("(", "( ").replace(")", " )").split()
+            i = rnd.randrange(len(partes) + 1)
+            if partes and rnd.random() < 0.5:
+                del partes[min(i, len(partes) - 1)]
+            else:
+                partes.insert(i, rnd.choice(["(", ")", "+", "*", "1", "x", ";"]))
+            expr = " ".join(partes)
+            with self.subTest(expr=expr):
+                self._compara(programa(f"x = 3; SERVIR {expr};"))
+
+if __name__ == "__main__":
+    unittest.main()
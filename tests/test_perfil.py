@@ -0,0 +1,59 @@
+import io
+import time
+import unittest
+
+from conftest import receita_aleatoria, entradas
+from parser_churras import compile_churras
+from profile_churras import Profiler
+
+RECEITA = """INICIAR_CHURRAS
+DESPENSA
+    x : ARROZ;
+COZINHAR
+    PROVAR x;
+    x = x * 2;
+    SERVIR x;
+    SERVIR x + 1; SERVIR x + 2;
+FIM_CHURRAS
+"""
+
+class PerfiladorTest(unittest.TestCase):
+    def test_nao_muda_o_resultado(self):
+        chaves = ("status", "outputs", "error_message", "error_line", "error_col")
+        for semente in range(60):
+            codigo = receita_aleatoria(semente)
+            for backend in ("vm", "python"):
+                with self.subTest(semente=semente, backend=backend):
+                    com, sem = (compile_churras(codigo, input_provider=entradas(semente), backend=backend,
+                                                profile=perfil) for perfil in (True, False))
+                    self.assertEqual([com[k] for k in chaves], [sem[k] for k in chaves])
+                    self.assertIsNone(sem["profile"])
+
+    def test_contagens_por_linha(self):
+        for backend in ("vm", "python"):
+            with self.subTest(backend=backend):
+                result = compile_churras(RECEITA, input_provider=lambda ident, tipo: "1.5", backend=backend,
+                                         profile=True)
+                profile = result["profile"]
+                self.assertEqual({linha: stats.count for linha, stats in profile.lines.items()},
+                                 {5: 1, 6: 1, 7: 1, 8: 2})
+                self.assertEqual(set(profile.phases), {"léxico", "sintático", "compilação", "execução"})
+                self.assertEqual(profile.tokens, len(result["tokens"]))
+
+    def test_leitura_em_fluxo_conta_os_mesmos_tokens(self):
+        em_memoria = compile_churras(RECEITA, input_provider=lambda ident, tipo: None, profile=True)["profile"]
+        em_fluxo = compile_churras(io.StringIO(RECEITA), input_provider=lambda ident, tipo: None, profile=True)["profile"]
+        self.assertEqual(em_fluxo.tokens, em_memoria.tokens)
+
+    def test_fases_aninhadas(self):
+        # O tempo de uma fase interna não conta para a de fora
+        profiler = Profiler()
+        with profiler.phase("execução"):
+            with profiler.phase("léxico"):
+                time.sleep(0.05)
+        self.assertGreaterEqual(profiler.phases["léxico"], 0.05)
+        self.assertLess(profiler.phases["execução"], 0.05)
+        self.assertTrue(profiler.lines_report()[0].startswith("Tokens:"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+
+from conftest import receita_aleatoria
+from legacy_interpreter import interpret
+from parser_churras import check_churras, compile_program
+
+def _erros(codigo: str):
+    return [(e["stage"], e["message"], e["line"], e["col"]) for e in check_churras(codigo)["errors"]]
+
+class RecuperacaoTest(unittest.TestCase):
+    def test_declaracao_sem_ponto_e_virgula(self):
+        # A declaração seguinte não é descartada: `b` continua declarada
+        codigo = """INICIAR_CHURRAS
+DESPENSA
+    a: PICANHA
+    b: ARROZ;
+COZINHAR
+    b = 1.5;
+    SERVIR b;
+FIM_CHURRAS
+"""
+        self.assertEqual(_erros(codigo), [("Sintático", "Esperado [PONTO_VIRGULA], mas veio ID", 4, 5)])
+
+    def test_comando_depois_de_expressao_incompleta(self):
+        codigo = """INICIAR_CHURRAS
+DESPENSA
+    a: PICANHA;
+COZINHAR
+    a = 1 +
+    SERVIR a;
+    a = 2 a = 3;
+FIM_CHURRAS
+"""
+        self.assertEqual(_erros(codigo), [("Sintático", "Expressão inválida", 6, 5),
+                                          ("Sintático", "Esperado [PONTO_VIRGULA], mas veio ID", 7, 11)])
+
+    def test_fim_do_arquivo_na_expressao(self):
+        # Um único erro no fim do arquivo, não um por etapa que esperava algo
+        erros = _erros("INICIAR_CHURRAS\nCOZINHAR\n    SERVIR (1 +")
+        self.assertEqual(erros, [("Sintático", "Expressão inválida", 3, 16)])
+
+def _estraga(codigo: str, semente: int) -> str:
+    # Apaga, duplica ou troca alguns trechos da receita
+    rnd = random.Random(semente)
+    partes = codigo.split(" ")
+    for _ in range(rnd.randint(1, 3)):
+        i = rnd.randrange(len(partes))
+        k = rnd.random()
+        if k < 0.4: del partes[i]
+        elif k < 0.7: partes.insert(i, partes[i])
+        else: partes[i] = rnd.choice(["@", "1.", '"sem fim', ";", "(", "COZINHAR", "x"])
+    return " ".join(partes)
+
+class PrimeiroErroTest(unittest.TestCase):
+    # Com a recuperação, o primeiro erro da lista continua sendo o erro que
+    # a compilação sem recuperação lança (e o do interpretador original)
+    def test_receitas_estragadas(self):
+        for semente in range(300):
+            codigo = _estraga(receita_aleatoria(semente, textos=False), semente)
+            with self.subTest(semente=semente):
+                result = check_churras(codigo)
+                try:
+                    compile_program(codigo)
+                except Exception as e:
+                    primeiro = str(e)
+                else:
+                    primeiro = None
+                if result["status"] == "success":
+                    self.assertIsNone(primeiro)
+                    self.assertEqual(result["errors"], [])
+                    continue
+                self.assertEqual(result["error_message"], primeiro)
+                self.assertEqual(result["errors"][0]["message"], primeiro)
+                self.assertEqual((result["errors"][0]["line"], result["errors"][0]["col"]),
+                                 (result["error_line"], result["error_col"]))
+                original = interpret(codigo, lambda ident, tipo: None)
+                if original["error_stage"] in ("Léxico", "Sintático"):
+                    # O original executa enquanto analisa: só os erros
+                    # anteriores a qualquer execução são comparáveis. Ele
+                    # não dava linha e coluna aos erros léxicos (só na mensagem)
+                    self.assertEqual((result["error_stage"], result["error_message"]),
+                                     (original["error_stage"], original["error_message"]))
+                    if original["error_stage"] == "Sintático":
+                        self.assertEqual((result["error_line"], result["error_col"]),
+                                         (original["error_line"], original["error_col"]))
+
+if __name__ == "__main__":
+    unittest.main()
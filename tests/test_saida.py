@@ -0,0 +1,58 @@
+import io
+import queue
+import unittest
+
+from conftest import receita_aleatoria, entradas
+from output_churras import CallbackSink, make_sink
+from parser_churras import compile_churras
+
+RECEITAS = 60
+
+class DestinoDaSaidaTest(unittest.TestCase):
+    # Qualquer destino recebe as mesmas linhas, na mesma ordem, que ficariam
+    # em result["outputs"]. Com erro, o destino fica com a saída servida até
+    # ali (result["outputs"] fica vazio, como no original)
+    def test_destinos(self):
+        for semente in range(RECEITAS):
+            codigo = receita_aleatoria(semente)
+            for backend in ("vm", "python"):
+                esperado = compile_churras(codigo, input_provider=entradas(semente), backend=backend)
+                blocos, arquivo, fila = [], io.StringIO(), queue.Queue()
+                destinos = {
+                    "função": (blocos.extend, lambda: blocos),
+                    "arquivo": (arquivo, lambda: arquivo.getvalue().splitlines()),
+                    "fila": (fila, lambda: _esvazia(fila)),
+                }
+                recebido = {}
+                for nome, (destino, linhas) in destinos.items():
+                    result = compile_churras(codigo, input_provider=entradas(semente), backend=backend,
+                                             output=destino)
+                    recebido[nome] = linhas()
+                    with self.subTest(semente=semente, backend=backend, destino=nome):
+                        self.assertEqual((result["status"], result["error_message"], result["outputs"]),
+                                         (esperado["status"], esperado["error_message"], []))
+                        self.assertEqual(result["output_lines"], len(recebido[nome]))
+                        self.assertEqual(result["output_lines"], esperado["output_lines"])
+                        if esperado["status"] == "success":
+                            self.assertEqual(recebido[nome], esperado["outputs"])
+                self.assertEqual(recebido["arquivo"], recebido["função"])
+                self.assertEqual(recebido["fila"], recebido["função"])
+
+    def test_blocos(self):
+        blocos = []
+        sink = CallbackSink(blocos.append, buffer_lines=3, flush_interval=None)
+        compile_churras("INICIAR_CHURRAS COZINHAR " + "SERVIR 1; " * 7 + "FIM_CHURRAS", output=sink)
+        self.assertEqual([len(bloco) for bloco in blocos], [3, 3, 1])
+
+    def test_destino_invalido(self):
+        with self.assertRaises(TypeError):
+            make_sink(42)
+
+def _esvazia(fila: queue.Queue):
+    linhas = []
+    while not fila.empty():
+        linhas.extend(fila.get_nowait())
+    return linhas
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import pickle
+import unittest
+
+from conftest import receita_aleatoria
+from lexer_churras import Lexer
+from tokens_churras import Token, TokenStream, TokenTable, format_token_row
+from parser_churras import compile_churras
+import legacy_lexer
+
+class TokenStreamTest(unittest.TestCase):
+    # Os tokens compactos (visões de um TokenStream) valem o mesmo que os
+    # tokens independentes do léxico original
+    def test_visoes_iguais_aos_tokens(self):
+        for semente in range(50):
+            codigo = receita_aleatoria(semente)
+            with self.subTest(semente=semente):
+                stream = Lexer(codigo).tokenize()
+                self.assertIsInstance(stream, TokenStream)
+                self.assertEqual(list(stream), legacy_lexer.Lexer(codigo).tokenize())
+
+    def test_indices_e_fatias(self):
+        stream = Lexer(receita_aleatoria(3)).tokenize()
+        tokens = list(stream)
+        self.assertEqual(stream[-1], tokens[-1])
+        self.assertEqual(stream[2:9:3], tokens[2:9:3])
+        self.assertEqual(len(stream), len(tokens))
+
+    def test_sem_dict(self):
+        token = Lexer("SERVIR 1;").tokenize()[0]
+        self.assertFalse(hasattr(token, "__dict__"))
+        self.assertFalse(hasattr(Token(token.type, "SERVIR", 1, 1), "__dict__"))
+
+    def test_pickle(self):
+        # O cache em disco guarda o TokenStream serializado
+        stream = Lexer(receita_aleatoria(5)).tokenize()
+        self.assertEqual(list(pickle.loads(pickle.dumps(stream))), list(stream))
+
+def _tabela_original(codigo: str):
+    # A tabela que o compile_churras original devolvia: uma String por token, sem o EOF
+    return [f"{t.type.name:<20} | {t.lexeme:<25} | L: {t.line}, C: {t.col}"
+            for t in legacy_lexer.Lexer(codigo).tokenize() if t.type.name != "EOF"]
+
+class TokenTableTest(unittest.TestCase):
+    def test_linhas_iguais_as_originais(self):
+        for semente in range(50):
+            codigo = receita_aleatoria(semente)
+            with self.subTest(semente=semente):
+                tabela = compile_churras(codigo, input_provider=lambda ident, tipo: None)["tokens"]
+                self.assertEqual([format_token_row(linha) for linha in tabela], _tabela_original(codigo))
+
+    def test_paginas(self):
+        tabela = TokenTable(Lexer(receita_aleatoria(7)).tokenize())
+        linhas = list(tabela)
+        self.assertEqual(tabela.page_count(10), (len(linhas) + 9) // 10)
+        paginas = [tabela.page(n, 10) for n in range(tabela.page_count(10))]
+        self.assertEqual(sum(paginas, []), linhas)
+        self.assertEqual(tabela.page(tabela.page_count(10), 10), [])
+        self.assertEqual(tabela[-1], linhas[-1])
+        with self.assertRaises(IndexError):
+            tabela[len(linhas)]
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+from conftest import programa
+from legacy_interpreter import interpret
+from parser_churras import check_churras, compile_churras, compile_program
+from bytecode_churras import TO_INT, TO_REAL, LOAD_NAME, STORE_NAME, PROVAR
+
+def _opcodes(comandos: str):
+    program = compile_program(programa(comandos), optimize=False)
+    return program.code[::2]
+
+class VerificacaoAntesDeExecutarTest(unittest.TestCase):
+    # Erros de tipo e variáveis não declaradas são achados antes da
+    # execução: nenhum PROVAR é pedido e nada é servido
+    def test_erro_antes_do_provar(self):
+        pedidos = []
+        result = compile_churras(programa('PROVAR x; SERVIR x; y = 1;'),
+                                 input_provider=lambda ident, tipo: pedidos.append(ident))
+        self.assertEqual((result["status"], result["error_stage"]), ("error", "Semântico"))
+        self.assertEqual(result["error_message"], "Erro Semântico: Variável 'y' não declarada.")
+        self.assertEqual((pedidos, result["outputs"]), ([], []))
+
+    def test_mensagens(self):
+        casos = {
+            'x = "a";': "Erro Semântico: Não é possível atribuir String a uma variável numérica.",
+            'SERVIR "a" * "b";': "Erro Semântico: Operação '*' inválida entre Strings.",
+            'SERVIR "a" + 1;': "Erro Semântico: Operação inválida entre String e número.",
+            'SERVIR 1 - "a";': "Erro Semântico: Operação inválida entre String e número.",
+            'PROVAR z;': "Erro Semântico: Variável 'z' não declarada.",
+        }
+        for comandos, mensagem in casos.items():
+            with self.subTest(comandos=comandos):
+                result = check_churras(programa(comandos))
+                self.assertEqual((result["error_stage"], result["error_message"]), ("Semântico", mensagem))
+
+    def test_concatenacao(self):
+        result = compile_churras(programa('SERVIR "a" + "b" + "c";'))
+        self.assertEqual(result["outputs"], ["abc"])
+
+class ConversaoExplicitaTest(unittest.TestCase):
+    # A conversão int/real de uma atribuição só é emitida quando os tipos
+    # diferem (constantes já entram convertidas)
+    def test_conversoes(self):
+        self.assertNotIn(TO_INT, _opcodes("p = p * 2;"))
+        self.assertNotIn(TO_REAL, _opcodes("x = x * 2.0;"))
+        self.assertIn(TO_INT, _opcodes("p = x;"))
+        self.assertIn(TO_REAL, _opcodes("x = p;"))
+        self.assertEqual(set(_opcodes("p = 2.9; x = 3;")) & {TO_INT, TO_REAL}, set())
+
+    def test_valores_convertidos(self):
+        result = compile_churras(programa("p = 2.9; x = 3; SERVIR p; SERVIR x; x = p / 2; p = x * 3; SERVIR p;"),
+                                 optimize=False)
+        self.assertEqual(result["outputs"], ["2", "3.0", "3"])
+
+class SlotsTest(unittest.TestCase):
+    # Cada variável tem um slot fixo, na ordem da DESPENSA; redeclarar
+    # mantém o slot e vale o último tipo
+    DECLARACOES = ("b : ARROZ", "a : PICANHA", "c : ARROZ", "b : PICANHA")
+
+    def test_ordem_e_valor_inicial(self):
+        program = compile_program(programa("SERVIR a;", self.DECLARACOES), optimize=False)
+        self.assertEqual(program.names, ("b", "a", "c"))
+        self.assertEqual(program.initial, (0, 0, 0.0))
+        self.assertEqual([type(v) for v in program.initial], [int, int, float])
+
+    def test_argumentos_das_instrucoes(self):
+        program = compile_program(programa("PROVAR c; b = a + c; a = b; SERVIR c;", self.DECLARACOES),
+                                  optimize=False)
+        acessos = [(op, program.names[arg]) for op, arg in zip(program.code[::2], program.code[1::2])
+                   if op in (LOAD_NAME, STORE_NAME, PROVAR)]
+        self.assertEqual(acessos, [(PROVAR, "c"), (LOAD_NAME, "a"), (LOAD_NAME, "c"), (STORE_NAME, "b"),
+                                   (LOAD_NAME, "b"), (STORE_NAME, "a"), (LOAD_NAME, "c")])
+
+    def test_como_o_original(self):
+        codigo = programa("PROVAR c; b = c * 3; a = b / 2; SERVIR a; SERVIR b; SERVIR c;", self.DECLARACOES)
+        original = interpret(codigo, lambda ident, tipo: "2.5")
+        for backend in ("vm", "python"):
+            with self.subTest(backend=backend):
+                result = compile_churras(codigo, input_provider=lambda ident, tipo: "2.5", backend=backend)
+                self.assertEqual(result["outputs"], original["outputs"])
+                self.assertEqual(result["outputs"], ["3", "7", "2.5"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from conftest import programa
+import vector_churras
+from vector_churras import columns_from_rows, run_vectorized
+from rows_churras import run_rows
+
+RECEITA = programa("PROVAR p; PROVAR x; x = x / p + 1; SERVIR x; p = p * p * 3; SERVIR p; SERVIR x * p - 2;")
+
+def _linhas(semente: int, n: int):
+    # Respostas válidas, inválidas, faltando, divisores zero e inteiros
+    # grandes o bastante para sair do int64
+    rnd = random.Random(semente)
+    escolhas = ["0", "1", "-7", "2.5", "x", None, str(2 ** 40), "1e300"]
+    return [[rnd.choice(escolhas[:3] + escolhas[4:7]), rnd.choice(escolhas)] for _ in range(n)]
+
+def _resumo(result):
+    return (result["status"], result["outputs"], result["error_message"], result["error_line"], result["error_col"])
+
+@unittest.skipIf(vector_churras.np is None, "NumPy não instalado")
+class MotorVetorizadoTest(unittest.TestCase):
+    # Cada linha do resultado vetorizado é igual à execução da VM comum
+    def test_igual_a_vm(self):
+        for semente in range(10):
+            linhas = _linhas(semente, 200)
+            with self.subTest(semente=semente):
+                columns, n = columns_from_rows(linhas)
+                vetorizado = [_resumo(r) for r in run_vectorized(RECEITA, columns, n)]
+                self.assertEqual(vetorizado, [_resumo(r) for r in run_rows(RECEITA, linhas)])
+
+class SemNumPyTest(unittest.TestCase):
+    def test_erro_claro(self):
+        original, vector_churras.np = vector_churras.np, None
+        try:
+            with self.assertRaises(RuntimeError):
+                run_vectorized(RECEITA, [[1], [1.0]], 1)
+        finally:
+            vector_churras.np = original
+
+    def test_colunas(self):
+        self.assertEqual(columns_from_rows([["1", "2"], ["3"]]), ([["1", "3"], ["2", None]], 2))
+        self.assertEqual(columns_from_rows([{"p": 1}, {"x": 2}]), ({"p": [1, None], "x": [None, 2]}, 2))
+        with self.assertRaises(ValueError):
+            columns_from_rows([["1"], {"p": 1}])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from unittest import mock
+
+import worker_churras
+from worker_churras import CompileJob
+
+RECEITA = "INICIAR_CHURRAS DESPENSA x : ARROZ; COZINHAR x = 1.5; SERVIR x; FIM_CHURRAS"
+RECEITA_PROVAR = "INICIAR_CHURRAS DESPENSA x : ARROZ; COZINHAR PROVAR x; SERVIR x * 2; FIM_CHURRAS"
+
+def _resultado(job: CompileJob):
+    job.start()
+    kind, result = job.messages.get(timeout=5)
+    return kind, result
+
+class CompileJobTest(unittest.TestCase):
+    def test_sucesso(self):
+        kind, result = _resultado(CompileJob(RECEITA))
+        self.assertEqual((kind, result["status"]), ("done", "success"))
+
+    def test_provar_respondido_pela_interface(self):
+        job = CompileJob(RECEITA_PROVAR)
+        kind, pedido = _resultado(job)
+        self.assertEqual((kind, pedido.ident, pedido.variable_type), ("input", "x", "real"))
+        pedido.answer("1.5")
+        kind, result = job.messages.get(timeout=5)
+        self.assertEqual((kind, result["status"]), ("done", "success"))
+        self.assertEqual(job.output.drain(), ["3.0"])
+
+    def test_cancelar_esperando_provar(self):
+        job = CompileJob(RECEITA_PROVAR)
+        kind, _ = _resultado(job)
+        job.cancel()
+        kind, result = job.messages.get(timeout=5)
+        self.assertEqual((kind, result["error_stage"], result["error_message"]),
+                         ("done", "Interrompido", "Execução cancelada pelo usuário."))
+
+    def test_tempo_limite_esperando_provar(self):
+        job = CompileJob(RECEITA_PROVAR, timeout=0.2)
+        kind, _ = _resultado(job)
+        kind, result = job.messages.get(timeout=5)
+        self.assertEqual((kind, result["error_stage"], result["error_message"]),
+                         ("done", "Interrompido", "Tempo limite de execução esgotado."))
+        job._thread.join(5)
+        self.assertFalse(job.is_running())
+
+    def test_falha_interna_encerra_o_job(self):
+        # Sem o "done" a IDE ficaria em "Assando..." para sempre
+        with mock.patch.object(worker_churras, "compile_churras", side_effect=ValueError("quebrou")):
+            kind, result = _resultado(CompileJob(RECEITA))
+        self.assertEqual((kind, result["status"], result["error_stage"]), ("done", "error", "Interno"))
+        self.assertEqual(result["error_message"], "ValueError: quebrou")
+        self.assertEqual(len(result["errors"]), 1)
+
+if __name__ == "__main__":
+    unittest.main()